@@ -1,4 +1,5 @@
 import sys
+import time
 import serial
 import serial.tools.list_ports
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
@@ -7,10 +8,18 @@ from PyQt5.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QPushButton, QLabel
 )
 import pyqtgraph as pg
+from force_stream import parse_force_lines, SampleRing
+from minmax_pyramid import MinMaxPyramid
+
+# The worker hands samples to the GUI at most once per frame (~60 Hz)
+FRAME_INTERVAL = 1 / 60
+
+# Samples kept for the plot: about 28 hours at the sketch's 10 Hz, 17 minutes at 1 kHz
+HISTORY_SAMPLES = 1 << 20
 
 
 class SerialWorker(QThread):
-    data_received = pyqtSignal(float)
+    block_ready = pyqtSignal(object)  # ndarray of the force samples (N) since the last block
     
     def __init__(self, port, baudrate=57600, parent=None):
         super().__init__(parent)
@@ -19,15 +28,19 @@ class SerialWorker(QThread):
         self.running = True
         self.ser = None
         self._send_tare = False
+        self.ring = SampleRing()
         
     def run(self):
         try:
-            self.ser = serial.Serial(self.port, self.baudrate, timeout=1)
+            self.ser = serial.Serial(self.port, self.baudrate, timeout=FRAME_INTERVAL)
             print(f"Opened {self.port} at {self.baudrate} baud.")
         except Exception as e:
             print("Failed to open serial port:", e)
             return
         
+        pending = b""
+        cursor = 0
+        last_emit = time.monotonic()
         while self.running:
             # If a tare command is requested, send it
             if self._send_tare:
@@ -35,29 +48,20 @@ class SerialWorker(QThread):
                 self._send_tare = False
 
             try:
-                line = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    # For example, Arduino prints:
-                    # "Raw reading: 300   Force (PSI - NB): 45   Force (N): 0.88"
-                    # We want to extract the force in newtons.
-                    if "Force (N):" in line:
-                        try:
-                            parts = line.split("Force (N):")
-                            force_str = parts[1].strip()
-                            force = float(force_str)
-                            self.data_received.emit(force)
-                        except Exception as e:
-                            # Could not parse; ignore this line.
-                            pass
-                    else:
-                        # Alternatively, if the Arduino sends just a number:
-                        try:
-                            force = float(line)
-                            self.data_received.emit(force)
-                        except:
-                            pass
+                # Read whatever has arrived (or wait up to one frame for the next byte)
+                # and parse all complete lines in one go; the partial tail waits for more.
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+                if chunk:
+                    forces, pending = parse_force_lines(pending + chunk)
+                    self.ring.write(forces)
             except Exception as e:
                 print("Error reading serial:", e)
+
+            now = time.monotonic()
+            if now - last_emit >= FRAME_INTERVAL and self.ring.written > cursor:
+                block, cursor = self.ring.read_since(cursor)
+                self.block_ready.emit(block)
+                last_emit = now
                 
         if self.ser:
             self.ser.close()
@@ -78,12 +82,13 @@ class MainWindow(QMainWindow):
         
         # Set up serial worker
         self.serial_worker = SerialWorker(port)
-        self.serial_worker.data_received.connect(self.on_new_data)
+        self.serial_worker.block_ready.connect(self.on_new_block)
         self.serial_worker.start()
         
-        # Data storage for plotting
-        self.force_data = []
-        self.max_points = 500  # e.g., store last 500 points
+        # Recent history for plotting, with a min/max pyramid so redraws only
+        # touch about one point per pixel column at the current zoom; bounded
+        # to the newest HISTORY_SAMPLES (under ~26 bytes each, see minmax_pyramid.py)
+        self.force_data = MinMaxPyramid(max_points=HISTORY_SAMPLES)
         
         # Set up pyqtgraph plot
         self.plot_widget = pg.PlotWidget()
@@ -114,16 +119,20 @@ class MainWindow(QMainWindow):
         self.timer.timeout.connect(self.update_plot)
         self.timer.start(50)  # update every 50 ms
         
-    def on_new_data(self, force):
-        """Slot called from the serial thread when new force data is received."""
-        self.force_data.append(force)
-        if len(self.force_data) > self.max_points:
-            self.force_data = self.force_data[-self.max_points:]
-        self.status_label.setText(f"Force (N): {force:.2f}")
+    def on_new_block(self, forces):
+        """Slot called from the serial thread with the force samples of the last frame."""
+        self.force_data.extend(forces)
+        self.status_label.setText(f"Force (N): {forces[-1]:.2f}")
         
     def update_plot(self):
-        if self.force_data:
-            self.plot_curve.setData(self.force_data)
+        if len(self.force_data):
+            view_box = self.plot_widget.getViewBox()
+            if view_box.autoRangeEnabled()[0]:
+                x0, x1 = self.force_data.start, self.force_data.n
+            else:
+                x0, x1 = view_box.viewRange()[0]
+            x, y = self.force_data.query(x0, x1, max(self.plot_widget.width(), 1))
+            self.plot_curve.setData(x, y)
         
     def on_tare(self):
         """Called when the Tare button is pressed."""
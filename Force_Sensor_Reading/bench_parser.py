@@ -0,0 +1,48 @@
+"""
+Parser benchmark: the old per-line readline/split/float path versus
+force_stream.parse_force_lines on the same bytes.
+
+Uses lines in the format forcesensor_read.ino prints ("Raw reading: ...
+Force (N): ..."), with the occasional header/error line mixed in.
+Run from this folder: python bench_parser.py
+"""
+import timeit
+import numpy as np
+from force_stream import parse_force_lines
+
+N_LINES = 100000
+REPEATS = 5
+
+rng = np.random.default_rng(0)
+raw = rng.integers(250, 600, N_LINES)
+lines = [f"Raw reading: {r}   Force (PSI - NB): {r * 0.15:.2f}   Force (N): {r * 0.0029:.2f}"
+         for r in raw]
+lines[::1000] = ["Error: No response from sensor."] * len(lines[::1000])
+data = ("\r\n".join(lines) + "\r\n").encode()
+
+def per_line():
+    forces = []
+    for raw_line in data.splitlines(keepends=True):
+        line = raw_line.decode('utf-8', errors='ignore').strip()
+        if "Force (N):" in line:
+            try:
+                forces.append(float(line.split("Force (N):")[1].strip()))
+            except ValueError:
+                pass
+        else:
+            try:
+                forces.append(float(line))
+            except ValueError:
+                pass
+    return forces
+
+def bulk():
+    return parse_force_lines(data)[0]
+
+if __name__ == "__main__":
+    assert np.array_equal(per_line(), bulk())
+    t_line = min(timeit.repeat(per_line, number=1, repeat=REPEATS))
+    t_bulk = min(timeit.repeat(bulk, number=1, repeat=REPEATS))
+    print(f"{N_LINES} lines ({len(data) / 1e6:.1f} MB)")
+    print(f"per-line parse : {t_line * 1e3:8.1f} ms")
+    print(f"bulk parse     : {t_bulk * 1e3:8.1f} ms  ({t_line / t_bulk:.1f}x faster)")
@@ -0,0 +1,71 @@
+"""
+Bulk parsing and buffering for the SingleTact serial stream.
+
+The Arduino prints one line per reading, e.g.
+    "Raw reading: 300   Force (PSI - NB): 45   Force (N): 0.88"
+or, with other sketches, just the number. parse_force_lines() pulls every
+force out of a chunk of raw serial bytes with one regex scan instead of
+decoding and splitting line by line, and SampleRing hands the parsed blocks
+from the serial thread to the GUI without allocating per sample.
+"""
+import re
+import numpy as np
+
+_NUMBER = rb'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)[ \t]*\r?$'
+# The number after "Force (N):" at the end of a line
+_MARKED_FORCE = re.compile(rb'Force \(N\):[ \t]*' + _NUMBER, re.MULTILINE)
+# A line that is only a number
+_BARE_FORCE = re.compile(rb'^[ \t]*' + _NUMBER, re.MULTILINE)
+
+def parse_force_lines(data):
+    """
+    Parse all complete lines in data (bytes).
+    Returns (forces as a float64 array, trailing partial line to prepend to the next chunk).
+
+    A sketch prints one format, so a chunk containing "Force (N):" lines is
+    parsed for those only and any other chunk for bare numbers. Lines that
+    match neither (headers, "Error: ...") are skipped.
+    """
+    end = data.rfind(b'\n')
+    if end < 0:
+        return np.empty(0), data
+    pattern = _MARKED_FORCE if data.find(b'Force (N):', 0, end) >= 0 else _BARE_FORCE
+    values = pattern.findall(data, 0, end)
+    return np.array(values, dtype=np.float64), data[end + 1:]
+
+
+class SampleRing:
+    """
+    Fixed-size single-producer/single-consumer sample buffer.
+
+    The serial thread write()s parsed blocks; the reader keeps a cursor and
+    calls read_since(cursor) to get everything written after it. If the
+    reader falls more than 'capacity' samples behind, the oldest are dropped.
+    """
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self._data = np.zeros(capacity)
+        self.written = 0  # total samples ever written
+
+    def write(self, values):
+        n = len(values)
+        if n > self.capacity:
+            values = values[-self.capacity:]
+            self.written += n - self.capacity
+            n = self.capacity
+        start = self.written % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = values[:first]
+        self._data[:n - first] = values[first:]
+        self.written += n
+
+    def read_since(self, cursor):
+        """Return (copy of samples written since cursor, new cursor)."""
+        written = self.written
+        cursor = max(cursor, written - self.capacity)
+        start = cursor % self.capacity
+        n = written - cursor
+        first = min(n, self.capacity - start)
+        block = np.concatenate((self._data[start:start + first], self._data[:n - first]))
+        return block, written
+
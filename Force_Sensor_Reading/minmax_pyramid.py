@@ -0,0 +1,128 @@
+"""
+Multi-resolution min/max envelope of a growing sample stream.
+
+Level 0 holds every sample; level k holds the min and max of each bucket of
+factor**k samples. extend() only recomputes the buckets the new samples fall
+into, so keeping the pyramid current costs O(new samples + levels). query()
+picks the coarsest level that still gives about one bucket per pixel column,
+so drawing a 10 minute kHz recording costs the same as drawing a few seconds.
+
+Each kept sample costs 8 bytes raw plus 16 / (factor - 1) bytes for the
+levels (about 13 bytes at factor 4). With max_points set, only the newest
+max_points samples are guaranteed to be kept: once 2 * max_points have piled
+up the oldest are dropped and the levels rebuilt from the rest, an O(1)
+amortized cost per sample, so memory stays under ~26 bytes * max_points.
+Sample indices keep counting from the start of the session; self.start is
+the oldest one still held. Without max_points nothing is ever dropped.
+"""
+import numpy as np
+
+class _Growable:
+    """Array with amortized O(1) appends at the end, never grown past 'limit'."""
+    def __init__(self, capacity, limit=None):
+        self.limit = limit
+        self.data = np.empty(capacity if limit is None else min(capacity, limit))
+
+    def reserve(self, n):
+        if n > len(self.data):
+            size = max(n, 2 * len(self.data))
+            grown = np.empty(size if self.limit is None else max(min(size, self.limit), n))
+            grown[:len(self.data)] = self.data
+            self.data = grown
+
+
+class MinMaxPyramid:
+    def __init__(self, factor=4, capacity=1 << 16, max_points=None):
+        self.factor = factor
+        self.max_points = max_points
+        self.start = 0  # index of the oldest sample held
+        self.n = 0      # index one past the newest sample
+        self._raw = _Growable(capacity, self._limit(0))
+        self._mins = []    # level k >= 1 at index k - 1
+        self._maxs = []
+        self._counts = []  # buckets per level (the last one may be partial)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        held = self.n - self.start
+        if self.max_points is not None and held + len(values) > 2 * self.max_points:
+            # drop all but the newest max_points and rebuild the levels from those
+            keep = np.concatenate((self._raw.data[:held], values))[-self.max_points:]
+            self.n += len(values)
+            self.start = self.n - len(keep)
+            self._mins, self._maxs, self._counts = [], [], []
+            self._append(keep, 0)
+        else:
+            self.n += len(values)
+            self._append(values, held)
+
+    def _append(self, values, start):
+        """Store values at local index 'start' and update the levels above them."""
+        end = start + len(values)
+        self._raw.reserve(end)
+        self._raw.data[start:end] = values
+
+        # Rebuild only the buckets from the one containing 'start' upward, level by level
+        below_min = below_max = self._raw.data
+        below_n = end
+        level = 0
+        while below_n > 1:
+            first = start // self.factor
+            count = -(-below_n // self.factor)
+            offsets = np.arange(first * self.factor, below_n, self.factor)
+            if level == len(self._mins):
+                self._mins.append(_Growable(count, self._limit(level + 1)))
+                self._maxs.append(_Growable(count, self._limit(level + 1)))
+                self._counts.append(0)
+            mins, maxs = self._mins[level], self._maxs[level]
+            mins.reserve(count)
+            maxs.reserve(count)
+            mins.data[first:count] = np.minimum.reduceat(below_min[:below_n], offsets)
+            maxs.data[first:count] = np.maximum.reduceat(below_max[:below_n], offsets)
+            self._counts[level] = count
+
+            below_min, below_max, below_n = mins.data, maxs.data, count
+            start = first
+            level += 1
+
+    def _limit(self, level):
+        """Most entries 'level' ever needs: 2 * max_points samples' worth of buckets."""
+        if self.max_points is None:
+            return None
+        return -(-2 * self.max_points // self.factor ** level)
+
+    def query(self, x0, x1, pixels):
+        """
+        Points to draw sample indices [x0, x1) on a plot 'pixels' wide.
+        Returns (x, y): the raw samples when they fit, otherwise the min and
+        max of each bucket in turn, placed at the bucket's first sample index.
+        Samples older than self.start are gone and are left out.
+        """
+        x0 = max(int(x0), self.start) - self.start
+        x1 = min(int(np.ceil(x1)), self.n) - self.start
+        if x1 <= x0:
+            return np.empty(0), np.empty(0)
+        span = x1 - x0
+
+        # finest level with no more buckets than pixel columns
+        level = 0
+        bucket = 1
+        while span > bucket * pixels and level < len(self._mins):
+            bucket *= self.factor
+            level += 1
+        if level == 0:
+            return np.arange(x0, x1, dtype=np.float64) + self.start, self._raw.data[x0:x1].copy()
+
+        b0 = x0 // bucket
+        b1 = min(-(-x1 // bucket), self._counts[level - 1])
+        x = np.repeat(np.arange(b0, b1) * float(bucket) + self.start, 2)
+        y = np.empty(2 * (b1 - b0))
+        y[0::2] = self._mins[level - 1].data[b0:b1]
+        y[1::2] = self._maxs[level - 1].data[b0:b1]
+        return x, y
+
+    def __len__(self):
+        """Samples currently held (self.n - self.start)."""
+        return self.n - self.start
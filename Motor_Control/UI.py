@@ -3,6 +3,8 @@ import serial
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton
 from PyQt5.QtGui import QFont
 
+from wrist.serial_transport import SerialTransport
+
 SERIAL_PORT = 'COM3'  
 BAUD_RATE = 9600
 
@@ -10,6 +12,7 @@ class MotorControlUI(QWidget):
     def __init__(self, port, baud):
         super().__init__()
         self.serial_conn = serial.Serial(port, baud, timeout=1)
+        self.transport = SerialTransport(self.serial_conn)
 
         self.setWindowTitle("Motor Control UI")
         
@@ -43,7 +46,12 @@ class MotorControlUI(QWidget):
 
     def send_command(self, command):
         if self.serial_conn.is_open:
-            self.serial_conn.write(command.encode('utf-8'))
+            self.transport.send(command)
+
+    def closeEvent(self, event):
+        self.transport.close()
+        self.serial_conn.close()
+        event.accept()
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
+from wrist.serial_transport import SerialTransport
+
 SERIAL_PORT = 'COM10'  
 BAUD_RATE = 115200
 
@@ -13,6 +15,7 @@ class MotorControlUI(QWidget):
     def __init__(self, port, baud):
         super().__init__()
         self.serial_conn = serial.Serial(port, baud, timeout=1)
+        self.transport = SerialTransport(self.serial_conn)
 
         self.setWindowTitle("Motor Control UI")
         layout = QVBoxLayout()
@@ -109,7 +112,12 @@ class MotorControlUI(QWidget):
     def send_command(self, *args):
         if self.serial_conn.is_open:
             command = ''.join(str(arg) for arg in args)
-            self.serial_conn.write(command.encode('utf-8'))
+            self.transport.send(command)
+
+    def closeEvent(self, event):
+        self.transport.close()
+        self.serial_conn.close()
+        event.accept()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -0,0 +1,180 @@
+"""
+Time alignment of a SingleTact CSV log against the ATI force/torque log
+recorded over the same squeezes (e.g. "withSingletact feb13.txt" and
+"SingleTactSampleData_feb13.csv").
+
+The two loggers run on different clocks: the ATI writes untimed rows at a
+fixed rate, the SingleTact GUI writes irregular "Time(s), force" rows after
+a "Start Time" preamble. align() reads both in one pass each, resamples the
+SingleTact onto the ATI's uniform timebase, estimates the lag between them
+from the peak of an FFT cross-correlation, and returns both traces on the
+overlapping common timebase. Results are memoized in the shared result
+cache (result_cache.py), keyed by the sources' contents and this code.
+
+The ATI log has no timestamp. If you know when it started (--ati-start),
+the SingleTact "Start Time" gives the expected lag and the search is
+limited to --max-lag (default CLOCK_TOLERANCE) around it.
+
+    python alignment.py "Data/withSingletact feb13.txt" Data/SingleTactSampleData_feb13.csv
+"""
+import argparse
+import io
+import os
+from datetime import datetime
+import numpy as np
+
+from squeeze_store import load_recording, DEFAULT_SAMPLING_RATE
+from baseline import find_baseline
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+from wrist.result_cache import ResultCache
+
+CACHE = ResultCache(code=[os.path.join(HERE, name) for name in
+                          ('alignment.py', 'baseline.py', 'squeeze_store.py')])
+START_TIME_FORMAT = '%m/%d/%Y %I:%M:%S %p'  # as in the SingleTact "Start Time" line
+CLOCK_TOLERANCE = 5.0  # s either side of the expected lag when both start times are known
+
+def read_singletact_csv(path):
+    """
+    Parse a SingleTact GUI export. Returns (start time as datetime or None,
+    time in s, force in N) with duplicate timestamps dropped.
+    """
+    with open(path, 'r', errors='ignore') as f:
+        text = f.read()
+    start_time = None
+    header_end = 0
+    for line in text.splitlines(keepends=True):
+        header_end += len(line)
+        if line.startswith('Start Time,'):
+            try:
+                start_time = datetime.strptime(line.split(',', 1)[1].strip(), START_TIME_FORMAT)
+            except ValueError:
+                pass
+        elif line.startswith('Time(s)'):
+            break
+    data = np.loadtxt(io.StringIO(text[header_end:]), delimiter=',', usecols=(0, 1), ndmin=2)
+    t, first = np.unique(data[:, 0], return_index=True)
+    return start_time, t, data[first, 1]
+
+def resample(t, values, rate, start=0.0, end=None):
+    """Linear interpolation of (t, values) onto a uniform grid at 'rate' Hz."""
+    end = t[-1] if end is None else end
+    grid = start + np.arange(int((end - start) * rate) + 1) / rate
+    return grid, np.interp(grid, t, values)
+
+def estimate_lag(reference, signal, rate, max_lag=None, expected=0.0):
+    """
+    Delay (s) of 'signal' relative to 'reference' (both uniform at 'rate'),
+    from the peak of their cross-correlation computed with one FFT product.
+    Positive: events appear later in 'signal'. max_lag (s) limits the search
+    to within that distance of 'expected'.
+    """
+    a = reference - reference.mean()
+    b = signal - signal.mean()
+    n = len(a) + len(b) - 1
+    size = 1 << (n - 1).bit_length()
+    corr = np.fft.irfft(np.fft.rfft(b, size) * np.conj(np.fft.rfft(a, size)), size)
+    # corr[k] = sum b[i + k] * a[i]; negative k wraps to the end
+    lags = np.concatenate((np.arange(0, len(b)), np.arange(-(len(a) - 1), 0)))
+    corr = np.concatenate((corr[:len(b)], corr[size - (len(a) - 1):]))
+    if max_lag is not None:
+        allowed = np.abs(lags - expected * rate) <= max_lag * rate
+        if not allowed.any():
+            raise ValueError(f"no lag within {max_lag} s of {expected:.1f} s fits these recordings")
+        corr = np.where(allowed, corr, -np.inf)
+    return lags[np.argmax(corr)] / rate
+
+
+class Aligned:
+    """Both sensors on one timebase (s, relative to the ATI recording's start)."""
+    def __init__(self, time, reference, singletact, lag, rate):
+        self.time = time
+        self.reference = reference      # ATI squeeze force (baseline-adjusted, N)
+        self.singletact = singletact    # SingleTact force (N)
+        self.lag = lag                  # s the SingleTact log is delayed by
+        self.rate = rate
+
+    def fit_calibration(self, min_reference=-1.0):
+        """
+        Least-squares singletact ~ gain * reference + offset over the samples
+        where reference >= min_reference (drops stretches recorded before the
+        ATI was biased). Returns (gain, offset, r^2).
+        """
+        valid = self.reference >= min_reference
+        x, y = self.reference[valid], self.singletact[valid]
+        gain, offset = np.polyfit(x, y, 1)
+        residual = y - (gain * x + offset)
+        r2 = 1 - residual.var() / y.var()
+        return gain, offset, r2
+
+
+def align(ati_path, singletact_path, rate=DEFAULT_SAMPLING_RATE, sign=-1, max_lag=None,
+          ati_start=None, use_cache=True):
+    """
+    Align a SingleTact CSV to an ATI recording. sign is the Fz direction of
+    a squeeze on the ATI (see squeeze_events). ati_start (datetime) is when
+    the ATI log started, if known. Returns an Aligned; raises ValueError if
+    the recordings do not overlap at the estimated lag.
+    """
+    params = {'rate': rate, 'sign': sign, 'max_lag': max_lag,
+              'ati_start': ati_start.isoformat() if ati_start else None}
+    if not use_cache:
+        return _align(ati_path, singletact_path, rate, sign, max_lag, ati_start)
+    return CACHE.memoize('align', [ati_path, singletact_path], params,
+                         lambda: _align(ati_path, singletact_path, rate, sign, max_lag, ati_start))
+
+def _align(ati_path, singletact_path, rate, sign, max_lag, ati_start):
+    recording = load_recording(ati_path, rate)
+    fz = np.asarray(recording.column('Fz'))
+    start, end = find_baseline(fz, int(rate))
+    reference = sign * (fz - fz[start:end].mean())
+
+    start_time, t, force = read_singletact_csv(singletact_path)
+    _, singletact = resample(t, force, rate)
+
+    # A SingleTact log started d s after the ATI shows each squeeze d s earlier
+    expected = 0.0
+    if ati_start is not None and start_time is not None:
+        expected = (ati_start - start_time).total_seconds()
+        max_lag = CLOCK_TOLERANCE if max_lag is None else max_lag
+
+    # contact forces are >= 0; clipping keeps an unbiased ATI start (Fz ~ -50 N here) out of the correlation
+    lag = estimate_lag(np.clip(reference, 0, None), np.clip(singletact, 0, None), rate, max_lag, expected)
+
+    # common timebase: ATI time, SingleTact shifted back by the lag
+    shift = int(round(lag * rate))
+    first = max(0, -shift)
+    last = min(len(reference), len(singletact) - shift)
+    if last - first < 2:  # too short to fit a calibration line
+        raise ValueError(f"{os.path.basename(ati_path)} and {os.path.basename(singletact_path)} "
+                         f"do not overlap at the estimated lag of {lag:.2f} s")
+    time = np.arange(first, last) / rate
+    return Aligned(time, reference[first:last], singletact[first + shift:last + shift], lag, rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Align a SingleTact CSV with an ATI recording")
+    parser.add_argument('ati', help="ATI .txt (or converted .npy) recording")
+    parser.add_argument('singletact', help="SingleTact GUI .csv export")
+    parser.add_argument('--rate', type=float, default=DEFAULT_SAMPLING_RATE, help="ATI sampling rate (Hz)")
+    parser.add_argument('--sign', type=int, choices=(-1, 1), default=-1, help="Fz direction of a squeeze")
+    parser.add_argument('--max-lag', type=float, default=None,
+                        help="largest lag to consider (s), around the expected one if --ati-start is given")
+    parser.add_argument('--ati-start', type=lambda text: datetime.strptime(text, START_TIME_FORMAT),
+                        help='when the ATI log started, e.g. "2/13/2025 7:43:20 PM"')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        aligned = align(args.ati, args.singletact, args.rate, args.sign, args.max_lag,
+                        args.ati_start, use_cache=not args.no_cache)
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+    gain, offset, r2 = aligned.fit_calibration()
+    print(f"Lag: {aligned.lag:.3f} s (SingleTact behind ATI)")
+    print(f"Overlap: {aligned.time[0]:.2f}-{aligned.time[-1]:.2f} s, {len(aligned.time)} samples")
+    print(f"SingleTact = {gain:.4f} * ATI + {offset:.4f}  (r^2 = {r2:.3f})")
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,15 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from squeeze_store import load_recording
 
-data = np.loadtxt('Squeeze_Force_Test/Data/april28test.txt')
+# Memory-mapped binary copy of the .txt (converted on first use, see squeeze_store.py)
+recording = load_recording('Squeeze_Force_Test/Data/april28test.txt', sampling_rate=60)
 
-force = data[:, 0:3]   
-torque = data[:, 3:6]  
+force = recording.force.T   # (rows, 3) views, no copy
+torque = recording.torque.T
 
-num_samples = data.shape[0]
-sampling_rate = 60  # Hz
+num_samples = len(recording)
+sampling_rate = recording.sampling_rate  # Hz
 time = np.arange(num_samples) / sampling_rate  
 
 start_index = int(33 * sampling_rate)
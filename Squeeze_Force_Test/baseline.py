@@ -0,0 +1,129 @@
+"""
+Automatic baseline (quiet, unloaded) window detection for force/torque traces.
+
+analysis.py takes the baseline from a hand-picked 33-34 s window. Here the
+mean and variance of every window of a trace come from running sums in O(n),
+and the baseline is the quietest window at the level the trace rests at
+most of the time. Picking the globally quietest window is not enough: some
+recordings begin with the sensor still unbiased (Fz ~ 50 N) or hold a
+squeeze steadily, and those stretches are just as quiet as the real rest.
+
+StreamingBaseline does the same over blocks of live samples.
+"""
+import numpy as np
+
+# The unbiased ATI reads 45-55 N, so biasing it moves Fz that far between two
+# samples; a squeeze never changes Fz by more than ~20 N per sample at 60 Hz.
+BIAS_STEP = 30.0
+
+def rolling_mean_var(x, window):
+    """
+    Mean and variance of every length-'window' slice of x (1-D).
+    Element i covers x[i:i + window]. O(n) via cumulative sums.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    shift = x.mean() if len(x) else 0.0  # centering keeps the sums well conditioned
+    c1 = np.concatenate(([0.0], np.cumsum(x - shift)))
+    c2 = np.concatenate(([0.0], np.cumsum((x - shift) ** 2)))
+    s1 = c1[window:] - c1[:-window]
+    s2 = c2[window:] - c2[:-window]
+    mean = s1 / window
+    var = np.maximum(s2 / window - mean * mean, 0.0)
+    return mean + shift, var
+
+def stationary_segments(x, window, max_std):
+    """
+    (start, end) sample ranges where every window has std <= max_std,
+    i.e. stretches where the trace is flat.
+    """
+    _, var = rolling_mean_var(x, window)
+    quiet = np.concatenate(([False], var <= max_std ** 2, [False]))
+    edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    return [(int(s), int(e) - 1 + window) for s, e in zip(starts, ends)]
+
+def find_baseline(x, window, quiet_factor=4.0):
+    """
+    Sample range (start, end) of the baseline window of trace x.
+
+    Windows with variance below quiet_factor times the quietest one count as
+    stationary. Their means are binned, the most populated level is taken as
+    the rest level, and the quietest window at that level is returned.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if len(x) <= window:
+        return 0, len(x)
+    mean, var = rolling_mean_var(x, window)
+    quiet = np.flatnonzero(var <= quiet_factor * max(var.min(), 1e-12))
+    levels = mean[quiet]
+
+    # bins a few noise stds wide, so one resting level lands in one or two bins
+    width = 6 * np.sqrt(np.median(var[quiet])) + 1e-9
+    bins = np.floor((levels - levels.min()) / width).astype(np.int64)
+    counts = np.bincount(bins)
+    rest = np.argmax(counts[:-1] + counts[1:]) if len(counts) > 1 else 0
+    at_rest = quiet[(bins == rest) | (bins == rest + 1)]
+    start = int(at_rest[np.argmin(var[at_rest])])
+    return start, start + window
+
+def find_bias_point(x, end=None, min_step=BIAS_STEP):
+    """
+    Index of the first sample after the sensor was last biased before 'end'
+    (default: the whole trace), i.e. one past the last jump of at least
+    min_step between two samples; 0 if the trace was biased from the start.
+    Pass the baseline window's start as 'end'.
+    """
+    x = np.asarray(x, dtype=np.float64)[:end]
+    steps = np.flatnonzero(np.abs(np.diff(x)) >= min_step)
+    return int(steps[-1]) + 1 if len(steps) else 0
+
+
+class StreamingBaseline:
+    """
+    Live version of find_baseline(): feed blocks of samples with update()
+    and read the current baseline estimate from .mean.
+
+    Windows with std <= max_std are counted per level bin (bin_width wide);
+    the estimate is the quietest window of the most populated level so far,
+    so a quiet stretch at the wrong level (e.g. before the sensor is biased)
+    only wins until the trace has rested longer somewhere else. Each update
+    costs O(block + window).
+    """
+    def __init__(self, window, max_std=0.1, bin_width=0.5):
+        self.window = window
+        self.max_std = max_std
+        self.bin_width = bin_width
+        self.mean = None
+        self.start = None  # sample index of the chosen window
+        self._counts = {}  # level bin -> quiet windows seen
+        self._best = {}    # level bin -> (var, mean, start) of its quietest window
+        self._tail = np.empty(0)
+        self._count = 0    # samples seen
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        data = np.concatenate((self._tail, values))
+        first = self._count - len(self._tail)  # sample index of data[0]
+        self._count += len(values)
+        self._tail = data[max(len(data) - (self.window - 1), 0):] if self.window > 1 else np.empty(0)
+        if len(data) < self.window:
+            return self.mean
+
+        mean, var = rolling_mean_var(data, self.window)
+        quiet = np.flatnonzero(var <= self.max_std ** 2)
+        if not len(quiet):
+            return self.mean
+        bins = np.floor(mean[quiet] / self.bin_width).astype(np.int64)
+        for b, n in zip(*np.unique(bins, return_counts=True)):
+            b = int(b)
+            self._counts[b] = self._counts.get(b, 0) + int(n)
+            in_bin = quiet[bins == b]
+            i = int(in_bin[np.argmin(var[in_bin])])
+            if b not in self._best or var[i] < self._best[b][0]:
+                self._best[b] = (var[i], mean[i], first + i)
+
+        # most populated level, counting each bin together with its upper neighbour
+        rest = max(self._counts, key=lambda b: self._counts[b] + self._counts.get(b + 1, 0))
+        candidates = [self._best[b] for b in (rest, rest + 1) if b in self._best]
+        _, self.mean, self.start = min(candidates)
+        return self.mean
@@ -0,0 +1,211 @@
+"""
+Batch version of analysis.py: baseline-adjust every recording matching the
+given globs and report the Fz range of each, one process per file.
+
+    python Squeeze_Force_Test/batch_analysis.py                      all of Data/*.txt
+    python Squeeze_Force_Test/batch_analysis.py "Data/april*.txt" --figures figs
+    python Squeeze_Force_Test/batch_analysis.py --baseline 33 34 --rate 60 -o summary.csv
+
+The baseline window is detected per recording (baseline.find_baseline on Fz)
+unless --baseline gives a fixed one. The Fz range and the squeeze events
+(squeeze_events.py, polarity inferred per recording unless --sign is given)
+only cover samples after the sensor was biased; the summary counts the
+events and --events writes the per-event table.
+
+Per-recording results and figures go through result_cache: a rerun only
+analyzes recordings whose data (or whose analysis code) changed.
+
+Recordings are opened through squeeze_store (memory-mapped .npy copies),
+figures are rendered off-screen with the Agg backend, and the summary table
+is printed and written as CSV.
+"""
+import argparse
+import csv
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from squeeze_store import load_recording, DEFAULT_SAMPLING_RATE
+from baseline import find_baseline, find_bias_point
+from squeeze_events import detect_events, summarize_events, squeeze_polarity, EVENT_DTYPE
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+from wrist.result_cache import ResultCache
+
+CACHE = ResultCache(code=[os.path.join(HERE, name) for name in
+                          ('batch_analysis.py', 'baseline.py', 'squeeze_events.py', 'squeeze_store.py')])
+SUMMARY_FIELDS = ['file', 'rows', 'duration_s', 'bias_s', 'baseline_start_s', 'baseline_end_s',
+                  'baseline_fx', 'baseline_fy', 'baseline_fz',
+                  'fz_max', 'fz_min', 'fz_range', 'sign',
+                  'events', 'mean_peak', 'mean_rise_time', 'mean_hold']
+EVENT_FIELDS = ['file'] + list(EVENT_DTYPE.names)
+
+def baseline_window(num_samples, sampling_rate, start_s, end_s):
+    """
+    Sample range of the baseline window, falling back to the first second
+    when the requested window lies outside the recording.
+    """
+    start, end = int(start_s * sampling_rate), int(end_s * sampling_rate)
+    if end > num_samples or start >= end:
+        start, end = 0, min(int(sampling_rate), num_samples)
+    return start, end
+
+def analyze_file(path, sampling_rate, baseline=None, figure_dir=None, sign=None):
+    """
+    Baseline-adjust one recording; returns (summary row, event rows).
+    baseline is a (start, end) window in seconds, or None to detect a 1 s
+    window. sign is the Fz direction of a squeeze, or None to infer it
+    (see squeeze_events).
+    Results and the figure come from the cache when the inputs are unchanged.
+    """
+    params = {'file': os.path.basename(path), 'sampling_rate': sampling_rate,
+              'baseline': baseline, 'sign': sign}
+    row, event_rows = CACHE.memoize('analyze_file', [path], params,
+                                    lambda: _analyze_file(path, sampling_rate, baseline, sign))
+    if figure_dir:
+        CACHE.output('plot_recording', [path], params,
+                     os.path.join(figure_dir, os.path.splitext(row['file'])[0] + '.png'),
+                     lambda out: _plot_file(path, sampling_rate, row, out))
+    return row, event_rows
+
+def _analyze_file(path, sampling_rate, baseline, sign):
+    recording = load_recording(path, sampling_rate)
+    force = recording.force.T
+    torque = recording.torque.T
+    rate = recording.sampling_rate
+    if baseline is None:
+        start, end = find_baseline(recording.column('Fz'), int(rate))
+    else:
+        start, end = baseline_window(len(recording), rate, *baseline)
+
+    baseline_force = force[start:end].mean(axis=0)
+    # everything before the sensor was biased reads ~50 N and is left out
+    bias = find_bias_point(recording.column('Fz'), start)
+    force_z = force[bias:, 2] - baseline_force[2]
+    if sign is None:
+        sign = squeeze_polarity(force_z)
+
+    row = {
+        'file': os.path.basename(path),
+        'rows': len(recording),
+        'duration_s': len(recording) / rate,
+        'bias_s': bias / rate,
+        'baseline_start_s': start / rate,
+        'baseline_end_s': end / rate,
+        'baseline_fx': baseline_force[0],
+        'baseline_fy': baseline_force[1],
+        'baseline_fz': baseline_force[2],
+        'fz_max': force_z.max(),
+        'fz_min': force_z.min(),
+        'fz_range': force_z.max() - force_z.min(),
+        'sign': sign,
+    }
+    events = detect_events(force_z, rate, sign=sign)
+    for column in ('onset', 'peak_time', 'end'):
+        events[column] += bias / rate  # times from the start of the recording
+    row.update(summarize_events(events))
+    event_rows = [dict(zip(EVENT_FIELDS, (row['file'],) + tuple(e.tolist()))) for e in events]
+    return row, event_rows
+
+def _plot_file(path, sampling_rate, row, out_path):
+    recording = load_recording(path, sampling_rate)
+    rate = recording.sampling_rate
+    start, end = int(round(row['baseline_start_s'] * rate)), int(round(row['baseline_end_s'] * rate))
+    force = recording.force.T
+    torque = recording.torque.T
+    plot_recording(recording.time, force - force[start:end].mean(axis=0),
+                   torque - torque[start:end].mean(axis=0), out_path)
+
+def plot_recording(time, adjusted_force, adjusted_torque, out_path):
+    """The two panels from analysis.py, saved instead of shown."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, (ax_f, ax_t) = plt.subplots(2, 1, figsize=(12, 6))
+    ax_f.plot(time, adjusted_force[:, 0], label='Force X')
+    ax_f.plot(time, adjusted_force[:, 1], label='Force Y')
+    ax_f.plot(time, -adjusted_force[:, 2], label='Force Z')  # negative Z direction for HF
+    ax_f.set_title('Squeeze Force Over Time')
+    ax_f.set_xlabel('Time (s)')
+    ax_f.set_ylabel('Force')
+    ax_t.plot(time, adjusted_torque[:, 0], label='Torque X (Adjusted)')
+    ax_t.plot(time, adjusted_torque[:, 1], label='Torque Y (Adjusted)')
+    ax_t.plot(time, adjusted_torque[:, 2], label='Torque Z (Adjusted)')
+    ax_t.set_title('Adjusted Torque Components Over Time')
+    ax_t.set_xlabel('Time (s)')
+    ax_t.set_ylabel('Torque (Adjusted)')
+    for ax in (ax_f, ax_t):
+        ax.legend()
+        ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(out_path)
+    plt.close(fig)
+
+def find_recordings(patterns):
+    files = set()
+    for pattern in patterns:
+        files.update(glob.glob(pattern))
+    return sorted(f for f in files if f.endswith(('.txt', '.npy')))
+
+def write_table(rows, fields, out_path):
+    with open(out_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def print_summary(rows):
+    print(f"{'file':<28}{'rows':>7}{'dur (s)':>9}{'baseline (s)':>14}{'Fz range':>10}"
+          f"{'events':>8}{'mean peak':>11}")
+    for r in rows:
+        window = f"{r['baseline_start_s']:.1f}-{r['baseline_end_s']:.1f}"
+        print(f"{r['file']:<28}{r['rows']:>7}{r['duration_s']:>9.1f}{window:>14}{r['fz_range']:>10.3f}"
+              f"{r['events']:>8}{r['mean_peak']:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch squeeze-force analysis")
+    parser.add_argument('patterns', nargs='*', default=[os.path.join(HERE, 'Data', '*.txt')],
+                        help="globs of recordings (default: Data/*.txt)")
+    parser.add_argument('--rate', type=float, default=DEFAULT_SAMPLING_RATE, help="sampling rate (Hz)")
+    parser.add_argument('--baseline', type=float, nargs=2, default=None, metavar=('START', 'END'),
+                        help="fixed baseline window in seconds (default: detect per recording)")
+    parser.add_argument('-o', '--output', default='squeeze_summary.csv', help="summary CSV path")
+    parser.add_argument('--sign', type=int, choices=(-1, 1), default=None,
+                        help="Fz direction of a squeeze (default: inferred per recording)")
+    parser.add_argument('--events', metavar='CSV', help="also write every squeeze event here")
+    parser.add_argument('--figures', metavar='DIR', help="also save one figure per recording here")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes")
+    args = parser.parse_args()
+
+    files = find_recordings(args.patterns)
+    if not files:
+        parser.error("no recordings match " + " ".join(args.patterns))
+    if args.figures:
+        os.makedirs(args.figures, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(analyze_file, f, args.rate,
+                               args.baseline and tuple(args.baseline), args.figures, args.sign)
+                   for f in files]
+        rows = []
+        event_rows = []
+        for path, future in zip(files, futures):
+            try:
+                row, events = future.result()
+            except Exception as e:
+                print(f"{path}: failed ({e})")
+                continue
+            rows.append(row)
+            event_rows.extend(events)
+
+    write_table(rows, SUMMARY_FIELDS, args.output)
+    print_summary(rows)
+    print(f"Summary written to {args.output}")
+    if args.events:
+        write_table(event_rows, EVENT_FIELDS, args.events)
+        print(f"{len(event_rows)} events written to {args.events}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Squeeze-event segmentation for baseline-adjusted force traces.
+
+A squeeze is a run of samples above the 'off' threshold that reaches the
+'on' threshold somewhere (hysteresis: noise around one threshold cannot
+split or start an event). Runs, peaks and the 10%/90%-of-peak crossings
+are all found with whole-array operations (diff, reduceat), so a recording
+is segmented in O(n) without a Python loop over samples or events.
+
+Which way a squeeze pushes Fz depends on the mounting (analysis.py plots
+-Fz, but the feb13 recordings without the SingleTact squeeze it positive),
+so by default detect_events() takes the sign of the trace's dominant
+excursion (squeeze_polarity) and sets its thresholds relative to the
+typical squeeze force of that trace. Pass only samples recorded after the
+sensor was biased (baseline.find_bias_point): the unbiased ~50 N would
+dominate both.
+
+Event table columns (times in s, forces in N):
+    onset       first sample above 'off'
+    peak_time   time of the peak
+    peak        peak squeeze force
+    rise_time   10% -> 90% of peak
+    hold        first to last sample at >= 90% of peak
+    release     last 90% -> last 10% of peak
+    end         last sample above 'off'
+    impulse     integral of the force over the event (N*s)
+"""
+import numpy as np
+
+# Default thresholds as fractions of the trace's squeeze level (the 90th
+# percentile of sign * force), never below the absolute floors in N
+ON_FRACTION, OFF_FRACTION = 0.6, 0.4
+MIN_ON, MIN_OFF = 2.0, 0.5
+
+EVENT_DTYPE = np.dtype([('onset', 'f8'), ('peak_time', 'f8'), ('peak', 'f8'),
+                        ('rise_time', 'f8'), ('hold', 'f8'), ('release', 'f8'),
+                        ('end', 'f8'), ('impulse', 'f8')])
+
+def find_runs(mask):
+    """(starts, ends) of the runs of True in mask; ends are exclusive."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return edges[0::2], edges[1::2]
+
+def squeeze_polarity(force):
+    """+1 or -1: the side of zero with the larger excursions (1st vs 99th percentile)."""
+    force = np.asarray(force, dtype=np.float64)
+    if not len(force):
+        return -1
+    low, high = np.percentile(force, (1, 99))
+    return 1 if high > -low else -1
+
+def event_thresholds(force, sign):
+    """Default (on, off) thresholds in N for sign * force (see ON_FRACTION)."""
+    level = np.percentile(sign * np.asarray(force, dtype=np.float64), 90) if len(force) else 0.0
+    return max(ON_FRACTION * level, MIN_ON), max(OFF_FRACTION * level, MIN_OFF)
+
+def detect_events(force, sampling_rate, on=None, off=None, min_duration=0.1, sign=None):
+    """
+    Segment a baseline-adjusted force trace into squeeze events.
+    sign defaults to squeeze_polarity(force), on/off to event_thresholds().
+    Returns a structured array with EVENT_DTYPE, one row per event.
+    """
+    if sign is None:
+        sign = squeeze_polarity(force)
+    if on is None or off is None:
+        default_on, default_off = event_thresholds(force, sign)
+        on = default_on if on is None else on
+        off = default_off if off is None else off
+    x = sign * np.asarray(force, dtype=np.float64)
+    starts, ends = find_runs(x > off)
+    if not len(starts):
+        return np.zeros(0, EVENT_DTYPE)
+
+    peaks = np.maximum.reduceat(x, starts)
+    # reduceat also reduces the gaps between runs; those are below 'off' so they never pass
+    keep = (peaks >= on) & (ends - starts >= min_duration * sampling_rate)
+    starts, ends, peaks = starts[keep], ends[keep], peaks[keep]
+    if not len(starts):
+        return np.zeros(0, EVENT_DTYPE)
+
+    # Gather every event sample into one flat array, tagged with its event number
+    lengths = ends - starts
+    event_of = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    idx = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    values = x[idx]
+    level = values / peaks[event_of]
+
+    def first(mask):
+        return np.minimum.reduceat(np.where(mask, idx, np.iinfo(np.int64).max), offsets)
+
+    def last(mask):
+        return np.maximum.reduceat(np.where(mask, idx, -1), offsets)
+
+    first_10, first_90 = first(level >= 0.1), first(level >= 0.9)
+    last_10, last_90 = last(level >= 0.1), last(level >= 0.9)
+    peak_idx = first(level >= 1.0)
+
+    events = np.zeros(len(starts), EVENT_DTYPE)
+    events['onset'] = starts / sampling_rate
+    events['peak_time'] = peak_idx / sampling_rate
+    events['peak'] = peaks
+    events['rise_time'] = (first_90 - first_10) / sampling_rate
+    events['hold'] = (last_90 - first_90) / sampling_rate
+    events['release'] = (last_10 - last_90) / sampling_rate
+    events['end'] = (ends - 1) / sampling_rate
+    events['impulse'] = np.add.reduceat(values, offsets) / sampling_rate
+    return events
+
+def summarize_events(events):
+    """Per-recording aggregates for comparing runs (e.g. with/without SingleTact)."""
+    if not len(events):
+        return {'events': 0, 'mean_peak': np.nan, 'mean_rise_time': np.nan, 'mean_hold': np.nan}
+    return {'events': len(events),
+            'mean_peak': events['peak'].mean(),
+            'mean_rise_time': events['rise_time'].mean(),
+            'mean_hold': events['hold'].mean()}
@@ -0,0 +1,152 @@
+"""
+Binary columnar storage for ATI force/torque recordings.
+
+The ATI logger writes whitespace text, six columns per row
+(Fx Fy Fz Tx Ty Tz). convert() parses a recording once and stores it next
+to the .txt as
+
+    <name>.npy   float64 array of shape (6, rows): one contiguous row per column
+    <name>.json  header: sampling rate, columns, row count, source file and
+                 its size/mtime, lines skipped while parsing
+
+load_recording() memory-maps the .npy, so opening a recording costs the same
+no matter its length, and slicing one column only reads that column's pages.
+Given a .txt it (re)converts first when the binary copy is missing or stale.
+
+    python squeeze_store.py                 convert every Data/*.txt
+    python squeeze_store.py a.txt b.txt --rate 60
+"""
+import argparse
+import glob
+import json
+import os
+import numpy as np
+
+COLUMNS = ('Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz')
+DEFAULT_SAMPLING_RATE = 60  # Hz, the ATI logger setting used for these tests
+FORMAT_VERSION = 1
+
+def binary_paths(txt_path):
+    base = os.path.splitext(txt_path)[0]
+    return base + '.npy', base + '.json'
+
+def parse_txt(txt_path):
+    """
+    Read a recording's rows as a (rows, 6) array. Lines that are not six
+    numbers (console output pasted into the log, blank lines) are skipped.
+    Returns (data, number of skipped lines).
+    """
+    rows = []
+    skipped = 0
+    with open(txt_path, 'r', errors='ignore') as f:
+        for line in f:
+            tokens = line.split()
+            if len(tokens) != len(COLUMNS):
+                skipped += bool(tokens)
+                continue
+            try:
+                rows.append([float(t) for t in tokens])
+            except ValueError:
+                skipped += 1
+    return np.array(rows, dtype=np.float64).reshape(-1, len(COLUMNS)), skipped
+
+def convert(txt_path, sampling_rate=DEFAULT_SAMPLING_RATE):
+    """Write the .npy/.json pair for txt_path. Returns the header dict."""
+    data, skipped = parse_txt(txt_path)
+    npy_path, json_path = binary_paths(txt_path)
+    np.save(npy_path, np.ascontiguousarray(data.T))
+    stat = os.stat(txt_path)
+    header = {
+        'version': FORMAT_VERSION,
+        'columns': list(COLUMNS),
+        'rows': int(data.shape[0]),
+        'sampling_rate': sampling_rate,
+        'source': os.path.basename(txt_path),
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'skipped_lines': skipped,
+    }
+    with open(json_path, 'w') as f:
+        json.dump(header, f, indent=2)
+    return header
+
+def is_current(txt_path):
+    """True if the binary copy of txt_path exists and matches the source."""
+    npy_path, json_path = binary_paths(txt_path)
+    if not (os.path.exists(npy_path) and os.path.exists(json_path)):
+        return False
+    with open(json_path) as f:
+        header = json.load(f)
+    stat = os.stat(txt_path)
+    return (header.get('version') == FORMAT_VERSION
+            and header.get('source_size') == stat.st_size
+            and header.get('source_mtime') == stat.st_mtime)
+
+
+class Recording:
+    """A memory-mapped recording. Columns are read-only float64 views."""
+    def __init__(self, npy_path, header):
+        self.path = npy_path
+        self.header = header
+        self.sampling_rate = header['sampling_rate']
+        self.columns = np.load(npy_path, mmap_mode='r')
+
+    def __len__(self):
+        return self.columns.shape[1]
+
+    def column(self, name):
+        return self.columns[COLUMNS.index(name)]
+
+    @property
+    def force(self):
+        """(3, rows) view: Fx, Fy, Fz."""
+        return self.columns[0:3]
+
+    @property
+    def torque(self):
+        """(3, rows) view: Tx, Ty, Tz."""
+        return self.columns[3:6]
+
+    @property
+    def time(self):
+        return np.arange(len(self)) / self.sampling_rate
+
+
+def load_recording(path, sampling_rate=None):
+    """
+    Open a recording given its .txt, .npy or base path. A .txt source is
+    converted first if needed; sampling_rate overrides the stored one.
+    """
+    base, ext = os.path.splitext(path)
+    txt_path = base + '.txt'
+    if ext not in ('.npy', '.json') and os.path.exists(txt_path) and not is_current(txt_path):
+        convert(txt_path, sampling_rate or DEFAULT_SAMPLING_RATE)
+    npy_path, json_path = binary_paths(base + '.txt')
+    with open(json_path) as f:
+        header = json.load(f)
+    if sampling_rate is not None:
+        header['sampling_rate'] = sampling_rate
+    return Recording(npy_path, header)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert ATI .txt recordings to memory-mappable .npy")
+    parser.add_argument('files', nargs='*',
+                        help="recordings to convert (default: every .txt in Data/)")
+    parser.add_argument('--rate', type=float, default=DEFAULT_SAMPLING_RATE,
+                        help="sampling rate in Hz to store in the header")
+    parser.add_argument('--force', action='store_true', help="convert even if up to date")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                        'Data', '*.txt')))
+    for txt_path in files:
+        if not args.force and is_current(txt_path):
+            print(f"{txt_path}: up to date")
+            continue
+        header = convert(txt_path, args.rate)
+        note = f", skipped {header['skipped_lines']} lines" if header['skipped_lines'] else ""
+        print(f"{txt_path}: {header['rows']} rows{note}")
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,154 @@
+import argparse
+import json
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
+import sys
+
+from wrist.result_cache import ResultCache
+
+# Tables and figures are reused until a CSV or this script changes
+CACHE = ResultCache(code=[__file__])
+
+# Per-channel drive frequencies read by combined_UI.py
+DRIVE_FREQUENCY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'drive_frequencies.json')
+
+def read_sweep(csv_file):
+    """
+    Reads one frequency-sweep CSV ('frequency', 'accel_z' columns) into a DataFrame.
+    """
+    # Check if the CSV file exists
+    if not os.path.exists(csv_file):
+        raise FileNotFoundError(f"The file '{csv_file}' does not exist.")
+    
+    df = pd.read_csv(csv_file)
+    
+    # Validate the required columns exist
+    if not {'frequency', 'accel_z'}.issubset(df.columns):
+        raise ValueError(f"CSV file '{csv_file}' must contain 'frequency' and 'accel_z' columns.")
+    return df
+
+def response_table(csv_files, labels=None, statistic='max'):
+    """
+    Computes the vibration response at each frequency step of each sweep.
+    
+    Parameters:
+    - csv_files: list of str, paths to the CSV files.
+    - labels: list of str or None, one label per file (defaults to the file names).
+    - statistic: 'max' for the maximum absolute accel_z, or 'rms' for the RMS of
+      accel_z about its mean (uses every sample of the step, so it is less
+      sensitive to single spikes than the max).
+    
+    Returns:
+    - DataFrame indexed by frequency (sorted), one column per label. Frequencies
+      missing from a sweep are NaN.
+    """
+    if labels is None:
+        labels = [os.path.splitext(os.path.basename(f))[0] for f in csv_files]
+    # Validate input lengths
+    if len(csv_files) != len(labels):
+        raise ValueError("The number of CSV files must match the number of labels.")
+    
+    if statistic not in ('max', 'rms'):
+        raise ValueError(f"Unknown statistic '{statistic}', expected 'max' or 'rms'.")
+    return CACHE.memoize('response_table', csv_files, {'labels': labels, 'statistic': statistic},
+                         lambda: _response_table(csv_files, labels, statistic))
+
+def _response_table(csv_files, labels, statistic):
+    # One long frame for all sweeps, then a single built-in groupby aggregation
+    df = pd.concat([read_sweep(f)[['frequency', 'accel_z']].assign(label=label)
+                    for f, label in zip(csv_files, labels)], ignore_index=True)
+    groups_key = ['frequency', 'label']
+    if statistic == 'max':
+        df['accel_z'] = df['accel_z'].abs()
+        table = df.groupby(groups_key, sort=True)['accel_z'].max()
+    elif statistic == 'rms':
+        df['accel_z_sq'] = df['accel_z'] ** 2
+        moments = df.groupby(groups_key, sort=True)[['accel_z', 'accel_z_sq']].mean()
+        table = np.sqrt((moments['accel_z_sq'] - moments['accel_z'] ** 2).clip(lower=0))
+    return table.unstack('label')[list(dict.fromkeys(labels))]
+
+def max_vibration_table(csv_files, labels=None):
+    """
+    Computes the maximum absolute accel_z for each frequency of each sweep
+    (response_table with statistic='max').
+    """
+    return response_table(csv_files, labels, 'max')
+
+def peak_frequencies(table):
+    """Frequency with the highest amplitude for each column of a response table."""
+    return table.idxmax()
+
+def _fit_quadratics(x, y):
+    """
+    Least-squares y ~ c2*x^2 + c1*x + c0 for every column of x, y (points x boards)
+    at once. Returns (c2, c1, c0), each one value per column.
+    """
+    basis = np.stack((x ** 2, x, np.ones_like(x)), axis=-1).transpose(1, 0, 2)  # boards x points x 3
+    normal = basis.transpose(0, 2, 1) @ basis
+    rhs = basis.transpose(0, 2, 1) @ y.T[:, :, None]
+    c = np.linalg.solve(normal, rhs)[:, :, 0]
+    return c[:, 0], c[:, 1], c[:, 2]
+
+def estimate_resonance(table, method='lorentzian', points=5):
+    """
+    Estimates the resonant frequency, bandwidth and Q factor of every column
+    of a response table, at sub-step resolution.
+    
+    A fit over the 'points' frequency steps around each column's highest step:
+    - 'lorentzian': fits 1/A^2 with a parabola, i.e. a Lorentzian power
+      response A^2 = P0 / (1 + ((f - f0) / g)^2); the half-power bandwidth is 2g.
+    - 'parabolic': fits A with a parabola (points=3 is classic peak
+      interpolation); the bandwidth is where that parabola drops to peak/sqrt(2).
+    
+    Returns:
+    - DataFrame indexed by label with 'f0' (Hz), 'peak', 'bandwidth' (Hz), 'Q'
+      and 'step_peak' (the raw idxmax frequency). Columns whose fit has no
+      maximum fall back to the step peak, with NaN bandwidth and Q.
+    """
+    freqs = table.index.to_numpy(dtype=float)
+    amps = table.to_numpy(dtype=float)
+    boards = np.arange(amps.shape[1])
+    half = points // 2
+    if len(freqs) < 2 * half + 1:
+        raise ValueError(f"Need at least {2 * half + 1} frequency steps for a {points}-point fit.")
+
+    best = np.argmax(np.where(np.isnan(amps), -np.inf, amps), axis=0)
+    center = np.clip(best, half, len(freqs) - 1 - half)  # keep the fit window inside the sweep
+    window = center[None, :] + np.arange(-half, half + 1)[:, None]  # points x boards
+    step = np.median(np.diff(freqs))
+    x = (freqs[window] - freqs[center]) / step  # centred and scaled for conditioning
+    a = amps[window, boards]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if method == 'lorentzian':
+            c2, c1, c0 = _fit_quadratics(x, 1.0 / a ** 2)
+            valid = c2 > 0
+            inv_peak = c0 - c1 ** 2 / (4 * c2)
+            valid &= inv_peak > 0
+            peak = 1.0 / np.sqrt(inv_peak)
+            bandwidth = 2 * np.sqrt(inv_peak / c2) * step
+        elif method == 'parabolic':
+            c2, c1, c0 = _fit_quadratics(x, a)
+            valid = c2 < 0
+            peak = c0 - c1 ** 2 / (4 * c2)
+            bandwidth = 2 * np.sqrt(peak * (1 - 1 / np.sqrt(2)) / -c2) * step
+        else:
+            raise ValueError(f"Unknown method '{method}', expected 'lorentzian' or 'parabolic'.")
+        f0 = freqs[center] - c1 / (2 * c2) * step
+
+    step_peak = freqs[best]
+    # a fitted peak outside the window is an extrapolation, not a resonance
+    valid &= np.abs(f0 - freqs[center]) <= half * step
+    result = pd.DataFrame({
+        'f0': np.where(valid, f0, step_peak),
+        'peak': np.where(valid, peak, amps[best, boards]),
+        'bandwidth': np.where(valid, bandwidth, np.nan),
+        'step_peak': step_peak,
+    }, index=table.columns)
+    result.insert(3, 'Q', result['f0'] / result['bandwidth'])
+    return result
 
 def plot_max_vibration(csv_files, labels, output_image=None):
     """
@@ -13,51 +161,39 @@ def plot_max_vibration(csv_files, labels, output_image=None):
     - csv_files: list of str, paths to the CSV files.
     - labels: list of str, labels corresponding to each CSV file for the legend.
     - output_image: str or None, path to save the plot image. If None, the plot is shown.
-    """
-    # Validate input lengths
-    if len(csv_files) != len(labels):
-        raise ValueError("The number of CSV files must match the number of labels.")
     
+    Returns:
+    - the max_vibration_table that was plotted.
+    """
+    table = max_vibration_table(csv_files, labels)
+    if output_image is None:
+        plot_max_vibration_table(table)
+    elif CACHE.output('plot_max_vibration', csv_files, {'labels': labels}, output_image,
+                      lambda path: plot_max_vibration_table(table, path)):
+        print(f"Plot '{output_image}' is up to date")
+    return table
+
+def plot_max_vibration_table(table, output_image=None):
+    """
+    Plots a max_vibration_table (one line per column) with the peak frequency of each marked.
+    """
     plt.figure(figsize=(12, 8))
     
     # Colors for plotting
     colors = ['blue', 'green', 'red', 'cyan', 'magenta', 'yellow', 'black']  # Extend if more datasets are added
     
-    # Dictionary to store maximum frequencies
-    max_freqs = {}
+    peaks = peak_frequencies(table)
     
     # Plot each dataset
-    for idx, csv_file in enumerate(csv_files):
-        label = labels[idx]
+    for idx, label in enumerate(table.columns):
         color = colors[idx % len(colors)]
-        
-        # Check if the CSV file exists
-        if not os.path.exists(csv_file):
-            raise FileNotFoundError(f"The file '{csv_file}' does not exist.")
-        
-        # Read the CSV file into a pandas DataFrame
-        df = pd.read_csv(csv_file)
-        
-        # Validate the required columns exist
-        if not {'frequency', 'accel_z'}.issubset(df.columns):
-            raise ValueError(f"CSV file '{csv_file}' must contain 'frequency' and 'accel_z' columns.")
-        
-        # Compute the maximum of absolute accel_z for each frequency
-        max_vibration = df.groupby('frequency')['accel_z'].apply(lambda x: x.abs().max()).reset_index()
-        
-        # Sort the data by frequency for better plotting
-        max_vibration = max_vibration.sort_values(by='frequency')
-        
-        # Find the frequency with the maximum amplitude
-        idx_max = max_vibration['accel_z'].idxmax()
-        freq_max = max_vibration.loc[idx_max, 'frequency']
-        amp_max = max_vibration.loc[idx_max, 'accel_z']
-        max_freqs[label] = freq_max
+        sweep = table[label].dropna()
+        freq_max = peaks[label]
         
         # Plot the max vibration amplitude vs frequency
         plt.plot(
-            max_vibration['frequency'],
-            max_vibration['accel_z'],
+            sweep.index,
+            sweep.values,
             marker='o',
             linestyle='-',
             color=color,
@@ -91,12 +227,43 @@ def plot_max_vibration(csv_files, labels, output_image=None):
     # Save or show the plot
     if output_image:
         plt.savefig(output_image, dpi=300, bbox_inches='tight')
+        plt.close()
         print(f"Plot saved as '{output_image}'")
     else:
         plt.show()
 
+def write_drive_frequencies(resonance, output_file=DRIVE_FREQUENCY_FILE):
+    """
+    Writes the 'f0' of an estimate_resonance table as {label: Hz} JSON, for
+    combined_UI.py to drive each channel at its own resonance. Labels are
+    the channel numbers; columns without a finite f0 are left out.
+    """
+    f0 = resonance['f0'].dropna()
+    with open(output_file, 'w') as f:
+        json.dump({str(label): round(float(freq), 2) for label, freq in f0.items()}, f, indent=1)
+    print(f"Drive frequencies saved to '{output_file}'")
+    return output_file
+
+def drive_frequencies_main(argv=None):
+    """
+    python analysis_LRA.py --channel 1 ch1_sweep.csv --channel 0 ch0_sweep.csv
+    estimates every channel's resonance from its sweep and writes them for combined_UI.py.
+    """
+    parser = argparse.ArgumentParser(description="Estimate per-channel LRA resonance for combined_UI")
+    parser.add_argument('--channel', nargs=2, action='append', metavar=('CHANNEL', 'CSV'), required=True,
+                        help="Syntacts channel and the sweep CSV recorded on it")
+    parser.add_argument('--method', choices=('lorentzian', 'parabolic'), default='lorentzian')
+    parser.add_argument('--output', default=DRIVE_FREQUENCY_FILE)
+    args = parser.parse_args(argv)
+    channels = [int(ch) for ch, _ in args.channel]
+    resonance = estimate_resonance(response_table([csv for _, csv in args.channel], channels, 'rms'), args.method)
+    print(resonance.round(2))
+    write_drive_frequencies(resonance, args.output)
+
 # Example usage:
-if __name__ == "__main__":
+if __name__ == "__main__" and len(sys.argv) > 1:
+    drive_frequencies_main()
+elif __name__ == "__main__":
     # Define your CSV files and their corresponding labels
     csv_files = ['With_PCB_Data.csv', 'Without_PCB.csv']
     labels = ['With PCB', 'Without PCB']
@@ -105,3 +272,6 @@ if __name__ == "__main__":
     output_plot = 'max_vibration_comparison.png'  # Change to None to display the plot instead
     
     plot_max_vibration(csv_files, labels, output_plot)
+    
+    # Sub-step resonance estimates from the per-step RMS
+    print(estimate_resonance(response_table(csv_files, labels, 'rms')).round(2))
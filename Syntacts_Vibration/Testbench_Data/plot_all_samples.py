@@ -1,7 +1,17 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from sweep_stream import scan_sweep
+
+from wrist.result_cache import ResultCache
+
+# Figures are reused until a CSV or the plotting code changes
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE = ResultCache(code=[__file__, os.path.join(HERE, 'sweep_stream.py')])
 
 def read_and_process_csv(csv_file, sampling_rate=None):
     """
@@ -12,16 +22,18 @@ def read_and_process_csv(csv_file, sampling_rate=None):
     - sampling_rate: float or None, samples per second. If None, sample index is used as time.
     
     Returns:
-    - df: pandas DataFrame with added 'time' and 'frequency_change' columns.
+    - df: pandas DataFrame with 'frequency', 'accel_z', 'time' and 'frequency_change'
+      columns. The run-length segment index (sweep_stream.SweepIndex) is in
+      df.attrs['segments'].
     """
     if not os.path.exists(csv_file):
         raise FileNotFoundError(f"The file '{csv_file}' does not exist.")
         
-    df = pd.read_csv(csv_file)
-    
-    # Validate required columns
-    if not {'frequency', 'accel_z'}.issubset(df.columns):
-        raise ValueError("CSV file must contain 'frequency' and 'accel_z' columns.")
+    # One streaming pass builds the segment index and keeps only accel_z
+    # (a missing 'frequency' or 'accel_z' column raises ValueError)
+    segments, data = scan_sweep(csv_file, keep=['accel_z'])
+    df = pd.DataFrame({'frequency': np.repeat(segments.frequency, segments.end - segments.start),
+                       'accel_z': data['accel_z']})
     
     # Assign time based on sampling rate or sample index
     if sampling_rate is not None and sampling_rate > 0:
@@ -29,11 +41,30 @@ def read_and_process_csv(csv_file, sampling_rate=None):
     else:
         df['time'] = df.index  # use sample index as time
     
-    # Detect frequency change points
-    df['frequency_change'] = df['frequency'].diff().fillna(0) != 0
+    # Frequency change points come from the segment index
+    df['frequency_change'] = False
+    df.loc[segments.start[1:], 'frequency_change'] = True
+    df.attrs['segments'] = segments
     return df
 
-def plot_vibration_subplot(ax, df, title, color='green'):
+def decimate_minmax(x, y, width):
+    """
+    Reduces a trace to the min and max of each of 'width' bins (two points per
+    pixel column), which draws the same as the full trace at that width.
+    Traces with fewer than 2 * width points are returned unchanged.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= 2 * width:
+        return x, y
+    starts = np.linspace(0, len(y), width + 1).astype(np.int64)[:-1]
+    x_out = np.repeat(x[starts], 2)
+    y_out = np.empty(2 * width)
+    y_out[0::2] = np.minimum.reduceat(y, starts)
+    y_out[1::2] = np.maximum.reduceat(y, starts)
+    return x_out, y_out
+
+def plot_vibration_subplot(ax, df, title, color='green', dpi=300, label_spacing=10):
     """
     Plots accel_z over time on the given Axes object and marks frequency change points.
     
@@ -42,26 +73,45 @@ def plot_vibration_subplot(ax, df, title, color='green'):
     - df: pandas DataFrame with 'time', 'accel_z', and 'frequency_change' columns.
     - title: str, title for the subplot.
     - color: str, color for the accel_z line.
+    - dpi: int, resolution the figure will be saved at; the trace is decimated
+      to the axes' width in pixels at this resolution.
+    - label_spacing: float, minimum distance in points (1/72 inch, like font sizes)
+      between frequency labels; labels closer than this to the previous one are
+      skipped (lines are not).
     """
     # Set Y-axis limits
     ax.set_ylim(-3, 3)
     
-    # Plot accel_z
-    ax.plot(df['time'], df['accel_z'], color=color, linewidth=1, label='Accel Z')
+    # Plot accel_z, decimated to the output pixel width
+    width = max(int(ax.get_window_extent().width * dpi / ax.figure.dpi), 1)
+    x, y = decimate_minmax(df['time'].to_numpy(), df['accel_z'].to_numpy(), width)
+    ax.plot(x, y, color=color, linewidth=1, label='Accel Z')
     
-    # Identify frequency change points
-    change_points = df[df['frequency_change']].index.tolist()
-    freq_values = df.loc[change_points, 'frequency'].tolist()
+    # Identify frequency change points (every segment start but the first)
+    segments = df.attrs.get('segments')
+    if segments is not None:
+        change_points = segments.start[1:].tolist()
+        freq_values = segments.frequency[1:].tolist()
+    else:
+        change_points = df[df['frequency_change']].index.tolist()
+        freq_values = df.loc[change_points, 'frequency'].tolist()
     
     # Get current Y-axis limits for text placement
     ymin, ymax = ax.get_ylim()
     
-    # Add vertical lines and frequency labels
-    for cp, freq in zip(change_points, freq_values):
-        time_cp = df.at[cp, 'time']
-        ax.axvline(x=time_cp, color='red', linestyle='--', linewidth=1)
-        ax.text(time_cp, ymax, f'{freq} Hz', rotation=90,
-                verticalalignment='top', horizontalalignment='right', color='red', fontsize=8)
+    # All vertical lines as one LineCollection
+    times = df['time'].to_numpy()[change_points]
+    ax.vlines(times, ymin, ymax, colors='red', linestyles='--', linewidth=1)
+    
+    # Frequency labels, at most one per label_spacing pixels
+    if len(times):
+        span = max(times[-1] - df['time'].iloc[0], 1e-12)
+        spacing_px = label_spacing * dpi / 72  # points -> output pixels
+        slots = np.floor((times - df['time'].iloc[0]) / span * width / spacing_px)
+        _, keep = np.unique(slots, return_index=True)
+        for i in keep:
+            ax.text(times[i], ymax, f'{freq_values[i]} Hz', rotation=90,
+                    verticalalignment='top', horizontalalignment='right', color='red', fontsize=8)
     
     # Set subplot title and labels
     ax.set_title(title)
@@ -80,7 +130,26 @@ def plot_vibration_two_subplots(csv_file_1, csv_file_2, output_image=None, sampl
     - output_image: str or None, path to save the plot image. If None, the plot is shown.
     - sampling_rate: float or None, samples per second. If None, sample index is used as time.
     """
+    if output_image is None:
+        _plot_vibration_two_subplots(csv_file_1, csv_file_2, None, sampling_rate)
+    elif CACHE.output('plot_vibration_two_subplots', [csv_file_1, csv_file_2],
+                      {'sampling_rate': sampling_rate}, output_image,
+                      lambda path: _plot_vibration_two_subplots(csv_file_1, csv_file_2, path, sampling_rate)):
+        print(f"Plot '{output_image}' is up to date")
+
+def _plot_vibration_two_subplots(csv_file_1, csv_file_2, output_image, sampling_rate):
     try:
+        if output_image:
+            # Each subplot is rendered headless in its own process, then the two are stacked
+            with tempfile.TemporaryDirectory() as tmp:
+                panels = render_vibration_figures([
+                    (csv_file_1, 'Vibration Amplitude without PCB', 'green', os.path.join(tmp, 'top.png')),
+                    (csv_file_2, 'Vibration Amplitude with PCB', 'blue', os.path.join(tmp, 'bottom.png')),
+                ], sampling_rate)
+                stack_images(panels, output_image)
+            print(f"Plot saved as '{output_image}'")
+            return
+
         # Process both CSV files
         df1 = read_and_process_csv(csv_file_1, sampling_rate=sampling_rate)
         df2 = read_and_process_csv(csv_file_2, sampling_rate=sampling_rate)
@@ -106,6 +175,7 @@ def plot_vibration_two_subplots(csv_file_1, csv_file_2, output_image=None, sampl
         # Save or show the plot
         if output_image:
             plt.savefig(output_image, dpi=300, bbox_inches='tight')
+            plt.close(fig)
             print(f"Plot saved as '{output_image}'")
         else:
             plt.show()
@@ -121,6 +191,43 @@ def plot_vibration_two_subplots(csv_file_1, csv_file_2, output_image=None, sampl
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
+def render_vibration_figure(csv_file, title, color, output_image, sampling_rate=None):
+    """
+    Renders one CSV's accel_z trace (one subplot of vibration_comparison.png)
+    to output_image with the headless Agg backend, or copies it from the
+    cache. Module-level so it can run in a worker process.
+    """
+    CACHE.output('render_vibration_figure', [csv_file],
+                 {'title': title, 'color': color, 'sampling_rate': sampling_rate}, output_image,
+                 lambda path: _render_vibration_figure(csv_file, title, color, path, sampling_rate))
+    return output_image
+
+def _render_vibration_figure(csv_file, title, color, output_image, sampling_rate):
+    plt.switch_backend('Agg')
+    df = read_and_process_csv(csv_file, sampling_rate=sampling_rate)
+    fig, ax = plt.subplots(figsize=(15, 6))  # one half of the (15, 12) two-subplot figure
+    plot_vibration_subplot(ax, df, title=title, color=color)
+    fig.tight_layout()
+    fig.savefig(output_image, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+def render_vibration_figures(jobs, sampling_rate=None, workers=None):
+    """
+    Renders several (csv_file, title, color, output_image) figures in parallel
+    headless processes. Returns the saved image paths.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_vibration_figure, *job, sampling_rate) for job in jobs]
+        return [future.result() for future in futures]
+
+def stack_images(paths, output_image):
+    """Stacks PNGs top to bottom into output_image, padding narrower ones with white."""
+    images = [plt.imread(path)[..., :3] for path in paths]
+    width = max(image.shape[1] for image in images)
+    padded = [np.pad(image, ((0, 0), (0, width - image.shape[1]), (0, 0)), constant_values=1.0)
+              for image in images]
+    plt.imsave(output_image, np.concatenate(padded), dpi=300)
+
 def main():
     """
     Main function to execute the plotting of two CSV files with specified colors.
@@ -133,7 +240,7 @@ def main():
     # Define sampling rate (set to your actual sampling rate if known, e.g., 60 Hz)
     sampling_rate = 60  # samples per second
     
-    # Plot the two subplots
+    # Plot the two subplots (rendered in parallel when saving)
     plot_vibration_two_subplots(csv_path_without_pcb, csv_path_with_pcb, output_plot, sampling_rate)
 
 if __name__ == "__main__":
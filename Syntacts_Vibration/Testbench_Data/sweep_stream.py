@@ -0,0 +1,127 @@
+"""
+Streaming access to long frequency-sweep CSVs ('frequency', 'accel_z', ...).
+
+build_segment_index() reads the file in fixed-size byte blocks and records
+one entry per run of equal frequency: (frequency, start row, end row, byte
+offset, byte length). Memory stays bounded by the block size however long
+the sweep is, and SweepIndex.read(i) later seeks straight to segment i, so
+loading one frequency step costs the size of that step rather than a
+re-parse of everything before it.
+
+scan_sweep() builds the same index and, in the same single pass, keeps
+only the columns a caller asks for (e.g. accel_z for plotting), so nothing
+reads the file twice or holds its other columns.
+"""
+import io
+import numpy as np
+import pandas as pd
+
+BLOCK_SIZE = 8 << 20  # bytes per read while indexing
+
+class SweepIndex:
+    def __init__(self, path, columns, frequency, start, end, offset, nbytes):
+        self.path = path
+        self.columns = columns
+        self.frequency = frequency  # one entry per segment
+        self.start = start          # first row (0 = first data row)
+        self.end = end              # one past the last row
+        self.offset = offset        # byte offset of the segment's first line
+        self.nbytes = nbytes
+
+    def __len__(self):
+        return len(self.frequency)
+
+    @property
+    def rows(self):
+        return int(self.end[-1]) if len(self) else 0
+
+    def read(self, i):
+        """DataFrame of segment i, with the file's row numbers as its index."""
+        with open(self.path, 'rb') as f:
+            f.seek(int(self.offset[i]))
+            data = f.read(int(self.nbytes[i]))
+        df = pd.read_csv(io.BytesIO(data), header=None, names=self.columns)
+        df.index = pd.RangeIndex(int(self.start[i]), int(self.end[i]))
+        return df
+
+    def segments_for(self, frequency):
+        """Indices of the segments played at 'frequency'."""
+        return np.flatnonzero(self.frequency == frequency)
+
+    def to_frame(self):
+        return pd.DataFrame({'frequency': self.frequency, 'start': self.start, 'end': self.end,
+                             'offset': self.offset, 'nbytes': self.nbytes})
+
+
+def iter_blocks(path, block_size=BLOCK_SIZE):
+    """
+    Yield (columns, byte offset, row offset, block) for consecutive blocks of
+    whole data lines. Blank lines are not expected inside the data.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        columns = header.decode().strip().split(',')
+        offset = len(header)
+        row = 0
+        carry = b''
+        while True:
+            data = f.read(block_size)
+            block = carry + data
+            cut = block.rfind(b'\n') + 1 if data else len(block)
+            block, carry = block[:cut], block[cut:]
+            if block.strip():
+                yield columns, offset, row, block
+                row += block.count(b'\n') + (not block.endswith(b'\n'))
+            offset += len(block)
+            if not data:
+                return
+
+def build_segment_index(path, block_size=BLOCK_SIZE):
+    """Stream the CSV once and return its SweepIndex."""
+    return scan_sweep(path, block_size=block_size)[0]
+
+def scan_sweep(path, keep=(), block_size=BLOCK_SIZE):
+    """
+    Stream the CSV once. Returns (SweepIndex, {column: ndarray}) for the
+    columns in 'keep'; a missing 'frequency' or kept column is a ValueError.
+    """
+    columns = None
+    frequency, start, offset = [], [], []
+    kept = {name: [] for name in keep}
+    last = None
+    end_offset = 0
+    for columns, block_offset, row, block in iter_blocks(path, block_size):
+        missing = {'frequency', *keep} - set(columns)
+        if missing:
+            raise ValueError(f"{path} has no column(s) {', '.join(sorted(missing))}")
+        data = pd.read_csv(io.BytesIO(block), header=None, names=columns,
+                           usecols=['frequency', *keep])
+        freq = data['frequency'].to_numpy()
+        for name in keep:
+            kept[name].append(data[name].to_numpy())
+        # byte offset of every line in the block
+        newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+        line_starts = block_offset + np.concatenate(([0], newlines[:len(freq) - 1] + 1))
+        changes = np.flatnonzero(np.diff(freq) != 0) + 1
+        if last is None or freq[0] != last:
+            changes = np.concatenate(([0], changes))
+        frequency.append(freq[changes])
+        start.append(row + changes)
+        offset.append(line_starts[changes])
+        last = freq[-1]
+        end_offset = block_offset + len(block)
+        end_row = row + len(freq)
+
+    if columns is None:
+        columns = pd.read_csv(path, nrows=0).columns.tolist()
+        empty = np.zeros(0, dtype=np.int64)
+        return (SweepIndex(path, columns, np.zeros(0), empty, empty, empty, empty),
+                {name: np.zeros(0) for name in keep})
+
+    frequency = np.concatenate(frequency)
+    start = np.concatenate(start)
+    offset = np.concatenate(offset)
+    end = np.append(start[1:], end_row)
+    nbytes = np.append(offset[1:], end_offset) - offset
+    return (SweepIndex(path, columns, frequency, start, end, offset, nbytes),
+            {name: np.concatenate(parts) for name, parts in kept.items()})
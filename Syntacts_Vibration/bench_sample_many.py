@@ -0,0 +1,48 @@
+"""
+Micro-benchmark for Signal.sample_many against the scalar Signal.sample path.
+
+Previews the 0.75 s Sine(170) * Envelope(0.75) pattern at 48 kHz, i.e. 36k
+samples, and prints which path sample_many took:
+
+- native Signal_sampleMany: one ctypes call for all samples;
+- NumPy twin: the native library (like the released syntacts_c) has no
+  Signal_sampleMany, so the signal's syntacts_numpy twin is evaluated;
+- NumPy engine: no native library at all. Both sides are then NumPy and the
+  ratio says nothing about the ctypes path.
+
+Run from this folder: python bench_sample_many.py
+"""
+import timeit
+import numpy as np
+import syntacts
+from syntacts import *
+
+SAMPLE_RATE = 48000
+REPEATS = 5
+
+signal = Sine(170) * Envelope(0.75)
+times = np.arange(int(round(signal.length * SAMPLE_RATE))) / SAMPLE_RATE
+out = np.empty_like(times)
+
+def scalar_path():
+    return [signal.sample(t) for t in times.tolist()]
+
+def batched_path():
+    return signal.sample_many(times, out)
+
+def measured_path():
+    if syntacts._tact is None:
+        return "NumPy engine (no native library; scalar side is NumPy too, not ctypes)"
+    if hasattr(syntacts._tact, 'Signal_sampleMany'):
+        return "native Signal_sampleMany"
+    if signal._mirror is not None:
+        return "NumPy twin (library has no Signal_sampleMany) vs ctypes Signal_sample"
+    return "ctypes Signal_sample per sample on both sides"
+
+if __name__ == "__main__":
+    assert np.allclose(scalar_path(), batched_path())
+    t_scalar = min(timeit.repeat(scalar_path, number=1, repeat=REPEATS))
+    t_batched = min(timeit.repeat(batched_path, number=1, repeat=REPEATS))
+    print(f"{times.size} samples, sample_many path: {measured_path()}")
+    print(f"sample      : {t_scalar * 1e3:8.2f} ms")
+    print(f"sample_many : {t_batched * 1e3:8.2f} ms  ({t_scalar / t_batched:.0f}x faster)")
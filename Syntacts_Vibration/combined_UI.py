@@ -1,5 +1,6 @@
+import json
+import os
 import sys
-import time
 import serial
 
 from PyQt5.QtWidgets import (
@@ -7,8 +8,13 @@ from PyQt5.QtWidgets import (
     QPushButton, QGroupBox, QLabel
 )
 from syntacts import *  # Make sure the syntacts library is installed and available
+from signal_cache import TactorSignalCache
+from pattern_scheduler import PatternScheduler
+from pattern_compiler import sequential_pulses, compile_pattern
 from PyQt5.QtGui import QFont
 
+from wrist.serial_transport import SerialTransport
+
 # -----------------------------
 # Configuration
 # -----------------------------
@@ -18,6 +24,24 @@ BAUD_RATE = 9600
 # Define the channels for your LRAs
 CHANNELS = [1,0,5,2,4]
 
+# Drive frequency (Hz) per channel: each tactor's resonance, as written by
+# "python Testbench_Data/analysis_LRA.py --channel <ch> <sweep.csv> ...".
+# Channels not listed (or no file) use DEFAULT_FREQUENCY.
+DEFAULT_FREQUENCY = 170
+DRIVE_FREQUENCY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'drive_frequencies.json')
+
+def load_drive_frequencies(path=DRIVE_FREQUENCY_FILE):
+    """{channel: Hz} from the analysis_LRA JSON, or {} if there is none."""
+    try:
+        with open(path) as f:
+            return {int(ch): float(freq) for ch, freq in json.load(f).items()}
+    except (OSError, ValueError) as e:
+        if os.path.exists(path):
+            print(f"Ignoring drive frequencies in '{path}': {e}")
+        return {}
+
+DRIVE_FREQUENCIES = load_drive_frequencies()
+
 # -----------------------------
 # Motor + Vibration UI
 # -----------------------------
@@ -28,10 +52,19 @@ class MotorVibrationUI(QWidget):
 
         # ---- Serial Setup for Motor Control ----
         self.serial_conn = serial.Serial(port, baud, timeout=1)
+        self.transport = SerialTransport(self.serial_conn)
 
         # ---- Syntacts Setup for Vibration ----
         self.session = Session()
         self.session.open()
+        self.signal_cache = TactorSignalCache(maxsize=32)
+        self.pattern_sequences = None  # compiled on first play_pattern
+
+        # Patterns play on a worker thread so the UI (and motor buttons) stay live
+        self.scheduler = PatternScheduler(self.session)
+        self.scheduler.progress.connect(self.on_pattern_progress)
+        self.scheduler.pattern_done.connect(lambda: self.pattern_status.setText("Idle"))
+        self.scheduler.pattern_cancelled.connect(lambda: self.pattern_status.setText("Stopped"))
 
         # Main layout
         main_layout = QVBoxLayout()
@@ -68,9 +101,13 @@ class MotorVibrationUI(QWidget):
         self.btn_play_all_once = QPushButton("Play All (0.5s)")
         self.btn_play_all_once.clicked.connect(self.play_all_once)
 
+        self.btn_stop_pattern = QPushButton("Stop")
+        self.btn_stop_pattern.clicked.connect(self.scheduler.cancel)
+
         pattern_buttons_layout.addWidget(self.btn_play_pattern)
         pattern_buttons_layout.addWidget(self.btn_play_individual_lra)
         pattern_buttons_layout.addWidget(self.btn_play_all_once)
+        pattern_buttons_layout.addWidget(self.btn_stop_pattern)
 
         vib_layout.addLayout(pattern_buttons_layout)
 
@@ -83,6 +120,12 @@ class MotorVibrationUI(QWidget):
 
         vib_layout.addLayout(channel_buttons_layout)
 
+        self.pattern_status = QLabel("Idle")
+        vib_layout.addWidget(self.pattern_status)
+
+        self.cache_status = QLabel("Signal cache: empty")
+        vib_layout.addWidget(self.cache_status)
+
         vib_group.setLayout(vib_layout)
 
         # Add groups to main layout
@@ -109,27 +152,39 @@ class MotorVibrationUI(QWidget):
     def send_command(self, command):
         """ Low-level command sending over serial """
         if self.serial_conn.is_open:
-            self.serial_conn.write(command.encode('utf-8'))
+            self.transport.send(command)
 
     # -----------------------------
     # Vibration Methods
     # -----------------------------
     def create_tactor_signal(self, frequency, duration):
-        """Creates a single Sine signal with an Exponential Decay, then envelopes it."""
+        """
+        Returns a Sine signal with an Exponential Decay, enveloped to 'duration'.
+        Signals are cached, so repeated pulses reuse the same native handles;
+        every lookup refreshes the cache label.
+        """
         amplitude = 1.0
         decay_rate = 6.9
-        return Sine(frequency) * ExponentialDecay(amplitude, decay_rate) * Envelope(duration)
+        signal = self.signal_cache.get(frequency, duration, amplitude, decay_rate)
+        self.show_cache_stats()
+        return signal
+
+    def drive_frequency(self, channel):
+        return DRIVE_FREQUENCIES.get(channel, DEFAULT_FREQUENCY)
+
+    def individual_events(self, durations, start=0.0):
+        """Scheduler events for a pulse on each channel in turn, per duration."""
+        return sequential_pulses(CHANNELS, durations,
+                                 lambda d, ch: self.create_tactor_signal(self.drive_frequency(ch), d),
+                                 start)
 
     def play_individual(self, duration):
         """
         Plays a pulse on each channel individually with
         an exponential decay sine wave for 'duration' seconds.
         """
-        for ch in CHANNELS:
-            signal = self.create_tactor_signal(170, duration)
-            self.session.play(ch, signal)
-            time.sleep(signal.length)  # Blocks UI for demonstration
-            self.session.stop(ch)
+        events, _ = self.individual_events([duration])
+        self.scheduler.schedule(events)
 
     def play_individual_lra(self):
         """Plays each LRA for 0.5s in sequence."""
@@ -137,54 +192,54 @@ class MotorVibrationUI(QWidget):
 
     def play_all_once(self):
         """Plays all channels simultaneously for 0.5s."""
-        duration = 0.5
-        # Create a signal for each channel and play
-        signal = self.create_tactor_signal(170, duration)
-        for ch in CHANNELS:
-            self.session.play(ch, signal)
-        time.sleep(signal.length)  # Blocks UI
-        # Stop them
-        for ch in CHANNELS:
-            self.session.stop(ch)
+        self.scheduler.schedule([(ch, self.create_tactor_signal(self.drive_frequency(ch), 0.5), 0.0)
+                                 for ch in CHANNELS])
 
     def play_single_channel(self, channel, duration):
         """
         Plays a single channel for a given duration (e.g., 0.5s).
         """
-        signal = self.create_tactor_signal(170, duration)
-        self.session.play(channel, signal)
-        time.sleep(signal.length)  # Blocks UI
-        self.session.stop(channel)
+        signal = self.create_tactor_signal(self.drive_frequency(channel), duration)
+        self.scheduler.schedule([(channel, signal, 0.0)])
 
     def play_pattern(self):
         """
         Reproduces your original code snippet:
          1) Plays 'play_individual()' at durations 1.0, 0.5, 0.2, 0.1
          2) Plays a custom pattern on all channels
+        The whole pattern is compiled once into a Sequence per channel, so it
+        starts with a single play per channel and needs no Python-side timing.
         """
-        print("Playing pattern: individual pulses of descending duration.")
-        self.play_individual(1.0)
-        self.play_individual(0.5)
-        self.play_individual(0.2)
-        self.play_individual(0.1)
-
-        print("Playing custom pattern (Sine(170) * Envelope(0.75)) on all channels.")
-        signal1 = Sine(170) * Envelope(0.75)  # length = 0.75
-        sequence = Sequence()
-        sequence << signal1
-
-        for ch in CHANNELS:
-            self.session.play(ch, sequence)
-
-        # Wait for that sequence to finish
-        time.sleep(sequence.length + 0.1)
-        # We do NOT close the session here so user can continue playing
+        if self.pattern_sequences is None:
+            # individual pulses of descending duration, then
+            # the custom pattern (Sine(f0) * Envelope(0.75)) on all channels
+            events, end = self.individual_events([1.0, 0.5, 0.2, 0.1])
+            bursts = {}  # one signal per drive frequency; length = 0.75
+            for ch in CHANNELS:
+                freq = self.drive_frequency(ch)
+                if freq not in bursts:
+                    bursts[freq] = Sine(freq) * Envelope(0.75)
+                events.append((ch, bursts[freq], end))
+            self.pattern_sequences = compile_pattern(events)
+
+        print("Playing pattern: individual pulses of descending duration, then all channels.")
+        self.scheduler.schedule([(ch, seq, 0.0) for ch, seq in self.pattern_sequences.items()])
+
+    def show_cache_stats(self):
+        stats = self.signal_cache.stats()
+        self.cache_status.setText(f"Signal cache: {stats['size']} signals, "
+                                  f"{stats['hits']} hits / {stats['misses']} misses")
+
+    def on_pattern_progress(self, done, total):
+        self.pattern_status.setText(f"Playing: {done}/{total}")
 
     # -----------------------------
     # Cleanup
     # -----------------------------
     def closeEvent(self, event):
         """Close out the Syntacts session and serial gracefully."""
+        self.scheduler.stop()
+        self.transport.close()
         if self.serial_conn.is_open:
             self.serial_conn.close()
         self.session.close()
@@ -0,0 +1,38 @@
+"""
+Compiles multi-channel vibration patterns into one Sequence per channel.
+
+A pattern is a list of (channel, signal, start offset in s) events, the same
+format PatternScheduler takes. compile_pattern() inserts every event into its
+channel's Sequence with Sequence.insert, so the whole pattern starts with a
+single Session.play per channel and the audio thread does all of the timing,
+instead of Python sleeping and stopping between pulses.
+"""
+from syntacts import *
+
+def sequential_pulses(channels, durations, make_signal, start=0.0):
+    """
+    Events for a pulse on each channel in turn, repeated for every duration,
+    e.g. channels [1,0,5,2,4] with pulses of 1.0/0.5/0.2/0.1 s.
+    make_signal(duration, channel) builds the pulse. Returns (events, end offset).
+    """
+    events = []
+    for duration in durations:
+        for ch in channels:
+            signal = make_signal(duration, ch)
+            events.append((ch, signal, start))
+            start += signal.length
+    return events, start
+
+def compile_pattern(events):
+    """
+    Fold (channel, signal, start) events into {channel: Sequence}. Every
+    Sequence is padded with silence to the full pattern length, so all
+    channels finish together.
+    """
+    total = max(start + signal.length for _, signal, start in events)
+    sequences = {}
+    for channel, signal, start in events:
+        if channel not in sequences:
+            sequences[channel] = Sequence().insert(Envelope(total, 0), 0)
+        sequences[channel].insert(signal, start)
+    return sequences
@@ -0,0 +1,107 @@
+"""
+Background timeline scheduler for Syntacts playback.
+
+Patterns are lists of (channel, signal, start offset in s) events. They are
+queued with schedule() and played one after another on a worker thread, so
+the Qt event loop never sleeps while a pattern runs. Each event plays its
+signal at the offset and stops the channel again after signal.length.
+"""
+import queue
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Event.wait() can overshoot by a scheduler tick (~15 ms on Windows), so the
+# last stretch before each deadline is spun instead.
+SPIN_WINDOW = 0.003
+
+
+class PatternScheduler(QThread):
+    progress = pyqtSignal(int, int)     # actions done, actions total
+    pattern_done = pyqtSignal()
+    pattern_cancelled = pyqtSignal()
+
+    def __init__(self, session, parent=None):
+        super().__init__(parent)
+        self.session = session
+        self.running = True
+        self._patterns = queue.Queue()  # (generation, actions)
+        self._cancel = threading.Event()
+        # cancel() bumps the generation; patterns queued before it are dropped
+        # even if the worker had already taken them off the queue
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def schedule(self, events):
+        """Queue a pattern of (channel, signal, start) events and start the worker if needed."""
+        actions = []
+        for channel, signal, start in events:
+            actions.append((start, 0, channel, signal))
+            actions.append((start + signal.length, 1, channel, None))
+        # stops sort before plays at the same instant so back-to-back pulses on one channel work
+        actions.sort(key=lambda a: (a[0], -a[1]))
+        with self._lock:
+            self._patterns.put((self._generation, actions))
+        if not self.isRunning():
+            self.start()
+
+    def cancel(self):
+        """Drop all queued patterns and stop the one that is playing."""
+        with self._lock:
+            self._generation += 1
+            while True:
+                try:
+                    self._patterns.get_nowait()
+                except queue.Empty:
+                    break
+            self._cancel.set()
+
+    def run(self):
+        while self.running:
+            try:
+                generation, actions = self._patterns.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            with self._lock:
+                if generation != self._generation:
+                    # cancelled between get() and here
+                    self.pattern_cancelled.emit()
+                    continue
+                self._cancel.clear()
+            if self._play(actions):
+                self.pattern_done.emit()
+            else:
+                self.pattern_cancelled.emit()
+
+    def _play(self, actions):
+        """Run one pattern; returns False if it was cancelled part way."""
+        t0 = time.perf_counter()
+        playing = set()
+        for i, (offset, kind, channel, signal) in enumerate(actions):
+            if not self._wait_until(t0 + offset):
+                for ch in playing:
+                    self.session.stop(ch)
+                return False
+            if kind == 0:
+                self.session.play(channel, signal)
+                playing.add(channel)
+            else:
+                self.session.stop(channel)
+                playing.discard(channel)
+            self.progress.emit(i + 1, len(actions))
+        return True
+
+    def _wait_until(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > SPIN_WINDOW and self._cancel.wait(remaining - SPIN_WINDOW):
+            return False
+        while time.perf_counter() < deadline:
+            if self._cancel.is_set():
+                return False
+        return self.running and not self._cancel.is_set()
+
+    def stop(self):
+        self.running = False
+        self._cancel.set()
+        self.wait()
@@ -1,5 +1,6 @@
 from syntacts import *
 from time import sleep
+from pattern_compiler import sequential_pulses, compile_pattern
 
 """
 Custom pattern script for inter-team presentatoins on 11/13/2024.
@@ -20,28 +21,22 @@ def create_tactor_signal(frequency, duration):
     decay_rate = 6.9
     return Sine(frequency) * ExponentialDecay(amplitude, decay_rate) * Envelope(duration)
 
-def play_individual(duration):
-    for channel in channels:
-        signal = create_tactor_signal(170, duration)
-        s.play(channel, signal)
-        sleep(signal.length)
-        s.stop(channel)
+# Part 1: a pulse with exponential decay on each tactor individually
+events, end = sequential_pulses(channels, [1.0, 0.5, 0.2, 0.1],
+                                lambda duration, ch: create_tactor_signal(170, duration))
 
-# Part 1: Play a pulse with exponential decay on each tactor individually
-play_individual(1.0)
-play_individual(0.5)
-play_individual(0.2)
-play_individual(0.1)
-
-print("Playing custom pattern")
-max_duration = 1.0
+# Part 2: custom pattern on all tactors
 signal1 = Sine(170) * Envelope(0.75)
 
 sequence = Sequence()
 sequence << signal1 << signal1
+events += [(channel, sequence, end) for channel in channels]
 
-for channel in channels:
-    s.play(channel, sequence)
+# The whole pattern is prebuilt per channel, so the audio thread does the timing
+pattern = compile_pattern(events)
+print("Playing custom pattern")
+for channel, channel_sequence in pattern.items():
+    s.play(channel, channel_sequence)
 
-sleep(sequence.length + 0.1)
+sleep(max(seq.length for seq in pattern.values()) + 0.1)
 s.close()
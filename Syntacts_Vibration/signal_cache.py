@@ -0,0 +1,67 @@
+"""
+LRU cache of tactor pulse signals, keyed by their pattern parameters.
+
+Building Sine * ExponentialDecay * Envelope allocates several native signals
+(and frees them again in Signal.__del__). Pattern playback asks for the same
+few pulses over and over, so the UIs keep the built signals around and reuse
+their handles instead of rebuilding them on every press.
+"""
+from collections import OrderedDict
+import numpy as np
+from syntacts import *
+
+from wrist import waveforms
+
+class TactorSignalCache:
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._signals = OrderedDict()
+
+    def get(self, frequency, duration, amplitude=1.0, decay=6.9):
+        """Return the pulse for these parameters, building it only on a miss."""
+        key = (frequency, duration, amplitude, decay)
+        signal = self._signals.get(key)
+        if signal is not None:
+            self._signals.move_to_end(key)
+            self.hits += 1
+            return signal
+
+        self.misses += 1
+        signal = Sine(frequency) * ExponentialDecay(amplitude, decay) * Envelope(duration)
+        self._store(key, signal)
+        return signal
+
+    def get_shaped(self, frequency, levels, step_ms):
+        """
+        Sine(frequency) shaped by a waveforms.py level array (the same
+        waveforms the DA7281 W command plays), holding each level step_ms.
+        """
+        levels = np.asarray(levels, dtype=np.uint8)
+        key = ('shaped', frequency, levels.tobytes(), step_ms)
+        signal = self._signals.get(key)
+        if signal is not None:
+            self._signals.move_to_end(key)
+            self.hits += 1
+            return signal
+
+        self.misses += 1
+        signal = waveforms.to_syntacts(levels, step_ms, Sine(frequency))
+        self._store(key, signal)
+        return signal
+
+    def _store(self, key, signal):
+        self._signals[key] = signal
+        if len(self._signals) > self.maxsize:
+            # least recently used; its native handle is freed when the last reference drops
+            self._signals.popitem(last=False)
+
+    def clear(self):
+        self._signals.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._signals)}
+
+    def __len__(self):
+        return len(self._signals)
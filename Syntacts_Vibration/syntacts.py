@@ -25,6 +25,8 @@
 import platform
 from ctypes import *
 from enum import Enum
+import numpy as np
+import syntacts_numpy as _numpy_engine
 
 # DLL Import
 # get the right filename
@@ -32,8 +34,34 @@ if platform.uname()[0] == "Windows":
     _lib_name = "./syntacts_c.dll"
 elif platform.uname()[0] == "Darwin":
     _lib_name = "./libsyntacts_c.dylib"
-
-_tact = cdll.LoadLibrary(_lib_name)
+else:
+    _lib_name = "./libsyntacts_c.so"
+
+try:
+    _tact = cdll.LoadLibrary(_lib_name)
+except OSError:
+    # No native library (e.g. Linux lab boxes): signals fall back to the NumPy
+    # engine in syntacts_numpy (see bottom of file), devices are unavailable.
+    _tact = None
+
+def _mirror(build, *operands):
+    """
+    The syntacts_numpy twin of a native signal, build(*operands) with every
+    Signal operand replaced by its twin; None if an operand has none.
+    """
+    args = []
+    for operand in operands:
+        if isinstance(operand, Signal):
+            if operand._mirror is None:
+                return None
+            operand = operand._mirror
+        args.append(operand)
+    return build(*args)
+
+def _require_native():
+    """Devices, the spatializer, expressions and the library need the native library."""
+    if _tact is None:
+        raise RuntimeError(f"Syntacts native library '{_lib_name}' could not be loaded")
 
 ###############################################################################
 ## DEVICE
@@ -57,6 +85,7 @@ class API(Enum):
 
 class Device:
     def __init__(self, session_handle, index):
+        _require_native()
         self.index = index
         if (index != -1):
             size = _tact.Device_nameLength(session_handle, index)
@@ -85,6 +114,7 @@ class Device:
 
 class Session:
     def __init__(self):
+        _require_native()
         self._handle = _tact.Session_create()
         n = _tact.Session_getAvailableDevicesCount(self._handle)
         indices = (c_int * n)()
@@ -94,7 +124,8 @@ class Session:
             self.available_devices.append(Device(self._handle, d))
     
     def __del__(self):
-        _tact.Session_delete(self._handle)
+        if hasattr(self, '_handle'):
+            _tact.Session_delete(self._handle)
 
     def open(self, index=None, channelCount=0, sampleRate=0, name=None, api=None):
         if index:
@@ -183,6 +214,7 @@ class Session:
 
     @staticmethod
     def count():
+        _require_native()
         return _tact.Session_count()
 
 ###############################################################################
@@ -191,13 +223,15 @@ class Session:
 
 class Spatializer:
     def __init__(self, session=None):
+        _require_native()
         if (session):
             self._handle = _tact.Spatializer_create(session._handle)
         else:
             self._handle = _tact.Spatializer_create(None)
 
     def __del__(self):
-        _tact.Spatializer_delete(self._handle)
+        if hasattr(self, '_handle'):
+            _tact.Spatializer_delete(self._handle)
 
     def bind(self, session):
         _tact.Spatializer_bind(self._handle, session._handle)
@@ -316,15 +350,60 @@ class Spatializer:
 ###############################################################################
 
 class Signal:    
-    def __init__(self, handle):
+    # Same signal built with syntacts_numpy, so sample_many() can evaluate it in
+    # one vectorized pass when the library has no Signal_sampleMany. None for
+    # signals it cannot describe (Expression, Noise, imported signals).
+    _mirror = None
+
+    def __init__(self, handle, refs=(), mirror=None):
         self._handle = handle
+        self._refs = list(refs)
+        self._mirror = mirror
+
+    def _keep(self, *operands):
+        """
+        Hold Python references to the operands a native signal was built from.
+        The native copies share a Samples' buffer by pointer, so the buffer
+        must live as long as any signal built on it.
+        """
+        if not hasattr(self, '_refs'):
+            self._refs = []
+        self._refs.extend(o for o in operands if isinstance(o, Signal))
+        return self
 
     def __del__(self):
-        _tact.Signal_delete(self._handle)
+        if hasattr(self, '_handle'):
+            _tact.Signal_delete(self._handle)
 
     def sample(self, t):
         return _tact.Signal_sample(self._handle, t)
 
+    def sample_many(self, times, out=None):
+        """
+        Sample at every time in times (ndarray or buffer). Results are written
+        to out (contiguous float64, same shape) if given.
+
+        Uses the native Signal_sampleMany when the library exports it. The
+        released Syntacts C library does not, so then the signal's NumPy twin
+        is evaluated instead (same result, one vectorized pass; Noise differs
+        sample by sample), and only signals without a twin fall back to one
+        ctypes Signal_sample call per time.
+        """
+        times = np.ascontiguousarray(times, dtype=np.float64)
+        if out is None:
+            out = np.empty(times.shape)
+        elif out.shape != times.shape or out.dtype != np.float64 or not out.flags.c_contiguous:
+            raise ValueError("out must be a contiguous float64 array shaped like times")
+        if hasattr(_tact, 'Signal_sampleMany'):
+            _tact.Signal_sampleMany(self._handle, times.ctypes.data_as(POINTER(c_double)),
+                                    times.size, out.ctypes.data_as(POINTER(c_double)))
+        elif self._mirror is not None:
+            out[...] = self._mirror.sample_many(times)
+        else:
+            sample = _tact.Signal_sample
+            out.reshape(-1)[:] = [sample(self._handle, t) for t in times.reshape(-1).tolist()]
+        return out
+
     @property
     def length(self):
         return _tact.Signal_length(self._handle)
@@ -333,13 +412,15 @@ class Signal:
         if isinstance(other, Signal):
             return Product(self, other)
         elif isinstance(other, (int, float)):
-            return Signal(_tact.Mul_SigFlt(self._handle, other))
+            return Signal(_tact.Mul_SigFlt(self._handle, other), [self],
+                          _mirror(lambda a: a * other, self))
         else:
             raise TypeError("other must be Signal, int, or float")
 
     def __rmul__(self, other):
         if isinstance(other, (int, float)):
-            return Signal(_tact.Mul_FltSig(other, self._handle))
+            return Signal(_tact.Mul_FltSig(other, self._handle), [self],
+                          _mirror(lambda a: other * a, self))
         else:
             raise TypeError("other must be int or float")
 
@@ -347,39 +428,46 @@ class Signal:
         if isinstance(other, Signal):
             return Sum(self, other)
         elif isinstance(other, (int, float)):
-            return Signal(_tact.Add_SigFlt(self._handle, other))
+            return Signal(_tact.Add_SigFlt(self._handle, other), [self],
+                          _mirror(lambda a: a + other, self))
         else:
             raise TypeError("other must be Signal, int, or float")  
 
     def __radd__(self, other):
         if isinstance(other, (int, float)):
-            return Signal(_tact.Add_FltSig(other, self._handle))
+            return Signal(_tact.Add_FltSig(other, self._handle), [self],
+                          _mirror(lambda a: other + a, self))
         else:
             raise TypeError("other must be int or float")
 
     def __sub__(self, other):
         if isinstance(other, (int, float)):
-            return Signal(_tact.Sub_SigFlt(self._handle, other))
+            return Signal(_tact.Sub_SigFlt(self._handle, other), [self],
+                          _mirror(lambda a: a - other, self))
         else:
             raise TypeError("other must be Signal, int, or float")  
 
     def __rsub__(self, other):
         if isinstance(other, (int, float)):
-            return Signal(_tact.Sub_FltSig(other, self._handle))
+            return Signal(_tact.Sub_FltSig(other, self._handle), [self],
+                          _mirror(lambda a: other - a, self))
         else:
             raise TypeError("other must be int or float")         
 
     def __lshift__(self, other):
         if isinstance(other, Signal):
-            return Sequence(_tact.Sequence_SigSig(self._handle, other._handle))
+            return Sequence(_tact.Sequence_SigSig(self._handle, other._handle),
+                            _mirror(lambda a, b: a << b, self, other))._keep(self, other)
         elif isinstance(other, (int, float)):
-            return Sequence(_tact.Sequence_SigFlt(self._handle, other))
+            return Sequence(_tact.Sequence_SigFlt(self._handle, other),
+                            _mirror(lambda a: a << other, self))._keep(self)
         else:
             raise TypeError("other must be Signal, int, or float")
 
     def __rlshift__(self, other):
         if isinstance(other, (int, float)):
-            return Sequence(_tact.Sequence_FltSig(other, self._handle))
+            return Sequence(_tact.Sequence_FltSig(other, self._handle),
+                            _mirror(lambda a: other << a, self))._keep(self)
         else:
             raise TypeError("other must be int or float")
 
@@ -394,21 +482,28 @@ class Signal:
 class Product(Signal):
     def __init__(self, lhs, rhs):
         self._handle = _tact.Product_create(lhs._handle, rhs._handle)
+        self._mirror = _mirror(_numpy_engine.Product, lhs, rhs)
+        self._keep(lhs, rhs)
 
 class Sum(Signal):
     def __init__(self, lhs, rhs):
         self._handle = _tact.Sum_create(lhs._handle, rhs._handle)
+        self._mirror = _mirror(_numpy_engine.Sum, lhs, rhs)
+        self._keep(lhs, rhs)
 
 ###############################################################################
 # SEQUENCE
 ###############################################################################
 
 class Sequence(Signal):
-    def __init__(self, handle = None):
+    def __init__(self, handle = None, mirror = None):
+        self._refs = []
         if handle:
             self._handle = handle
+            self._mirror = mirror
         else:
             self._handle =  _tact.Sequence_create()
+            self._mirror = _numpy_engine.Sequence()
     
     @property
     def head(self):
@@ -417,6 +512,8 @@ class Sequence(Signal):
     @head.setter
     def head(self, newHead):
         _tact.Sequence_setHead(self._handle, newHead)
+        if self._mirror is not None:
+            self._mirror.head = newHead
 
     def push(self, other):
         if isinstance(other, Sequence):
@@ -427,7 +524,8 @@ class Sequence(Signal):
             _tact.Sequence_SeqFlt(self._handle, other)
         else:
             raise TypeError("other must be Sequence, Signal, int, or float")
-        return self
+        self._mirror = _mirror(lambda seq, o: seq.push(o), self, other)
+        return self._keep(other)
 
     def insert(self, other, t):
         if isinstance(other, Sequence):
@@ -436,10 +534,13 @@ class Sequence(Signal):
             _tact.Sequence_insertSig(self._handle, other._handle, t)
         else:
             raise TypeError("other must be Sequence or Signal")
-        return self
+        self._mirror = _mirror(lambda seq, o: seq.insert(o, t), self, other)
+        return self._keep(other)
 
     def clear(self):
         _tact.Sequence_clear(self._handle)
+        self._refs.clear()
+        self._mirror = _numpy_engine.Sequence()
 
     def __lshift__(self, other):
         if isinstance(other, Sequence):
@@ -450,7 +551,8 @@ class Sequence(Signal):
             _tact.Sequence_SeqFlt(self._handle, other)
         else:
             raise TypeError("other must be Sequence, Signal, int, or float")
-        return self
+        self._mirror = _mirror(lambda seq, o: seq.push(o), self, other)
+        return self._keep(other)
 
 ###############################################################################
 # GENERAL
@@ -459,10 +561,12 @@ class Sequence(Signal):
 class Time(Signal):
     def __init__(self):
         self._handle = _tact.Time_create()
+        self._mirror = _numpy_engine.Time()
 
 class Scalar(Signal):
     def __init__(self, value):
         self._handle = _tact.Scalar_create(value)
+        self._mirror = _numpy_engine.Scalar(value)
 
 class Ramp(Signal):
     def __init__(self, initial, arg1, arg2=None):
@@ -470,6 +574,7 @@ class Ramp(Signal):
             self._handle = _tact.Ramp_create2(initial, arg2, arg1)
         else:
             self._handle = _tact.Ramp_create1(initial, arg1)
+        self._mirror = _numpy_engine.Ramp(initial, arg1, arg2)
 
 class Noise(Signal):
     def __init__(self):
@@ -477,9 +582,21 @@ class Noise(Signal):
 
 class Expression(Signal):
     def __init__(self, expr):
+        _require_native()
         self._handle = _tact.Expression_create(c_char_p(expr.encode()))
 
-# TODO: class Samples (not sure how to handle float* yet)
+class Samples(Signal):
+    """
+    Plays back a buffer of float32 samples at sample_rate. A contiguous float32
+    ndarray (or any buffer-protocol object) is passed to Syntacts by pointer
+    without copying; the buffer is held for as long as this Signal lives, and
+    signals built from it (Product, Sequence, ...) keep this Signal alive.
+    """
+    def __init__(self, samples, sample_rate):
+        self._buffer = np.ascontiguousarray(samples, dtype=np.float32)
+        self._handle = _tact.Samples_create(self._buffer.ctypes.data_as(POINTER(c_float)),
+                                            self._buffer.size, sample_rate)
+        self._mirror = _numpy_engine.Samples(self._buffer, sample_rate)
 
 ###############################################################################
 # PROCESS
@@ -488,14 +605,20 @@ class Expression(Signal):
 class Repeater(Signal):
     def __init__(self, signal, repetitions, delay):
         self._handle = _tact.Repeater_create(signal._handle, repetitions, delay)
+        self._mirror = _mirror(_numpy_engine.Repeater, signal, repetitions, delay)
+        self._keep(signal)
 
 class Stretcher(Signal):
     def __init__(self, signal, factor):
         self._handle = _tact.Stretcher_create(signal._handle, factor)
+        self._mirror = _mirror(_numpy_engine.Stretcher, signal, factor)
+        self._keep(signal)
 
 class Reverser(Signal):
     def __init__(self, signal):
         self._handle = _tact.Reverser_create(signal._handle)
+        self._mirror = _mirror(_numpy_engine.Reverser, signal)
+        self._keep(signal)
 
 ###############################################################################
 # ENVELOPE
@@ -504,18 +627,22 @@ class Reverser(Signal):
 class Envelope(Signal):
     def __init__(self, duration, amplitude=1):
         self._handle = _tact.Envelope_create(duration, amplitude)
+        self._mirror = _numpy_engine.Envelope(duration, amplitude)
 
 class ASR(Signal):
     def __init__(self, a, s, r, amplitude=1):
         self._handle = _tact.ASR_create(a,s,r,amplitude)
+        self._mirror = _numpy_engine.ASR(a, s, r, amplitude)
 
 class ADSR(Signal):
     def __init__(self, a, d, s, r, amp1=1, amp2=0.5):
         self._handle = _tact.ADSR_create(a,d,s,r,amp1,amp2)
+        self._mirror = _numpy_engine.ADSR(a, d, s, r, amp1, amp2)
 
 class ExponentialDecay(Signal):
     def __init__(self, amplitude=1, decay=6.907755):
         self._handle = _tact.ExponentialDecay_create(amplitude, decay)
+        self._mirror = _numpy_engine.ExponentialDecay(amplitude, decay)
 
 ###############################################################################
 # OSCILLATOR
@@ -525,67 +652,82 @@ class Sine(Signal):
     def __init__(self, arg1, arg2=None, arg3=None):
         if arg3:
             self._handle = _tact.Sine_create4(arg1,arg2._handle,arg3)
+            self._keep(arg2)
         elif arg2:
             self._handle = _tact.Sine_create3(arg1, arg2)
         elif isinstance(arg1, (int, float)): 
             self._handle = _tact.Sine_create2(arg1)
         elif isinstance(arg1, Signal):
             self._handle = _tact.Sine_create1(arg1._handle)
+            self._keep(arg1)
         else:
             raise TypeError("Invalid arguments passed to Sine")
+        self._mirror = _mirror(_numpy_engine.Sine, arg1, arg2, arg3)
 
 class Square(Signal):
     def __init__(self, arg1, arg2=None, arg3=None):
         if arg3:
             self._handle = _tact.Square_create4(arg1,arg2._handle,arg3)
+            self._keep(arg2)
         elif arg2:
             self._handle = _tact.Square_create3(arg1, arg2)
         elif isinstance(arg1, (int, float)): 
             self._handle = _tact.Square_create2(arg1)
         elif isinstance(arg1, Signal):
             self._handle = _tact.Square_create1(arg1._handle)
+            self._keep(arg1)
         else:
             raise TypeError("Invalid arguments passed to Sine")
+        self._mirror = _mirror(_numpy_engine.Square, arg1, arg2, arg3)
 
 class Saw(Signal):
     def __init__(self, arg1, arg2=None, arg3=None):
         if arg3:
             self._handle = _tact.Saw_create4(arg1,arg2._handle,arg3)
+            self._keep(arg2)
         elif arg2:
             self._handle = _tact.Saw_create3(arg1, arg2)
         elif isinstance(arg1, (int, float)): 
             self._handle = _tact.Saw_create2(arg1)
         elif isinstance(arg1, Signal):
             self._handle = _tact.Saw_create1(arg1._handle)
+            self._keep(arg1)
         else:
             raise TypeError("Invalid arguments passed to Sine")
+        self._mirror = _mirror(_numpy_engine.Saw, arg1, arg2, arg3)
 
 class Triangle(Signal):
     def __init__(self, arg1, arg2=None, arg3=None):
         if arg3:
             self._handle = _tact.Triangle_create4(arg1,arg2._handle,arg3)
+            self._keep(arg2)
         elif arg2:
             self._handle = _tact.Triangle_create3(arg1, arg2)
         elif isinstance(arg1, (int, float)): 
             self._handle = _tact.Triangle_create2(arg1)
         elif isinstance(arg1, Signal):
             self._handle = _tact.Triangle_create1(arg1._handle)
+            self._keep(arg1)
         else:
             raise TypeError("Invalid arguments passed to Sine")
+        self._mirror = _mirror(_numpy_engine.Triangle, arg1, arg2, arg3)
 
 class Pwm(Signal):
     def __init__(self, frequency, dutyCycle=0.5):
         self._handle = _tact.Pwm_create(frequency, dutyCycle)
+        self._mirror = _numpy_engine.Pwm(frequency, dutyCycle)
 
 ###############################################################################
 
 class Library:
     @staticmethod
     def save_signal(signal, name):
+        _require_native()
         return _tact.Library_saveSignal(signal._handle, c_char_p(name.encode()))
 
     @staticmethod
     def load_signal(name):
+        _require_native()
         handle = _tact.Library_loadSignal(c_char_p(name.encode()))
         if handle:
             return Signal(handle)
@@ -593,14 +735,17 @@ class Library:
 
     @staticmethod
     def delete_signal(name):
+        _require_native()
         return _tact.Library_deleteSignal(c_char_p(name.encode()))
 
     @staticmethod
     def export_signal(signal, filePath, format=0, sampleRate=48000, maxLength=60):
+        _require_native()
         return _tact.Library_exportSignal(signal._handle, c_char_p(filePath.encode()), format, sampleRate, maxLength)
 
     @staticmethod
     def import_signal(filePath, format=0, sampleRate=48000):
+        _require_native()
         handle = _tact.Library_importSignal(c_char_p(filePath.encode()), format, sampleRate)
         if handle:
             return Signal(handle)
@@ -611,6 +756,7 @@ class Library:
 class Debug:
     @staticmethod
     def sig_map_size():
+        _require_native()
         return _tact.Debug_sigMapSize()
 
 ###############################################################################
@@ -623,194 +769,206 @@ def lib_func(func, restype, argtypes):
     func.restype = restype
     func.argtypes = argtypes 
 
-# Session
-
-lib_func(_tact.Session_create, Handle, None)
-lib_func(_tact.Session_delete, None, [Handle])
-lib_func(_tact.Session_open1, c_int, [Handle])
-lib_func(_tact.Session_open2, c_int, [Handle, c_int])
-lib_func(_tact.Session_open3, c_int, [Handle, c_int, c_int, c_double])
-lib_func(_tact.Session_open4, c_int, [Handle, c_int])
-lib_func(_tact.Session_open5, c_int, [Handle, c_char_p, c_int])
-lib_func(_tact.Session_close, c_int, [Handle])
-lib_func(_tact.Session_isOpen, c_bool, [Handle])
-
-lib_func(_tact.Session_play, c_int, [Handle, c_int, Handle])
-lib_func(_tact.Session_playAll, c_int, [Handle, Handle])
-lib_func(_tact.Session_stop, c_int, [Handle, c_int])
-lib_func(_tact.Session_stopAll, c_int, [Handle])
-lib_func(_tact.Session_pause, c_int, [Handle, c_int])
-lib_func(_tact.Session_pauseAll, c_int, [Handle])
-lib_func(_tact.Session_resume, c_int, [Handle, c_int])
-lib_func(_tact.Session_resumeAll, c_int, [Handle])
-lib_func(_tact.Session_isPlaying, c_bool, [Handle, c_int])
-lib_func(_tact.Session_isPaused, c_bool, [Handle, c_int])
-
-lib_func(_tact.Session_setVolume, c_int, [Handle, c_int, c_double])
-lib_func(_tact.Session_getVolume, c_double, [Handle, c_int])
-lib_func(_tact.Session_setPitch, c_int, [Handle, c_int, c_double])
-lib_func(_tact.Session_getPitch, c_double, [Handle, c_int])
-lib_func(_tact.Session_getLevel, c_double, [Handle, c_int])
-lib_func(_tact.Session_getChannelCount, c_int, [Handle])
-lib_func(_tact.Session_getSampleRate, c_double, [Handle])
-lib_func(_tact.Session_getCpuLoad, c_double, [Handle])
-
-lib_func(_tact.Session_getCurrentDevice, c_int, [Handle])
-lib_func(_tact.Session_getDefaultDevice, c_int, [Handle])
-lib_func(_tact.Session_getAvailableDevicesCount, c_int, [Handle])
-lib_func(_tact.Session_getAvailableDevices, None, [Handle, POINTER(c_int)])
-
-lib_func(_tact.Session_count, c_int, None)
-
-# Devices
-
-lib_func(_tact.Device_nameLength, c_int, [Handle, c_int])
-lib_func(_tact.Device_name, None, [Handle, c_int, c_char_p])
-lib_func(_tact.Device_isDefault, c_bool, [Handle, c_int])
-lib_func(_tact.Device_api, c_int, [Handle, c_int])
-lib_func(_tact.Device_apiNameLength, c_int, [Handle, c_int])
-lib_func(_tact.Device_apiName, None, [Handle, c_int, c_char_p])
-lib_func(_tact.Device_isApiDefault, c_bool, [Handle, c_int])
-lib_func(_tact.Device_maxChannels, c_int, [Handle, c_int])
-lib_func(_tact.Device_sampleRatesCount, c_int, [Handle, c_int])
-lib_func(_tact.Device_sampleRates, None, [Handle, c_int, POINTER(c_int)])
-lib_func(_tact.Device_defaultSampleRate, c_int, [Handle, c_int])
-
-# Spatializer
-
-lib_func(_tact.Spatializer_create, Handle, [Handle])
-lib_func(_tact.Spatializer_delete, None, [Handle])
-lib_func(_tact.Spatializer_valid, c_bool, [Handle])
-lib_func(_tact.Spatializer_bind, None, [Handle, Handle])
-lib_func(_tact.Spatializer_unbind, None, [Handle])
-lib_func(_tact.Spatializer_setPosition, None, [Handle, c_int, c_double, c_double])
-lib_func(_tact.Spatializer_getPosition, None, [Handle, c_int, POINTER(c_double), POINTER(c_double)])
-lib_func(_tact.Spatializer_setTarget, None, [Handle, c_double, c_double])
-lib_func(_tact.Spatializer_getTarget, None, [Handle, POINTER(c_double), POINTER(c_double)])
-lib_func(_tact.Spatializer_setRadius, None, [Handle, c_double])
-lib_func(_tact.Spatializer_getRadius, c_double, [Handle])
-lib_func(_tact.Spatializer_setRollOff, None, [Handle, c_int])
-lib_func(_tact.Spatializer_setWrap, None, [Handle, c_double, c_double])
-lib_func(_tact.Spatializer_getWrap, None, [Handle, POINTER(c_double), POINTER(c_double)])
-lib_func(_tact.Spatializer_createGrid, c_bool, [Handle, c_int, c_int])
-lib_func(_tact.Spatializer_clear, None, [Handle])
-lib_func(_tact.Spatializer_remove, None, [Handle, c_int])
-lib_func(_tact.Spatializer_getChannelCount, c_int , [Handle])
-lib_func(_tact.Spatializer_hasChannel, c_bool, [Handle, c_int])
-lib_func(_tact.Spatializer_play, None, [Handle, Handle])
-lib_func(_tact.Spatializer_stop, None, [Handle])
-lib_func(_tact.Spatializer_setVolume, None, [Handle, c_double])
-lib_func(_tact.Spatializer_getVolume, c_double, [Handle])
-lib_func(_tact.Spatializer_setPitch, None, [Handle, c_double])
-lib_func(_tact.Spatializer_getPitch, c_double, [Handle])
-lib_func(_tact.Spatializer_autoUpdate, None, [Handle, c_bool])
-lib_func(_tact.Spatializer_update, None, [Handle])
-
-# Signal
-
-lib_func(_tact.Signal_delete, None, [Handle])
-lib_func(_tact.Signal_valid, c_bool, [Handle])
-lib_func(_tact.Signal_sample, c_double, [Handle, c_double])
-lib_func(_tact.Signal_length, c_double, [Handle])
-lib_func(_tact.Signal_setGain, None, [Handle, c_double])
-lib_func(_tact.Signal_getGain, c_double, [Handle])
-lib_func(_tact.Signal_setBias, None, [Handle, c_double])
-lib_func(_tact.Signal_getBias, c_double, [Handle])
-lib_func(_tact.Signal_count, c_int, None)
-
-# Operators
-
-lib_func(_tact.Product_create, Handle, [Handle, Handle])
-lib_func(_tact.Sum_create, Handle, [Handle, Handle])
-
-lib_func(_tact.Mul_SigFlt, Handle, [Handle, c_double])
-lib_func(_tact.Mul_FltSig, Handle, [c_double, Handle])
-
-lib_func(_tact.Add_SigFlt, Handle, [Handle, c_double])
-lib_func(_tact.Add_FltSig, Handle, [c_double, Handle])
-
-lib_func(_tact.Sub_SigFlt, Handle, [Handle, c_double])
-lib_func(_tact.Sub_FltSig, Handle, [c_double, Handle])
-
-lib_func(_tact.Neg_Sig, Handle, [Handle])
-
-# Sequence
-
-lib_func(_tact.Sequence_create, Handle, None)
-lib_func(_tact.Sequence_getHead, c_double, [Handle])
-lib_func(_tact.Sequence_setHead, None, [Handle, c_double])
-lib_func(_tact.Sequence_pushFlt, None, [Handle, c_double])
-lib_func(_tact.Sequence_pushSig, None, [Handle, Handle])
-lib_func(_tact.Sequence_pushSeq, None, [Handle, Handle])
-lib_func(_tact.Sequence_insertSig, None, [Handle, Handle, c_double])
-lib_func(_tact.Sequence_insertSeq, None, [Handle, Handle, c_double])
-lib_func(_tact.Sequence_clear, None, [Handle])
-
-lib_func(_tact.Sequence_SigSig, Handle, [Handle, Handle])
-lib_func(_tact.Sequence_SigFlt, Handle, [Handle, c_double])
-lib_func(_tact.Sequence_FltSig, Handle, [c_double, Handle])
-lib_func(_tact.Sequence_SeqFlt, None, [Handle, c_double])
-lib_func(_tact.Sequence_SeqSig, None, [Handle, Handle])
-lib_func(_tact.Sequence_SeqSeq, None, [Handle, Handle])
-
-# General
-
-lib_func(_tact.Time_create, Handle, None)
-lib_func(_tact.Scalar_create, Handle, [c_double])
-lib_func(_tact.Ramp_create1, Handle, [c_double, c_double])
-lib_func(_tact.Ramp_create2, Handle, [c_double, c_double, c_double])
-lib_func(_tact.Noise_create, Handle, None)
-lib_func(_tact.Expression_create, Handle, [c_char_p])
-lib_func(_tact.Samples_create, Handle, [POINTER(c_float), c_int, c_double])
-
-# Process
-
-lib_func(_tact.Repeater_create, Handle, [Handle, c_int, c_double])
-lib_func(_tact.Stretcher_create, Handle, [Handle, c_double])
-lib_func(_tact.Reverser_create, Handle, [Handle])
-
-# Envelope
-
-lib_func(_tact.Envelope_create, Handle, [c_double, c_double])
-lib_func(_tact.ASR_create, Handle, [c_double, c_double, c_double, c_double])
-lib_func(_tact.ADSR_create, Handle, [c_double, c_double, c_double, c_double, c_double, c_double])
-lib_func(_tact.ExponentialDecay_create, Handle, [c_double, c_double])
-
-# Oscillator
-
-lib_func(_tact.Sine_create1, Handle, [Handle])
-lib_func(_tact.Sine_create2, Handle, [c_double])
-lib_func(_tact.Sine_create3, Handle, [c_double, c_double])
-lib_func(_tact.Sine_create4, Handle, [c_double, Handle, c_double])
-
-lib_func(_tact.Square_create1, Handle, [Handle])
-lib_func(_tact.Square_create2, Handle, [c_double])
-lib_func(_tact.Square_create3, Handle, [c_double, c_double])
-lib_func(_tact.Square_create4, Handle, [c_double, Handle, c_double])
-
-lib_func(_tact.Saw_create1, Handle, [Handle])
-lib_func(_tact.Saw_create2, Handle, [c_double])
-lib_func(_tact.Saw_create3, Handle, [c_double, c_double])
-lib_func(_tact.Saw_create4, Handle, [c_double, Handle, c_double])
-
-lib_func(_tact.Triangle_create1, Handle, [Handle])
-lib_func(_tact.Triangle_create2, Handle, [c_double])
-lib_func(_tact.Triangle_create3, Handle, [c_double, c_double])
-lib_func(_tact.Triangle_create4, Handle, [c_double, Handle, c_double])
+if _tact is not None:
+    # Session
+
+    lib_func(_tact.Session_create, Handle, None)
+    lib_func(_tact.Session_delete, None, [Handle])
+    lib_func(_tact.Session_open1, c_int, [Handle])
+    lib_func(_tact.Session_open2, c_int, [Handle, c_int])
+    lib_func(_tact.Session_open3, c_int, [Handle, c_int, c_int, c_double])
+    lib_func(_tact.Session_open4, c_int, [Handle, c_int])
+    lib_func(_tact.Session_open5, c_int, [Handle, c_char_p, c_int])
+    lib_func(_tact.Session_close, c_int, [Handle])
+    lib_func(_tact.Session_isOpen, c_bool, [Handle])
+
+    lib_func(_tact.Session_play, c_int, [Handle, c_int, Handle])
+    lib_func(_tact.Session_playAll, c_int, [Handle, Handle])
+    lib_func(_tact.Session_stop, c_int, [Handle, c_int])
+    lib_func(_tact.Session_stopAll, c_int, [Handle])
+    lib_func(_tact.Session_pause, c_int, [Handle, c_int])
+    lib_func(_tact.Session_pauseAll, c_int, [Handle])
+    lib_func(_tact.Session_resume, c_int, [Handle, c_int])
+    lib_func(_tact.Session_resumeAll, c_int, [Handle])
+    lib_func(_tact.Session_isPlaying, c_bool, [Handle, c_int])
+    lib_func(_tact.Session_isPaused, c_bool, [Handle, c_int])
+
+    lib_func(_tact.Session_setVolume, c_int, [Handle, c_int, c_double])
+    lib_func(_tact.Session_getVolume, c_double, [Handle, c_int])
+    lib_func(_tact.Session_setPitch, c_int, [Handle, c_int, c_double])
+    lib_func(_tact.Session_getPitch, c_double, [Handle, c_int])
+    lib_func(_tact.Session_getLevel, c_double, [Handle, c_int])
+    lib_func(_tact.Session_getChannelCount, c_int, [Handle])
+    lib_func(_tact.Session_getSampleRate, c_double, [Handle])
+    lib_func(_tact.Session_getCpuLoad, c_double, [Handle])
+
+    lib_func(_tact.Session_getCurrentDevice, c_int, [Handle])
+    lib_func(_tact.Session_getDefaultDevice, c_int, [Handle])
+    lib_func(_tact.Session_getAvailableDevicesCount, c_int, [Handle])
+    lib_func(_tact.Session_getAvailableDevices, None, [Handle, POINTER(c_int)])
+
+    lib_func(_tact.Session_count, c_int, None)
+
+    # Devices
+
+    lib_func(_tact.Device_nameLength, c_int, [Handle, c_int])
+    lib_func(_tact.Device_name, None, [Handle, c_int, c_char_p])
+    lib_func(_tact.Device_isDefault, c_bool, [Handle, c_int])
+    lib_func(_tact.Device_api, c_int, [Handle, c_int])
+    lib_func(_tact.Device_apiNameLength, c_int, [Handle, c_int])
+    lib_func(_tact.Device_apiName, None, [Handle, c_int, c_char_p])
+    lib_func(_tact.Device_isApiDefault, c_bool, [Handle, c_int])
+    lib_func(_tact.Device_maxChannels, c_int, [Handle, c_int])
+    lib_func(_tact.Device_sampleRatesCount, c_int, [Handle, c_int])
+    lib_func(_tact.Device_sampleRates, None, [Handle, c_int, POINTER(c_int)])
+    lib_func(_tact.Device_defaultSampleRate, c_int, [Handle, c_int])
+
+    # Spatializer
+
+    lib_func(_tact.Spatializer_create, Handle, [Handle])
+    lib_func(_tact.Spatializer_delete, None, [Handle])
+    lib_func(_tact.Spatializer_valid, c_bool, [Handle])
+    lib_func(_tact.Spatializer_bind, None, [Handle, Handle])
+    lib_func(_tact.Spatializer_unbind, None, [Handle])
+    lib_func(_tact.Spatializer_setPosition, None, [Handle, c_int, c_double, c_double])
+    lib_func(_tact.Spatializer_getPosition, None, [Handle, c_int, POINTER(c_double), POINTER(c_double)])
+    lib_func(_tact.Spatializer_setTarget, None, [Handle, c_double, c_double])
+    lib_func(_tact.Spatializer_getTarget, None, [Handle, POINTER(c_double), POINTER(c_double)])
+    lib_func(_tact.Spatializer_setRadius, None, [Handle, c_double])
+    lib_func(_tact.Spatializer_getRadius, c_double, [Handle])
+    lib_func(_tact.Spatializer_setRollOff, None, [Handle, c_int])
+    lib_func(_tact.Spatializer_setWrap, None, [Handle, c_double, c_double])
+    lib_func(_tact.Spatializer_getWrap, None, [Handle, POINTER(c_double), POINTER(c_double)])
+    lib_func(_tact.Spatializer_createGrid, c_bool, [Handle, c_int, c_int])
+    lib_func(_tact.Spatializer_clear, None, [Handle])
+    lib_func(_tact.Spatializer_remove, None, [Handle, c_int])
+    lib_func(_tact.Spatializer_getChannelCount, c_int , [Handle])
+    lib_func(_tact.Spatializer_hasChannel, c_bool, [Handle, c_int])
+    lib_func(_tact.Spatializer_play, None, [Handle, Handle])
+    lib_func(_tact.Spatializer_stop, None, [Handle])
+    lib_func(_tact.Spatializer_setVolume, None, [Handle, c_double])
+    lib_func(_tact.Spatializer_getVolume, c_double, [Handle])
+    lib_func(_tact.Spatializer_setPitch, None, [Handle, c_double])
+    lib_func(_tact.Spatializer_getPitch, c_double, [Handle])
+    lib_func(_tact.Spatializer_autoUpdate, None, [Handle, c_bool])
+    lib_func(_tact.Spatializer_update, None, [Handle])
+
+    # Signal
+
+    lib_func(_tact.Signal_delete, None, [Handle])
+    lib_func(_tact.Signal_valid, c_bool, [Handle])
+    lib_func(_tact.Signal_sample, c_double, [Handle, c_double])
+    if hasattr(_tact, 'Signal_sampleMany'):
+        lib_func(_tact.Signal_sampleMany, None, [Handle, POINTER(c_double), c_int, POINTER(c_double)])
+    lib_func(_tact.Signal_length, c_double, [Handle])
+    lib_func(_tact.Signal_setGain, None, [Handle, c_double])
+    lib_func(_tact.Signal_getGain, c_double, [Handle])
+    lib_func(_tact.Signal_setBias, None, [Handle, c_double])
+    lib_func(_tact.Signal_getBias, c_double, [Handle])
+    lib_func(_tact.Signal_count, c_int, None)
+
+    # Operators
+
+    lib_func(_tact.Product_create, Handle, [Handle, Handle])
+    lib_func(_tact.Sum_create, Handle, [Handle, Handle])
+
+    lib_func(_tact.Mul_SigFlt, Handle, [Handle, c_double])
+    lib_func(_tact.Mul_FltSig, Handle, [c_double, Handle])
+
+    lib_func(_tact.Add_SigFlt, Handle, [Handle, c_double])
+    lib_func(_tact.Add_FltSig, Handle, [c_double, Handle])
+
+    lib_func(_tact.Sub_SigFlt, Handle, [Handle, c_double])
+    lib_func(_tact.Sub_FltSig, Handle, [c_double, Handle])
+
+    lib_func(_tact.Neg_Sig, Handle, [Handle])
+
+    # Sequence
+
+    lib_func(_tact.Sequence_create, Handle, None)
+    lib_func(_tact.Sequence_getHead, c_double, [Handle])
+    lib_func(_tact.Sequence_setHead, None, [Handle, c_double])
+    lib_func(_tact.Sequence_pushFlt, None, [Handle, c_double])
+    lib_func(_tact.Sequence_pushSig, None, [Handle, Handle])
+    lib_func(_tact.Sequence_pushSeq, None, [Handle, Handle])
+    lib_func(_tact.Sequence_insertSig, None, [Handle, Handle, c_double])
+    lib_func(_tact.Sequence_insertSeq, None, [Handle, Handle, c_double])
+    lib_func(_tact.Sequence_clear, None, [Handle])
+
+    lib_func(_tact.Sequence_SigSig, Handle, [Handle, Handle])
+    lib_func(_tact.Sequence_SigFlt, Handle, [Handle, c_double])
+    lib_func(_tact.Sequence_FltSig, Handle, [c_double, Handle])
+    lib_func(_tact.Sequence_SeqFlt, None, [Handle, c_double])
+    lib_func(_tact.Sequence_SeqSig, None, [Handle, Handle])
+    lib_func(_tact.Sequence_SeqSeq, None, [Handle, Handle])
+
+    # General
+
+    lib_func(_tact.Time_create, Handle, None)
+    lib_func(_tact.Scalar_create, Handle, [c_double])
+    lib_func(_tact.Ramp_create1, Handle, [c_double, c_double])
+    lib_func(_tact.Ramp_create2, Handle, [c_double, c_double, c_double])
+    lib_func(_tact.Noise_create, Handle, None)
+    lib_func(_tact.Expression_create, Handle, [c_char_p])
+    lib_func(_tact.Samples_create, Handle, [POINTER(c_float), c_int, c_double])
+
+    # Process
+
+    lib_func(_tact.Repeater_create, Handle, [Handle, c_int, c_double])
+    lib_func(_tact.Stretcher_create, Handle, [Handle, c_double])
+    lib_func(_tact.Reverser_create, Handle, [Handle])
+
+    # Envelope
+
+    lib_func(_tact.Envelope_create, Handle, [c_double, c_double])
+    lib_func(_tact.ASR_create, Handle, [c_double, c_double, c_double, c_double])
+    lib_func(_tact.ADSR_create, Handle, [c_double, c_double, c_double, c_double, c_double, c_double])
+    lib_func(_tact.ExponentialDecay_create, Handle, [c_double, c_double])
+
+    # Oscillator
+
+    lib_func(_tact.Sine_create1, Handle, [Handle])
+    lib_func(_tact.Sine_create2, Handle, [c_double])
+    lib_func(_tact.Sine_create3, Handle, [c_double, c_double])
+    lib_func(_tact.Sine_create4, Handle, [c_double, Handle, c_double])
+
+    lib_func(_tact.Square_create1, Handle, [Handle])
+    lib_func(_tact.Square_create2, Handle, [c_double])
+    lib_func(_tact.Square_create3, Handle, [c_double, c_double])
+    lib_func(_tact.Square_create4, Handle, [c_double, Handle, c_double])
+
+    lib_func(_tact.Saw_create1, Handle, [Handle])
+    lib_func(_tact.Saw_create2, Handle, [c_double])
+    lib_func(_tact.Saw_create3, Handle, [c_double, c_double])
+    lib_func(_tact.Saw_create4, Handle, [c_double, Handle, c_double])
+
+    lib_func(_tact.Triangle_create1, Handle, [Handle])
+    lib_func(_tact.Triangle_create2, Handle, [c_double])
+    lib_func(_tact.Triangle_create3, Handle, [c_double, c_double])
+    lib_func(_tact.Triangle_create4, Handle, [c_double, Handle, c_double])
+
+    lib_func(_tact.Pwm_create, Handle, [c_double, c_double])
 
-lib_func(_tact.Pwm_create, Handle, [c_double, c_double])
 
+    # Library
 
-# Library
+    lib_func(_tact.Library_saveSignal, c_bool, [Handle, c_char_p])
+    lib_func(_tact.Library_loadSignal, Handle, [c_char_p])
+    lib_func(_tact.Library_deleteSignal, c_bool, [c_char_p])
+    lib_func(_tact.Library_exportSignal, c_bool, [Handle, c_char_p, c_int, c_int, c_double])
+    lib_func(_tact.Library_importSignal, Handle, [c_char_p, c_int, c_int])
 
-lib_func(_tact.Library_saveSignal, c_bool, [Handle, c_char_p])
-lib_func(_tact.Library_loadSignal, Handle, [c_char_p])
-lib_func(_tact.Library_deleteSignal, c_bool, [c_char_p])
-lib_func(_tact.Library_exportSignal, c_bool, [Handle, c_char_p, c_int, c_int, c_double])
-lib_func(_tact.Library_importSignal, Handle, [c_char_p, c_int, c_int])
+    # Debug
 
-# Debug
+    lib_func(_tact.Debug_sigMapSize, int, None)
 
-lib_func(_tact.Debug_sigMapSize, int, None)
+###############################################################################
+# NUMPY FALLBACK
+###############################################################################
 
-###############################################################################
\ No newline at end of file
+from syntacts_numpy import render
+
+if _tact is None:
+    from syntacts_numpy import *
+
+###############################################################################
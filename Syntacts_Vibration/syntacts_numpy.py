@@ -0,0 +1,390 @@
+"""
+Pure-NumPy implementation of the Syntacts signal classes.
+
+syntacts.py falls back to these classes when the native library cannot be
+loaded (e.g. on the Linux lab machines), so patterns can still be built and
+previewed without an audio device. Every signal is evaluated on a whole array
+of times at once, and render() turns a signal into a sample buffer in one call.
+"""
+
+import copy
+import numpy as np
+
+__all__ = [
+    'Signal', 'Product', 'Sum', 'Sequence',
+    'Time', 'Scalar', 'Ramp', 'Noise', 'Samples',
+    'Repeater', 'Stretcher', 'Reverser',
+    'Envelope', 'ASR', 'ADSR', 'ExponentialDecay',
+    'Sine', 'Square', 'Saw', 'Triangle', 'Pwm',
+    'render',
+]
+
+TWO_PI = 2.0 * np.pi
+
+###############################################################################
+## SIGNAL
+###############################################################################
+
+class Signal:
+    """Base class. Subclasses implement _sample(t) for an ndarray of times."""
+
+    def _sample(self, t):
+        raise NotImplementedError
+
+    def sample(self, t):
+        return float(self._sample(np.array([t], dtype=np.float64))[0])
+
+    def sample_many(self, times, out=None):
+        """Same contract as syntacts.Signal.sample_many."""
+        times = np.ascontiguousarray(times, dtype=np.float64)
+        if out is None:
+            return self._sample(times)
+        if out.shape != times.shape:
+            raise ValueError("out must be shaped like times")
+        out[...] = self._sample(times)
+        return out
+
+    @property
+    def length(self):
+        return np.inf
+
+    def __mul__(self, other):
+        if isinstance(other, Signal):
+            return Product(self, other)
+        elif isinstance(other, (int, float)):
+            return _Affine(self, gain=other)
+        else:
+            raise TypeError("other must be Signal, int, or float")
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return _Affine(self, gain=other)
+        else:
+            raise TypeError("other must be int or float")
+
+    def __add__(self, other):
+        if isinstance(other, Signal):
+            return Sum(self, other)
+        elif isinstance(other, (int, float)):
+            return _Affine(self, bias=other)
+        else:
+            raise TypeError("other must be Signal, int, or float")
+
+    def __radd__(self, other):
+        if isinstance(other, (int, float)):
+            return _Affine(self, bias=other)
+        else:
+            raise TypeError("other must be int or float")
+
+    def __sub__(self, other):
+        if isinstance(other, (int, float)):
+            return _Affine(self, bias=-other)
+        else:
+            raise TypeError("other must be Signal, int, or float")
+
+    def __rsub__(self, other):
+        if isinstance(other, (int, float)):
+            return _Affine(self, gain=-1.0, bias=other)
+        else:
+            raise TypeError("other must be int or float")
+
+    def __lshift__(self, other):
+        if isinstance(other, (Signal, int, float)):
+            return Sequence() << self << other
+        else:
+            raise TypeError("other must be Signal, int, or float")
+
+    def __rlshift__(self, other):
+        if isinstance(other, (int, float)):
+            return Sequence() << other << self
+        else:
+            raise TypeError("other must be int or float")
+
+###############################################################################
+# OPERATORS
+###############################################################################
+
+class _Affine(Signal):
+    """gain * signal + bias, the result of mixing a Signal with a number."""
+
+    def __init__(self, signal, gain=1.0, bias=0.0):
+        self.signal = signal
+        self.gain = gain
+        self.bias = bias
+
+    def _sample(self, t):
+        return self.gain * self.signal._sample(t) + self.bias
+
+    @property
+    def length(self):
+        return self.signal.length
+
+class Product(Signal):
+    def __init__(self, lhs, rhs):
+        self.lhs = lhs
+        self.rhs = rhs
+
+    def _sample(self, t):
+        return self.lhs._sample(t) * self.rhs._sample(t)
+
+    @property
+    def length(self):
+        return min(self.lhs.length, self.rhs.length)
+
+class Sum(Signal):
+    def __init__(self, lhs, rhs):
+        self.lhs = lhs
+        self.rhs = rhs
+
+    def _sample(self, t):
+        return self.lhs._sample(t) + self.rhs._sample(t)
+
+    @property
+    def length(self):
+        return max(self.lhs.length, self.rhs.length)
+
+###############################################################################
+# SEQUENCE
+###############################################################################
+
+class Sequence(Signal):
+    def __init__(self):
+        self.head = 0.0
+        self._keys = []  # (start time, signal)
+
+    def _sample(self, t):
+        out = np.zeros(t.shape)
+        for start, signal in self._keys:
+            mask = (t >= start) & (t < start + signal.length)
+            if mask.any():
+                out[mask] += signal._sample(t[mask] - start)
+        return out
+
+    @property
+    def length(self):
+        return max([self.head] + [start + signal.length for start, signal in self._keys])
+
+    def push(self, other):
+        if isinstance(other, Signal):
+            self.insert(other, self.head)
+            self.head += other.length
+        elif isinstance(other, (int, float)):
+            self.head += other
+        else:
+            raise TypeError("other must be Sequence, Signal, int, or float")
+        return self
+
+    def insert(self, other, t):
+        if isinstance(other, Sequence):
+            # the native Sequence stores a copy, so later edits to other don't leak in
+            other = copy.copy(other)
+            other._keys = list(other._keys)
+        elif not isinstance(other, Signal):
+            raise TypeError("other must be Sequence or Signal")
+        self._keys.append((float(t), other))
+        return self
+
+    def clear(self):
+        self._keys = []
+        self.head = 0.0
+
+    def __lshift__(self, other):
+        return self.push(other)
+
+###############################################################################
+# GENERAL
+###############################################################################
+
+class Time(Signal):
+    def _sample(self, t):
+        return t.copy()
+
+class Scalar(Signal):
+    def __init__(self, value):
+        self.value = value
+
+    def _sample(self, t):
+        return np.full(t.shape, float(self.value))
+
+class Ramp(Signal):
+    # argument order mirrors syntacts.Ramp: Ramp(initial, rate) or Ramp(initial, span, final)
+    def __init__(self, initial, arg1, arg2=None):
+        self.initial = initial
+        if arg2:
+            self.rate = (arg2 - initial) / arg1
+        else:
+            self.rate = arg1
+
+    def _sample(self, t):
+        return self.initial + self.rate * t
+
+class Noise(Signal):
+    def __init__(self, seed=None):
+        self._rng = np.random.default_rng(seed)
+
+    def _sample(self, t):
+        return self._rng.uniform(-1.0, 1.0, t.shape)
+
+class Samples(Signal):
+    def __init__(self, samples, sample_rate):
+        self._buffer = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sample_rate = sample_rate
+
+    def _sample(self, t):
+        return np.interp(t * self.sample_rate, np.arange(self._buffer.size), self._buffer,
+                         left=0.0, right=0.0)
+
+    @property
+    def length(self):
+        return self._buffer.size / self.sample_rate
+
+###############################################################################
+# PROCESS
+###############################################################################
+
+class Repeater(Signal):
+    def __init__(self, signal, repetitions, delay):
+        self.signal = signal
+        self.repetitions = repetitions
+        self.delay = delay
+
+    def _sample(self, t):
+        period = self.signal.length + self.delay
+        k = np.floor(t / period)
+        local = t - k * period
+        mask = (k >= 0) & (k < self.repetitions) & (local < self.signal.length)
+        out = np.zeros(t.shape)
+        out[mask] = self.signal._sample(local[mask])
+        return out
+
+    @property
+    def length(self):
+        return self.repetitions * self.signal.length + (self.repetitions - 1) * self.delay
+
+class Stretcher(Signal):
+    def __init__(self, signal, factor):
+        self.signal = signal
+        self.factor = factor
+
+    def _sample(self, t):
+        return self.signal._sample(t / self.factor)
+
+    @property
+    def length(self):
+        return self.signal.length * self.factor
+
+class Reverser(Signal):
+    def __init__(self, signal):
+        self.signal = signal
+
+    def _sample(self, t):
+        return self.signal._sample(self.signal.length - t)
+
+    @property
+    def length(self):
+        return self.signal.length
+
+###############################################################################
+# ENVELOPE
+###############################################################################
+
+class _KeyedEnvelope(Signal):
+    """Piecewise-linear envelope through (time, amplitude) keys, zero outside them."""
+
+    def __init__(self, times, amplitudes):
+        self._times = np.cumsum(times, dtype=np.float64)
+        self._amplitudes = np.asarray(amplitudes, dtype=np.float64)
+
+    def _sample(self, t):
+        return np.interp(t, self._times, self._amplitudes, left=0.0, right=0.0)
+
+    @property
+    def length(self):
+        return float(self._times[-1])
+
+class Envelope(_KeyedEnvelope):
+    def __init__(self, duration, amplitude=1):
+        super().__init__([0, duration], [amplitude, amplitude])
+
+class ASR(_KeyedEnvelope):
+    def __init__(self, a, s, r, amplitude=1):
+        super().__init__([0, a, s, r], [0, amplitude, amplitude, 0])
+
+class ADSR(_KeyedEnvelope):
+    def __init__(self, a, d, s, r, amp1=1, amp2=0.5):
+        super().__init__([0, a, d, s, r], [0, amp1, amp2, amp2, 0])
+
+class ExponentialDecay(Signal):
+    def __init__(self, amplitude=1, decay=6.907755):
+        self.amplitude = amplitude
+        self.decay = decay
+
+    def _sample(self, t):
+        return self.amplitude * np.exp(-self.decay * t)
+
+    @property
+    def length(self):
+        # time taken to decay to 0.001, i.e. 1 s with the default rate
+        return np.log(self.amplitude / 0.001) / self.decay
+
+###############################################################################
+# OSCILLATOR
+###############################################################################
+
+class _Oscillator(Signal):
+    """Holds the phase x(t); subclasses shape it. Arguments mirror syntacts.Sine."""
+
+    def __init__(self, arg1, arg2=None, arg3=None):
+        if arg3:
+            # frequency modulation: hertz, modulating signal, index
+            self._phase = lambda t: TWO_PI * arg1 * t + arg3 * arg2._sample(t)
+        elif arg2:
+            # chirp: initial frequency, rate
+            self._phase = lambda t: TWO_PI * (arg1 * t + 0.5 * arg2 * t * t)
+        elif isinstance(arg1, (int, float)):
+            self._phase = lambda t: TWO_PI * arg1 * t
+        elif isinstance(arg1, Signal):
+            self._phase = arg1._sample
+        else:
+            raise TypeError("Invalid arguments passed to " + type(self).__name__)
+
+class Sine(_Oscillator):
+    def _sample(self, t):
+        return np.sin(self._phase(t))
+
+class Square(_Oscillator):
+    def _sample(self, t):
+        return np.where(np.sin(self._phase(t)) > 0, 1.0, -1.0)
+
+class Saw(_Oscillator):
+    def _sample(self, t):
+        return np.mod(self._phase(t), TWO_PI) / np.pi - 1.0
+
+class Triangle(_Oscillator):
+    def _sample(self, t):
+        return 2.0 / np.pi * np.arcsin(np.sin(self._phase(t)))
+
+class Pwm(Signal):
+    def __init__(self, frequency, dutyCycle=0.5):
+        self.frequency = frequency
+        self.dutyCycle = dutyCycle
+
+    def _sample(self, t):
+        period = 1.0 / self.frequency
+        return np.where(np.mod(t, period) < self.dutyCycle * period, 1.0, -1.0)
+
+###############################################################################
+
+def render(signal, sample_rate, duration=None):
+    """
+    Render a signal into an array of round(duration * sample_rate) samples.
+
+    duration defaults to the signal's own length. NumPy signals are evaluated
+    in a single vectorized pass, native ones through Signal.sample_many.
+    """
+    if duration is None:
+        duration = signal.length
+    if not np.isfinite(duration):
+        raise ValueError("duration is required for signals of infinite length")
+    n = int(round(duration * sample_rate))
+    return signal.sample_many(np.arange(n) / sample_rate)
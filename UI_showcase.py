@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont, QIcon
 from PyQt5.QtCore import Qt
+from wrist.serial_transport import SerialTransport
 
 SERIAL_PORT = 'COM10'
 BAUD_RATE = 115200
@@ -22,8 +23,10 @@ class MotorVibrationControlUI(QWidget):
         self.model_sent = False
 
         # Attempt serial connection
+        self.transport = None
         try:
             self.serial_conn = serial.Serial(port, baud, timeout=1)
+            self.transport = SerialTransport(self.serial_conn)
         except Exception as e:
             self.serial_conn = None
             QMessageBox.warning(
@@ -202,11 +205,18 @@ class MotorVibrationControlUI(QWidget):
             led.setStyleSheet(LED_OFF_STYLE)
 
     def send_command(self, cmd):
-        if getattr(self, 'serial_conn', None) and self.serial_conn.is_open:
-            self.serial_conn.write(cmd.encode('utf-8'))
+        # Queued for the transport's writer thread; never blocks the UI
+        if self.transport and self.serial_conn.is_open:
+            self.transport.send(cmd)
         else:
             print(f"[UI-only] Would send: {cmd.strip()}")
 
+    def closeEvent(self, event):
+        if self.transport:
+            self.transport.close()
+            self.serial_conn.close()
+        event.accept()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setFont(QFont("Arial", 12))
@@ -0,0 +1,24 @@
+import numpy as np
+
+from baseline import find_baseline, find_bias_point, rolling_mean_var
+
+
+def test_rolling_mean_var_matches_numpy():
+    # a large offset checks the sums stay well conditioned
+    x = 1e4 + np.random.default_rng(0).normal(size=2000)
+    for window in (1, 7, 60, 2000):
+        mean, var = rolling_mean_var(x, window)
+        slices = np.lib.stride_tricks.sliding_window_view(x, window)
+        assert len(mean) == len(x) - window + 1
+        assert np.allclose(mean, slices.mean(axis=1), rtol=0, atol=1e-9)
+        assert np.allclose(var, slices.var(axis=1), rtol=0, atol=1e-7)
+
+
+def test_find_baseline_skips_the_quiet_unbiased_stretch():
+    rng = np.random.default_rng(1)
+    unbiased = 50 + 0.05 * rng.normal(size=300)
+    rest = 0.05 * rng.normal(size=2000)
+    x = np.concatenate((unbiased, rest))
+    start, end = find_baseline(x, 60)
+    assert start >= 300 and end - start == 60
+    assert find_bias_point(x, start) == 300
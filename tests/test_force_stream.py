@@ -0,0 +1,32 @@
+import numpy as np
+
+from force_stream import parse_force_lines
+
+
+def test_marked_lines_parse_the_force_and_keep_the_partial_tail():
+    data = (b"SingleTact ready\r\n"
+            b"Raw reading: 300   Force (PSI - NB): 45   Force (N): 0.88\r\n"
+            b"Error: timeout\r\n"
+            b"Raw reading: 310   Force (PSI - NB): 46   Force (N): -1.5e-1\r\n"
+            b"Raw reading: 3")
+    forces, tail = parse_force_lines(data)
+    assert np.array_equal(forces, [0.88, -0.15])
+    assert tail == b"Raw reading: 3"
+
+
+def test_bare_numbers_skip_non_numeric_lines():
+    forces, tail = parse_force_lines(b"12\n  .5\nhello\n3.\n+4e2\n7")
+    assert np.array_equal(forces, [12.0, 0.5, 3.0, 400.0])
+    assert tail == b"7"
+
+
+def test_line_split_across_chunks():
+    forces, tail = parse_force_lines(b"Force (N): 1.0\nForce (N): 2")
+    assert np.array_equal(forces, [1.0])
+    forces, tail = parse_force_lines(tail + b".5\n")
+    assert np.array_equal(forces, [2.5]) and tail == b""
+
+
+def test_no_complete_line_returns_everything_as_tail():
+    forces, tail = parse_force_lines(b"Force (N): 0.9")
+    assert len(forces) == 0 and tail == b"Force (N): 0.9"
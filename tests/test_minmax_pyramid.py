@@ -0,0 +1,48 @@
+import numpy as np
+
+from minmax_pyramid import MinMaxPyramid
+
+
+def build(data, block=37, **kwargs):
+    pyramid = MinMaxPyramid(**kwargs)
+    for i in range(0, len(data), block):
+        pyramid.extend(data[i:i + block])
+    return pyramid
+
+
+def test_query_returns_raw_samples_when_they_fit():
+    data = np.random.default_rng(0).normal(size=500)
+    x, y = build(data).query(100, 300, 400)
+    assert np.array_equal(x, np.arange(100, 300))
+    assert np.array_equal(y, data[100:300])
+
+
+def test_query_buckets_hold_the_min_and_max_of_their_samples():
+    data = np.random.default_rng(1).normal(size=10000)
+    pyramid = build(data, factor=4)
+    x, y = pyramid.query(0, len(data), 100)
+    assert len(x) <= 2 * 100 * 4
+    bucket = int(x[2] - x[0])
+    for i in range(0, len(x), 2):
+        chunk = data[int(x[i]):int(x[i]) + bucket]
+        assert y[i] == chunk.min() and y[i + 1] == chunk.max()
+
+
+def test_incremental_extend_matches_one_shot():
+    data = np.random.default_rng(2).normal(size=5000)
+    a, b = build(data, block=1), build(data, block=len(data))
+    for pixels in (10, 100, 5000):
+        assert all(np.array_equal(p, q) for p, q in zip(a.query(0, 5000, pixels), b.query(0, 5000, pixels)))
+
+
+def test_max_points_bounds_memory_and_keeps_the_newest_samples():
+    data = np.random.default_rng(3).normal(size=50000)
+    pyramid = build(data, max_points=1000, capacity=64)
+    assert pyramid.n == len(data)
+    assert 1000 <= len(pyramid) <= 2000
+    assert len(pyramid._raw.data) <= 2000
+    x, y = pyramid.query(0, len(data), 50)
+    assert x[0] == pyramid.start
+    assert y.min() == data[pyramid.start:].min() and y.max() == data[pyramid.start:].max()
+    x, y = pyramid.query(len(data) - 100, len(data), 1000)
+    assert np.array_equal(y, data[-100:])
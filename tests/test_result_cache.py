@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from wrist.result_cache import ResultCache
+
+
+def make_inputs(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f'input{i}.txt'
+        path.write_text(f'{i}\n')
+        paths.append(str(path))
+    return paths
+
+
+def digest_in_worker(directory, path):
+    return ResultCache(directory).digest(path)
+
+
+def test_memoize_recomputes_only_when_an_input_changes(tmp_path):
+    path, = make_inputs(tmp_path, 1)
+    cache = ResultCache(tmp_path / 'cache')
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert cache.memoize('n', [path], {}, compute) == 1
+    assert cache.memoize('n', [path], {}, compute) == 1
+    with open(path, 'a') as f:
+        f.write('more\n')
+    assert cache.memoize('n', [path], {}, compute) == 2
+    assert cache.stats() == {'hits': 1, 'misses': 2}
+
+
+def test_default_directory_is_under_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv('RESULT_CACHE_DIR', raising=False)
+    monkeypatch.chdir(tmp_path)
+    assert ResultCache().directory == str(tmp_path / '.result_cache')
+    monkeypatch.setenv('RESULT_CACHE_DIR', str(tmp_path / 'elsewhere'))
+    assert ResultCache().directory == str(tmp_path / 'elsewhere')
+
+
+def test_parallel_workers_keep_every_file_hash(tmp_path):
+    paths = make_inputs(tmp_path, 40)
+    directory = str(tmp_path / 'cache')
+    with ProcessPoolExecutor(4) as pool:
+        digests = list(pool.map(digest_in_worker, [directory] * len(paths), paths))
+    assert len(os.listdir(os.path.join(directory, 'hashes'))) == len(paths)
+    cache = ResultCache(directory)
+    assert [cache.digest(p) for p in paths] == digests
+    # every hash was found on disk, none recomputed
+    assert cache._hashes == {}
@@ -0,0 +1,81 @@
+import queue
+
+from wrist.latency import LatencyRecorder
+from wrist.serial_transport import SerialTransport
+
+
+class ChunkedPort:
+    """
+    Serial stand-in: every command line written is answered with
+    respond(line), read back in pieces of 'chunk' bytes so replies span reads.
+    """
+    def __init__(self, respond, chunk=3):
+        self.timeout = 7.0
+        self.baudrate = 115200
+        self.respond = respond
+        self.chunk = chunk
+        self._pieces = queue.Queue()
+
+    def write(self, data):
+        for line in data.splitlines():
+            reply = self.respond(line)
+            for i in range(0, len(reply), self.chunk):
+                self._pieces.put(reply[i:i + self.chunk])
+
+    @property
+    def in_waiting(self):
+        return 0
+
+    def read(self, size=1):
+        try:
+            return self._pieces.get(timeout=self.timeout)
+        except queue.Empty:
+            return b''
+
+
+def answer_w(line):
+    return b"DONE 50\r\n" if line.startswith(b"W") else b""
+
+
+def test_reply_split_across_reads_resolves_whole_line():
+    transport = SerialTransport(ChunkedPort(answer_w, chunk=3))
+    try:
+        future = transport.send("W 1 48 1 50 7F\n", expect_response=True)
+        assert future.result(2) == "DONE 50"
+    finally:
+        transport.close()
+
+
+def test_unmatched_lines_go_to_on_line():
+    lines = []
+    port = ChunkedPort(lambda line: b"Warning: waveLen exceeds buffer size, truncating.\r\nDONE 5\r\n", chunk=4)
+    transport = SerialTransport(port, on_line=lines.append)
+    try:
+        future = transport.send(b"W\n", expect_response=True, reply=("DONE", "Error"))
+        assert future.result(2) == "DONE 5"
+    finally:
+        transport.close()
+    assert lines == ["Warning: waveLen exceeds buffer size, truncating."]
+
+
+def test_silent_command_does_not_take_the_next_reply():
+    latency = LatencyRecorder()
+    transport = SerialTransport(ChunkedPort(answer_w), latency=latency)
+    try:
+        assert transport.send("C 1 48 200\n") is None
+        future = transport.send("W 1 48 1 50 7F\n", expect_response=True, reply="DONE")
+        assert future.result(2) == "DONE 50"
+    finally:
+        transport.close()
+    w = latency.histograms['W']
+    assert w['round_trip'].count == 1 and w['device'].count == 1
+    assert latency.histograms['C']['round_trip'].count == 0
+    assert not latency.timeouts
+
+
+def test_close_restores_port_timeout():
+    port = ChunkedPort(answer_w)
+    transport = SerialTransport(port)
+    assert port.timeout != 7.0
+    transport.close()
+    assert port.timeout == 7.0
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+from baseline import find_baseline, find_bias_point
+from squeeze_events import detect_events, squeeze_polarity
+from squeeze_store import parse_txt, DEFAULT_SAMPLING_RATE
+
+DATA = os.path.join(os.path.dirname(__file__), '..', 'Squeeze_Force_Test', 'Data')
+RATE = DEFAULT_SAMPLING_RATE
+
+
+def squeezes(peaks, rate=RATE, gap=1.0, width=1.0):
+    """Rest, then one raised-cosine squeeze of each peak force, separated by gaps."""
+    pulse = np.sin(np.linspace(0, np.pi, int(width * rate))) ** 2
+    parts = [np.zeros(int(gap * rate))]
+    for peak in peaks:
+        parts += [peak * pulse, np.zeros(int(gap * rate))]
+    return np.concatenate(parts)
+
+
+def biased_fz(name):
+    """Baseline-adjusted Fz of a bundled recording from its bias point on."""
+    fz = parse_txt(os.path.join(DATA, name))[0][:, 2]
+    start, end = find_baseline(fz, RATE)
+    return fz[find_bias_point(fz, start):] - fz[start:end].mean()
+
+
+@pytest.mark.parametrize('sign', [1, -1])
+def test_polarity_is_inferred(sign):
+    trace = sign * squeezes([5, 6, 7])
+    assert squeeze_polarity(trace) == sign
+    events = detect_events(trace, RATE)
+    assert len(events) == 3
+    assert np.allclose(events['peak'], [5, 6, 7], atol=0.05)
+
+
+def test_noise_alone_is_not_an_event():
+    noise = np.random.default_rng(0).normal(scale=0.2, size=10 * RATE)
+    assert len(detect_events(noise, RATE)) == 0
+
+
+def test_bias_point_skips_the_unbiased_stretch():
+    fz = np.concatenate((np.full(100, 52.0), squeezes([-5])))
+    assert find_bias_point(fz) == 100
+    assert find_bias_point(fz[100:]) == 0
+
+
+def test_feb13_recordings_both_show_squeezes():
+    without = biased_fz('No Singletact feb13.txt')
+    with_singletact = biased_fz('withSingletact feb13.txt')
+    assert squeeze_polarity(without) == 1
+    assert squeeze_polarity(with_singletact) == -1
+    assert np.ptp(without) < 20 and np.ptp(with_singletact) < 20  # the ~50 N pre-bias stretch is gone
+    assert 8 <= len(detect_events(without, RATE)) <= 16
+    assert 3 <= len(detect_events(with_singletact, RATE)) <= 8
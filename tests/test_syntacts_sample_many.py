@@ -0,0 +1,59 @@
+import ctypes
+import importlib.util
+import itertools
+import os
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import syntacts_numpy
+
+SYNTACTS = os.path.join(os.path.dirname(__file__), '..', 'Syntacts_Vibration', 'syntacts.py')
+
+
+class FakeLibrary:
+    """Stands in for the released syntacts_c library: no Signal_sampleMany export."""
+    def __init__(self):
+        self._handles = itertools.count(1)
+        self._functions = {'Signal_sample': mock.MagicMock(return_value=0.0)}
+
+    def __getattr__(self, name):
+        if name == 'Signal_sampleMany':
+            raise AttributeError(name)
+        return self._functions.setdefault(name, mock.MagicMock(side_effect=lambda *a: next(self._handles)))
+
+
+@pytest.fixture
+def native():
+    library = FakeLibrary()
+    with mock.patch.object(ctypes.cdll, 'LoadLibrary', return_value=library):
+        spec = importlib.util.spec_from_file_location('syntacts_native', SYNTACTS)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module, library
+
+
+def build(engine):
+    burst = engine.Sine(170) * engine.Envelope(0.2, 0.75)
+    seq = engine.Sequence()
+    seq << burst << 0.05 << 0.5 * engine.Square(80) * engine.ASR(0.05, 0.1, 0.05)
+    seq.insert(engine.Repeater(engine.Triangle(40) * engine.Envelope(0.05), 3, 0.02), 0.1)
+    return seq
+
+
+def test_sample_many_uses_the_numpy_twin_without_the_native_export(native):
+    syntacts, library = native
+    times = np.arange(4800) / 8000
+    signal = build(syntacts)
+    expected = syntacts_numpy.render(build(syntacts_numpy), 8000, 0.6)
+    assert np.allclose(signal.sample_many(times), expected)
+    assert library.Signal_sample.call_count == 0
+
+
+def test_signals_without_a_twin_fall_back_to_scalar_calls(native):
+    syntacts, library = native
+    signal = syntacts.Sine(100) * syntacts.Noise()
+    assert signal._mirror is None
+    signal.sample_many(np.zeros(10))
+    assert library.Signal_sample.call_count == 10
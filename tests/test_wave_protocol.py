@@ -0,0 +1,61 @@
+import binascii
+
+import pytest
+
+from wrist.wave_protocol import (SYNC, MAX_BIN_WAVE_SIZE, CRC_MISMATCH, FORMAT_INCORRECT, LENGTH_INVALID,
+                                 WaveFrameDecoder, crc16, decode_wave_frame, encode_wave_frame,
+                                 encode_wave_text)
+
+
+def test_crc16_is_ccitt_false():
+    assert crc16(b"123456789") == 0x29B1  # CRC-16/CCITT-FALSE check value
+    assert crc16(b"123456789") == binascii.crc_hqx(b"123456789", 0xFFFF)
+
+
+@pytest.mark.parametrize('length', [0, 1, 50, MAX_BIN_WAVE_SIZE])
+def test_frame_round_trip(length):
+    amps = bytes(i * 7 % 256 for i in range(length))
+    frame = encode_wave_frame(["48", 0x4A], 10, amps)
+    decoded, consumed = decode_wave_frame(frame + b"trailing")
+    assert consumed == len(frame)
+    assert decoded.addresses == [0x48, 0x4A] and decoded.step_ms == 10
+    assert bytes(decoded.amplitudes) == amps
+
+
+def test_decode_waits_for_the_whole_frame():
+    frame = encode_wave_frame(["48"], 1, bytes(20))
+    assert decode_wave_frame(frame[:-1]) == (None, 0)
+
+
+@pytest.mark.parametrize('addresses, step_ms, length', [
+    ([], 1, 1),
+    (["48", "49", "4A", "4B"], 1, 1),
+    (["48"], 0x10000, 1),
+    (["48"], -1, 1),
+    (["48"], 1, MAX_BIN_WAVE_SIZE + 1),
+])
+def test_encode_rejects_what_the_firmware_would(addresses, step_ms, length):
+    with pytest.raises(ValueError):
+        encode_wave_frame(addresses, step_ms, bytes(length))
+
+
+def test_decoder_reports_why_a_frame_was_dropped():
+    good = encode_wave_frame(["48"], 1, bytes(5))
+    corrupt = good[:-1] + bytes([good[-1] ^ 1])
+    too_long = bytes([SYNC]) + (0xFFFF).to_bytes(2, 'little')
+    body = b'W' + bytes([0]) + (1).to_bytes(2, 'little')  # no addresses
+    length = len(body).to_bytes(2, 'little')
+    no_address = bytes([SYNC]) + length + body + crc16(length + body).to_bytes(2, 'little')
+
+    for data, reason in ((corrupt, CRC_MISMATCH), (too_long, LENGTH_INVALID), (no_address, FORMAT_INCORRECT)):
+        decoder = WaveFrameDecoder()
+        assert decoder.feed(data) == []
+        assert decoder.errors >= 1 and decoder.last_error == reason
+
+    decoder = WaveFrameDecoder()
+    frames = [f for b in good + good for f in decoder.feed(bytes([b]))]
+    assert len(frames) == 2 and decoder.errors == 0
+
+
+def test_text_form():
+    assert encode_wave_text(["48", "49"], 20, [0x7F, 0, 255]) == b"W 2 48 49 3 20 7F 00 FF\n"
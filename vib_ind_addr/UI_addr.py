@@ -1,24 +1,43 @@
 import sys
 import serial
 import time
-import math
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QCheckBox, QSlider, QGroupBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from wrist.serial_transport import SerialTransport, LatestValueChannel
+from wrist.latency import LatencyRecorder
+from wrist.wave_protocol import encode_wave_frame
+from wrist import waveforms
+
+# Lines that answer a W: its DONE, or the error that rejected it
+W_REPLIES = ("DONE", "Error")
 
 class VibrationGUI(QWidget):
-    def __init__(self, port='COM8', baud=115200):
+    # Replies arrive on the transport's reader thread; this hands them to the GUI thread
+    responseReceived = pyqtSignal(str)
+
+    def __init__(self, port='COM8', baud=115200, latency_log=None):
         super().__init__()
         self.setWindowTitle("DA7281 Vibration Control")
 
+        # Round-trip timing of every command; printed (and saved to latency_log) on close
+        self.latency = LatencyRecorder()
+        self.latencyLog = latency_log
         try:
             self.ser = serial.Serial(port, baud, timeout=1)
             time.sleep(2)  # Wait for MCU reset
+            # Warnings and other unsolicited lines are only printed; replies go to their request
+            self.transport = SerialTransport(self.ser, timeout=1.0, latency=self.latency,
+                                             on_line=lambda text: print("Arduino:", text))
+            # Slider updates: latest value per address set, at most 30 commands/s
+            self.constBuzzChannel = LatestValueChannel(self.transport, max_rate=30.0)
         except serial.SerialException:
             print(f"Could not open serial port {port}")
             self.ser = None
+        self.responseReceived.connect(self.onResponse)
         
         mainLayout = QVBoxLayout()
         self.setLayout(mainLayout)
@@ -92,38 +111,13 @@ class VibrationGUI(QWidget):
         self.timeLabel = QLabel("Last Waveform Time: (none)")
         mainLayout.addWidget(self.timeLabel)
 
-    # ---------------------------
-    # Waveform Generators
-    # ---------------------------
-    def generateExpDecay(self, length):
-        samples = []
-        tau = length / 3.0
-        for i in range(length):
-            amp = int(255 * math.exp(-i / tau))
-            samples.append(amp)
-        return samples
-    
-    def generateSquareWave(self, length):
-        samples = []
-        half = length // 2
-        for i in range(length):
-            samples.append(0 if i < half else 255)
-        return samples
-    
-    def generateSawWave(self, length):
-        samples = []
-        for i in range(length):
-            val = int((i / (length - 1)) * 255)
-            samples.append(val)
-        return samples
-
     # ---------------------------
     # Waveform Commands
     # ---------------------------
     def onExpDecayBuzz(self):
         sampleCount = 50
         timeStep = 10
-        samples = self.generateExpDecay(sampleCount)
+        samples = waveforms.exp_decay(sampleCount)
         self.sendWaveCommand(sampleCount, timeStep, samples)
 
     def onShortBuzz(self):
@@ -135,53 +129,70 @@ class VibrationGUI(QWidget):
     def onSquareBuzz(self):
         sampleCount = 16
         timeStep = 50
-        samples = self.generateSquareWave(sampleCount)
+        samples = waveforms.square(sampleCount)
         self.sendWaveCommand(sampleCount, timeStep, samples)
 
     def onSawBuzz(self):
         sampleCount = 16
         timeStep = 50
-        samples = self.generateSawWave(sampleCount)
+        samples = waveforms.saw(sampleCount)
         self.sendWaveCommand(sampleCount, timeStep, samples)
 
     def sendWaveCommand(self, sampleCount, timeStep, samples):
-        """Send wave command with the format:
-           W <num_addr> <addr1> <addr2> ... <waveLen> <stepMs> <amp0> ... <ampN-1>
+        """Send the waveform as a binary W frame (see wrist/wave_protocol.py):
+           0xA5 <len> 'W' <num_addr> <addr1> ... <stepMs> <amp0> ... <ampN-1> <crc>
+        One byte per amplitude instead of the text form's three.
         """
         addresses = self.getCheckedAddresses()
         if not addresses:
             print("No addresses selected!")
             return
+        if self.ser is None:
+            print("Serial port not open!")
+            return
         
-        sampleStr = " ".join(f"{amp:02X}" for amp in samples)
-        numAddr = len(addresses)
-        cmd = f"W {numAddr} {' '.join(addresses)} {sampleCount} {timeStep} {sampleStr}\n"
-        self.sendCommand(cmd, wait_for_response=True)
+        frame = encode_wave_frame(addresses, timeStep, samples[:sampleCount])
+        print(f"Sending: W {len(addresses)} {' '.join(addresses)} {sampleCount} {timeStep} "
+              f"(binary, {len(frame)} bytes)")
+        self.watchResponse(self.transport.send(frame, expect_response=True, reply=W_REPLIES))
 
     # ---------------------------
     # Constant Buzz
     # ---------------------------
     def onAmpSliderChanged(self, value):
         self.ampValueLabel.setText(str(value))
-        # Real-time updates (no blocking)
-        self.sendConstBuzzCommand(value, wait_for_response=False)
+        # Real-time updates (no blocking); stale values are collapsed while dragging
+        self.sendConstBuzzCommand(value, throttled=True)
 
     def onStartConstBuzz(self):
         amp = self.ampSlider.value()
-        self.sendConstBuzzCommand(amp, wait_for_response=True)
+        self.sendConstBuzzCommand(amp)
 
     def onStopConstBuzz(self):
-        self.sendConstBuzzCommand(0, wait_for_response=True)
+        self.sendConstBuzzCommand(0)
 
-    def sendConstBuzzCommand(self, amplitude, wait_for_response=True):
-        """C <num_addr> <addr1> <addr2> ... <amplitude>"""
+    def sendConstBuzzCommand(self, amplitude, throttled=False):
+        """C <num_addr> <addr1> <addr2> ... <amplitude>
+
+        The firmware does not answer C, so no reply is awaited. throttled
+        commands only keep the latest amplitude per address set; the others
+        go out right away and drop any throttled one still pending.
+        """
         addresses = self.getCheckedAddresses()
         if not addresses:
             print("No addresses selected!")
             return
+        if self.ser is None:
+            print("Serial port not open!")
+            return
         numAddr = len(addresses)
         cmd = f"C {numAddr} {' '.join(addresses)} {amplitude}\n"
-        self.sendCommand(cmd, wait_for_response=wait_for_response)
+        key = ("C", tuple(addresses))
+        if throttled:
+            self.constBuzzChannel.post(key, cmd)
+            return
+        print("Sending:", cmd.strip())
+        self.constBuzzChannel.send_now(key, cmd)
 
     def getCheckedAddresses(self):
         """Return a list of addresses in hex (without '0x') for each checked box."""
@@ -202,20 +213,36 @@ class VibrationGUI(QWidget):
             print("Serial port not open!")
             return
         print("Sending:", cmd.strip())
-        self.ser.write(cmd.encode('utf-8'))
-        if wait_for_response:
-            response = self.ser.readline().decode('utf-8').strip()
-            print("Arduino response:", response)
-            if response.startswith("DONE "):
-                # e.g. "DONE 123"
-                ms_str = response[5:].strip()
-                self.timeLabel.setText(f"Last Waveform Time: {ms_str} ms")
+        self.watchResponse(self.transport.send(cmd, expect_response=wait_for_response))
+
+    def watchResponse(self, future):
+        if future is not None:
+            future.add_done_callback(
+                lambda f: self.responseReceived.emit("" if f.exception() else f.result()))
+
+    def onResponse(self, response):
+        print("Arduino response:", response)
+        if response.startswith("DONE "):
+            # e.g. "DONE 123"; the binary W's timing was recorded before this reply was delivered
+            ms_str = response[5:].strip()
+            last = self.latency.last.get('W-bin', {})
+            if 'round_trip' in last:
+                self.timeLabel.setText(f"Last Waveform Time: {ms_str} ms "
+                                       f"(round trip {last['round_trip'] * 1000:.1f} ms, "
+                                       f"wire {last['wire'] * 1000:.1f} ms)")
             else:
-                self.timeLabel.setText("No timing info received.")
+                self.timeLabel.setText(f"Last Waveform Time: {ms_str} ms")
+        else:
+            self.timeLabel.setText("No timing info received.")
 
     def closeEvent(self, event):
         if self.ser:
+            self.constBuzzChannel.close()
+            self.transport.close()
             self.ser.close()
+            print(self.latency.format_table())
+            if self.latencyLog:
+                self.latency.export(self.latencyLog)
         event.accept()
 
 def main():
@@ -0,0 +1,104 @@
+"""
+W command latency against the virtual vib_individual device (wrist/virtual_mcu.py):
+waveforms of increasing length to 1-3 addresses, as binary frames and as
+text, each round trip split into queue / wire / device / other (latency.py).
+
+    python latency_bench.py --repeats 20 --export latency.json
+    python latency_bench.py --check    # reply/timing correlation self-test
+
+Point --port at a real board to measure it instead of the simulator.
+"""
+import argparse
+import random
+import time
+
+import serial
+
+from wrist.wave_protocol import MAX_BIN_WAVE_SIZE, encode_wave_frame, encode_wave_text
+from wrist.serial_transport import SerialTransport
+from wrist.latency import LatencyRecorder
+from wrist.virtual_mcu import VirtualMCU, AddrDevice
+
+ADDRESSES = ["48", "49", "4A"]
+MAX_TEXT_WAVE_SIZE = 256
+LENGTHS = (3, 16, 50, 256, 512)
+W_REPLIES = ("DONE", "Error")
+
+def run(port, baud, lengths, repeats, step_ms, seed=0):
+    rng = random.Random(seed)
+    latency = LatencyRecorder()
+    ser = serial.Serial(port, baud)
+    # generous timeout: a waveform blocks the firmware for its whole duration
+    transport = SerialTransport(ser, timeout=2.0 + max(lengths) * step_ms / 1000.0, latency=latency)
+    try:
+        for n_addr in range(1, len(ADDRESSES) + 1):
+            addresses = ADDRESSES[:n_addr]
+            for length in lengths:
+                for _ in range(repeats):
+                    amps = [rng.randrange(256) for _ in range(length)]
+                    if length <= MAX_BIN_WAVE_SIZE:
+                        transport.send(encode_wave_frame(addresses, step_ms, amps), expect_response=True,
+                                       kind=f"bin {n_addr}x{length}", reply=W_REPLIES).result()
+                    if length <= MAX_TEXT_WAVE_SIZE:
+                        transport.send(encode_wave_text(addresses, step_ms, amps), expect_response=True,
+                                       kind=f"text {n_addr}x{length}", reply=W_REPLIES).result()
+    finally:
+        transport.close()
+        ser.close()
+    return latency
+
+def check():
+    """
+    A silent C followed by a W: the W's DONE must resolve the W and be timed
+    under 'W-bin', not be taken by the C.
+    """
+    latency = LatencyRecorder()
+    unsolicited = []
+    with VirtualMCU(AddrDevice()) as mcu:
+        ser = serial.Serial(mcu.port, 115200)
+        transport = SerialTransport(ser, latency=latency, on_line=unsolicited.append)
+        try:
+            transport.send("C 1 48 200\n")
+            reply = transport.send(encode_wave_frame(["48"], 1, bytes(50)), expect_response=True,
+                                   reply=W_REPLIES).result(2)
+            transport.send("Z\n")
+            time.sleep(0.1)
+        finally:
+            transport.close()
+            ser.close()
+    assert reply == "DONE 50", reply
+    assert unsolicited == ["Unknown command."], unsolicited
+    w = latency.histograms['W-bin']
+    assert w['round_trip'].count == 1 and w['device'].count == 1, latency.to_dict()
+    assert latency.histograms['C']['round_trip'].count == 0 and not latency.timeouts, latency.to_dict()
+    assert latency.last['W-bin']['device'] == 0.05
+    print("Replies and timings matched their commands.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure W command round-trip latency")
+    parser.add_argument('--port', help="serial port of a real board (default: simulator)")
+    parser.add_argument('--baud', type=int, default=115200)
+    parser.add_argument('--delay-ms', type=float, default=0.5, help="simulator processing time per command")
+    parser.add_argument('--step-ms', type=int, default=1, help="waveform step (device time = length * step)")
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--lengths', type=int, nargs='+', default=LENGTHS)
+    parser.add_argument('--export', help="write the histograms to .json or the summary to .csv")
+    parser.add_argument('--check', action='store_true', help="run the correlation self-test and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        check()
+        return
+
+    if args.port:
+        latency = run(args.port, args.baud, args.lengths, args.repeats, args.step_ms)
+    else:
+        with VirtualMCU(AddrDevice(), args.baud, args.delay_ms / 1000.0) as mcu:
+            latency = run(mcu.port, args.baud, args.lengths, args.repeats, args.step_ms)
+    print(latency.format_table())
+    if args.export:
+        latency.export(args.export)
+        print(f"Wrote {args.export}")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,17 @@
 #define MAX_WAVE_SIZE 256
 #define NUM_DRIVERS 3
 
+// Binary W frames (see wrist/wave_protocol.py):
+// 0xA5 | len (u16 LE) | 'W' | num_addr | addr... | stepMs (u16 LE) | amp... | crc16 (u16 LE)
+// binBody is static RAM: 512 samples keep it at 519 bytes, a quarter of an
+// Arduino Uno's (ATmega328P) 2 KB next to the Serial/Wire buffers and drivers.
+// Raise it only on boards with more SRAM, together with MAX_BIN_WAVE_SIZE in
+// wrist/wave_protocol.py.
+#define BIN_SYNC 0xA5
+#define MAX_BIN_WAVE_SIZE 512
+#define MAX_BIN_BODY (2 + NUM_DRIVERS + 2 + MAX_BIN_WAVE_SIZE)
+#define BIN_TIMEOUT_MS 500
+
 // Pre-created global instances for each address
 Haptic_Driver hapDrive48(0x48);
 Haptic_Driver hapDrive49(0x49);
@@ -116,6 +127,33 @@ void parseWCommand(String cmd) {
     waveData[i] = (uint8_t)strtol(ampStr.c_str(), NULL, 16);
   }
   
+  playWave(addrs, numAddr, waveData, waveLen, stepMs);
+}
+
+//-------------------------------
+// Binary W command
+//-------------------------------
+static uint8_t binBody[MAX_BIN_BODY];
+
+// CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), same as binascii.crc_hqx(data, 0xFFFF)
+uint16_t crc16Update(uint16_t crc, const uint8_t* data, size_t len) {
+  for (size_t i = 0; i < len; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (int b = 0; b < 8; b++)
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : (crc << 1);
+  }
+  return crc;
+}
+
+// Reads exactly len bytes, giving up after BIN_TIMEOUT_MS without data.
+bool readExact(uint8_t* dst, size_t len) {
+  Serial.setTimeout(BIN_TIMEOUT_MS);
+  size_t got = Serial.readBytes(dst, len);
+  Serial.setTimeout(1000);
+  return got == len;
+}
+
+void playWave(const uint8_t* addrs, int numAddr, const uint8_t* waveData, int waveLen, int stepMs) {
   unsigned long startTime = millis();
   // For each sample, update all selected drivers.
   for (int i = 0; i < waveLen; i++) {
@@ -141,6 +179,40 @@ void parseWCommand(String cmd) {
   Serial.println(diff);
 }
 
+// Called with the sync byte already consumed.
+void parseBinaryWCommand() {
+  uint8_t lenBytes[2];
+  if (!readExact(lenBytes, 2)) {
+    Serial.println("Error: Binary frame timed out");
+    return;
+  }
+  uint16_t len = lenBytes[0] | (lenBytes[1] << 8);
+  if (len > MAX_BIN_BODY || len < 4) {
+    Serial.println("Error: Binary frame length invalid");
+    return;
+  }
+  uint8_t crcBytes[2];
+  if (!readExact(binBody, len) || !readExact(crcBytes, 2)) {
+    Serial.println("Error: Binary frame timed out");
+    return;
+  }
+  uint16_t crc = crc16Update(crc16Update(0xFFFF, lenBytes, 2), binBody, len);
+  if (crc != (uint16_t)(crcBytes[0] | (crcBytes[1] << 8))) {
+    Serial.println("Error: Binary frame CRC mismatch");
+    return;
+  }
+
+  int numAddr = binBody[1];
+  if (binBody[0] != 'W' || numAddr < 1 || numAddr > NUM_DRIVERS || len < 4 + numAddr) {
+    Serial.println("Error: Binary W frame format incorrect");
+    return;
+  }
+  const uint8_t* addrs = &binBody[2];
+  int stepMs = binBody[2 + numAddr] | (binBody[3 + numAddr] << 8);
+  int waveLen = len - 4 - numAddr;
+  playWave(addrs, numAddr, &binBody[4 + numAddr], waveLen, stepMs);
+}
+
 //-------------------------------
 // parseCCommand
 //-------------------------------
@@ -216,6 +288,11 @@ void setup() {
 
 void loop() {
   if (Serial.available()) {
+    if (Serial.peek() == BIN_SYNC) {
+      Serial.read();
+      parseBinaryWCommand();
+      return;
+    }
     String cmd = Serial.readStringUntil('\n');
     cmd.trim();
     if (cmd.length() == 0) return;
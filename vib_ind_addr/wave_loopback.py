@@ -0,0 +1,134 @@
+"""
+Loopback harness for the W command: a fake vib_individual device behind a
+SerialTransport, fed the same waveforms as text and as binary frames.
+
+Checks that every waveform decodes back to exactly what was sent and
+compares bytes on the wire and transfer time at 115200 baud (8N1, so 10 bits
+per byte). Run from this folder: python wave_loopback.py
+"""
+import queue
+import random
+
+from wrist.wave_protocol import (SYNC, MAX_BIN_WAVE_SIZE, WaveFrame, decode_wave_frame,
+                                 encode_wave_frame, encode_wave_text)
+from wrist.serial_transport import SerialTransport
+
+BAUD = 115200
+ADDRESSES = ["48", "49", "4A"]
+
+# Text commands are limited by the firmware's token array and wave buffer
+MAX_TEXT_WAVE_SIZE = 256
+
+
+class FakeWaveDevice:
+    """
+    Serial-like stand-in for vib_individual.ino. write() accepts text W/C lines
+    and binary W frames in any interleaving; each W is recorded in self.frames
+    and answered with "DONE <ms>" (waveLen * stepMs, nothing actually waits).
+    Replies are read back at most READ_CHUNK bytes at a time, the way a
+    USB-serial adapter can split a line across reads.
+    """
+    READ_CHUNK = 3
+
+    def __init__(self):
+        self.timeout = 1
+        self.frames = []
+        self.bytes_received = 0
+        self._buf = bytearray()
+        self._replies = queue.Queue()
+        self._out = bytearray()
+
+    def write(self, data):
+        self.bytes_received += len(data)
+        self._buf += data
+        while self._buf:
+            if self._buf[0] == SYNC:
+                frame, consumed = decode_wave_frame(self._buf)
+                if consumed == 0:
+                    return
+                del self._buf[:consumed]
+                if frame is None:
+                    self._reply("Error: bad binary frame")
+                elif len(frame.amplitudes) > MAX_BIN_WAVE_SIZE:
+                    self._reply("Error: waveLen exceeds buffer size")
+                else:
+                    self._play(frame)
+            else:
+                end = self._buf.find(b'\n')
+                if end < 0:
+                    return
+                line = self._buf[:end].decode(errors='ignore').strip()
+                del self._buf[:end + 1]
+                self._handle_text(line)
+
+    @property
+    def in_waiting(self):
+        return min(len(self._out), self.READ_CHUNK)
+
+    def read(self, size=1):
+        if not self._out:
+            try:
+                self._out += self._replies.get(timeout=self.timeout)
+            except queue.Empty:
+                return b''
+        data = bytes(self._out[:min(size, self.READ_CHUNK)])
+        del self._out[:len(data)]
+        return data
+
+    def _handle_text(self, line):
+        tokens = line.split()
+        if not tokens:
+            return
+        if tokens[0] == "W" and len(tokens) >= 6:
+            num_addr = int(tokens[1])
+            addresses = [int(a, 16) for a in tokens[2:2 + num_addr]]
+            wave_len = min(int(tokens[2 + num_addr]), MAX_TEXT_WAVE_SIZE)
+            step_ms = int(tokens[3 + num_addr])
+            amps = bytes(int(a, 16) for a in tokens[4 + num_addr:4 + num_addr + wave_len])
+            self._play(WaveFrame(addresses, step_ms, amps))
+        elif tokens[0] != "C":
+            self._reply("Unknown command.")
+
+    def _play(self, frame):
+        self.frames.append(frame)
+        self._reply(f"DONE {len(frame.amplitudes) * frame.step_ms}")
+
+    def _reply(self, text):
+        self._replies.put((text + "\r\n").encode())
+
+
+def wire_ms(n_bytes):
+    return n_bytes * 10 / BAUD * 1000
+
+def main():
+    rng = random.Random(0)
+    print(f"{'samples':>8} {'text B':>8} {'binary B':>9} {'text ms':>8} {'binary ms':>10} {'ratio':>6}")
+    for length in (3, 16, 50, 256, MAX_BIN_WAVE_SIZE):
+        amps = [rng.randrange(256) for _ in range(length)]
+        text = encode_wave_text(ADDRESSES, 10, amps)
+        binary = encode_wave_frame(ADDRESSES, 10, amps)
+
+        device = FakeWaveDevice()
+        transport = SerialTransport(device)
+        replies = [transport.send(binary, expect_response=True)]
+        if length <= MAX_TEXT_WAVE_SIZE:
+            replies.append(transport.send(text, expect_response=True))
+        for reply in replies:
+            assert reply.result(2) == f"DONE {length * 10}", reply.result()
+        transport.close()
+
+        for frame in device.frames:
+            assert frame.addresses == [0x48, 0x49, 0x4A] and frame.step_ms == 10
+            assert list(frame.amplitudes) == amps
+
+        # the text form cannot carry waveforms this long, so it has no size or time
+        if length <= MAX_TEXT_WAVE_SIZE:
+            text_bytes, text_ms, ratio = f"{len(text):8d}", f"{wire_ms(len(text)):8.1f}", \
+                f"{len(text) / len(binary):5.1f}x"
+        else:
+            text_bytes, text_ms, ratio = f"{'(n/a)':>8}", f"{'(n/a)':>8}", f"{'(n/a)':>6}"
+        print(f"{length:8d} {text_bytes} {len(binary):9d} {text_ms} {wire_ms(len(binary)):10.1f} {ratio}")
+    print("All waveforms round-tripped intact.")
+
+if __name__ == "__main__":
+    main()
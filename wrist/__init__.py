@@ -0,0 +1,9 @@
+"""
+Host-side code shared by the WRIST UIs and analysis scripts: the serial
+command transport and its latency instrumentation, the binary W frame
+protocol, amplitude waveforms, the result cache and the virtual MCU.
+
+Install the repository once (pip install -e .) and import from any folder:
+
+    from wrist.serial_transport import SerialTransport
+"""
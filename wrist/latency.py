@@ -0,0 +1,221 @@
+"""
+Command round-trip latency instrumentation for SerialTransport.
+
+Give a transport a LatencyRecorder and every command is timestamped with
+time.monotonic() when it is queued, when the writer thread hands it to the
+port and when its reply line is read. Each round trip is split into
+
+    queue       send() -> ser.write() (host queueing and write coalescing)
+    wire        UART time for the command's bytes, including any written
+                ahead of it in the same batch, and for its reply line
+                (10 bits per byte at the port's baud rate)
+    device      execution time the MCU reports ("DONE <ms>")
+    other       the rest: firmware parsing, USB/driver latency, reader wake-up
+    round_trip  send() -> reply line
+
+and each part goes into a streaming histogram per command kind ('W', 'C',
+'W-bin' for binary frames, or any kind passed to send()). Commands without
+a reply only get queue and wire; unanswered requests are counted as
+timeouts.
+
+    latency = LatencyRecorder()
+    transport = SerialTransport(ser, latency=latency)
+    ...
+    print(latency.format_table())
+    latency.export('latency.json')   # or .csv for the percentile summary
+"""
+import csv
+import json
+import re
+import threading
+
+from collections import defaultdict
+
+from .wave_protocol import SYNC
+
+COMPONENTS = ('queue', 'wire', 'device', 'other', 'round_trip')
+PERCENTILES = (50, 90, 99, 99.9)
+DONE_PATTERN = re.compile(r'^DONE\s+(\d+)')
+
+def command_kind(data):
+    """Histogram key for a raw command: its first token, or 'W-bin' for a binary frame."""
+    if data[:1] == bytes([SYNC]):
+        return 'W-bin'
+    token = data.split(None, 1)[:1]
+    return token[0].decode(errors='replace') if token else '?'
+
+def device_ms(reply):
+    """The ms reported by a "DONE <ms>" reply, or None."""
+    match = DONE_PATTERN.match(reply)
+    return int(match.group(1)) if match else None
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of integer microseconds: values below 2 * SUB_BUCKETS
+    are counted exactly, larger ones in buckets SUB_BUCKETS per power of two
+    wide, so every value is kept to within 1/SUB_BUCKETS (~1.6%) of itself
+    whatever its magnitude. Memory grows with log(max value), not with the
+    number of samples.
+    """
+    SUB_BUCKETS = 64
+
+    def __init__(self):
+        self.counts = defaultdict(int)  # bucket index -> count
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def index(cls, value):
+        shift = max(value.bit_length() - cls.SUB_BUCKETS.bit_length(), 0)
+        return cls.SUB_BUCKETS * shift + (value >> shift)
+
+    @classmethod
+    def bounds(cls, index):
+        """[low, high) of the values counted in bucket 'index'."""
+        shift = max(index // cls.SUB_BUCKETS - 1, 0)
+        sub = index - cls.SUB_BUCKETS * shift
+        return sub << shift, (sub + 1) << shift
+
+    def record(self, value, count=1):
+        value = max(int(value), 0)
+        self.counts[self.index(value)] += count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q):
+        """Value at percentile q (0-100): the midpoint of the bucket that holds it."""
+        if not self.count:
+            return None
+        rank = max(q / 100.0 * self.count, 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bounds(index)
+                return min(max((low + high - 1) / 2, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean(),
+            'percentiles': {str(q): self.percentile(q) for q in PERCENTILES},
+            # [low, high, count] per non-empty bucket, enough to merge or re-plot later
+            'buckets': [[*self.bounds(i), self.counts[i]] for i in sorted(self.counts)],
+        }
+
+
+class CommandTiming:
+    """Timestamps of one command, filled in by SerialTransport."""
+    __slots__ = ('kind', 'queued', 'written', 'wire', 'replied')
+
+    def __init__(self, kind, queued):
+        self.kind = kind
+        self.queued = queued
+        self.written = None
+        self.wire = 0.0
+        self.replied = None
+
+
+class LatencyRecorder:
+    """Histograms (microseconds) per command kind and component; thread-safe."""
+    def __init__(self):
+        self.histograms = defaultdict(lambda: {c: LatencyHistogram() for c in COMPONENTS})
+        self.timeouts = defaultdict(int)
+        self.last = {}  # kind -> {component: seconds} of the latest finished command
+        self._lock = threading.Lock()
+
+    def finish(self, timing, reply=None):
+        """Record a written command; reply is its response text, if it asked for one."""
+        parts = {'queue': timing.written - timing.queued, 'wire': timing.wire}
+        if reply is not None:
+            parts['round_trip'] = timing.replied - timing.queued
+            ms = device_ms(reply)
+            if ms is not None:
+                parts['device'] = ms / 1000.0
+            parts['other'] = parts['round_trip'] - parts['queue'] - parts['wire'] - parts.get('device', 0.0)
+        with self._lock:
+            histograms = self.histograms[timing.kind]
+            for component, seconds in parts.items():
+                histograms[component].record(round(seconds * 1e6))
+            self.last[timing.kind] = parts
+
+    def timeout(self, timing):
+        with self._lock:
+            self.timeouts[timing.kind] += 1
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.timeouts.clear()
+            self.last.clear()
+
+    # ---------------------------
+    # Reporting
+    # ---------------------------
+    def to_dict(self):
+        with self._lock:
+            return {kind: {'timeouts': self.timeouts.get(kind, 0),
+                           **{c: h.to_dict() for c, h in histograms.items() if h.count}}
+                    for kind, histograms in self.histograms.items()}
+
+    def summary_rows(self):
+        """One row per (kind, component) with count, mean and percentiles in ms."""
+        rows = []
+        for kind, components in self.to_dict().items():
+            for component in COMPONENTS:
+                stats = components.get(component)
+                if stats is None:
+                    continue
+                row = {'kind': kind, 'component': component, 'count': stats['count'],
+                       'timeouts': components['timeouts'], 'mean_ms': stats['mean'] / 1000.0,
+                       'min_ms': stats['min'] / 1000.0}
+                for q in PERCENTILES:
+                    row[f'p{q}_ms'] = stats['percentiles'][str(q)] / 1000.0
+                row['max_ms'] = stats['max'] / 1000.0
+                rows.append(row)
+        return rows
+
+    def format_table(self):
+        rows = self.summary_rows()
+        if not rows:
+            return "(no commands recorded)"
+        header = f"{'kind':<16} {'component':<11} {'count':>6} {'mean':>8} " + \
+                 " ".join(f"{'p' + str(q):>8}" for q in PERCENTILES) + f" {'max':>8}  (ms)"
+        lines = [header]
+        for row in rows:
+            lines.append(f"{row['kind']:<16} {row['component']:<11} {row['count']:6d} {row['mean_ms']:8.2f} " +
+                         " ".join(f"{row[f'p{q}_ms']:8.2f}" for q in PERCENTILES) + f" {row['max_ms']:8.2f}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write the histograms as .json (full buckets) or the summary table as .csv."""
+        if path.lower().endswith('.csv'):
+            rows = self.summary_rows()
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['kind'])
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=1)
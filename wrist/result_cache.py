@@ -0,0 +1,151 @@
+"""
+On-disk memoization of analysis results, shared by the Testbench and
+Squeeze_Force_Test scripts.
+
+A result is keyed by the SHA-256 of its input files' contents, the
+analysis parameters and the source of the code that produced it, so
+re-running a report only recomputes what an edited dataset or script
+actually affects. Tables and other Python objects are pickled; figures
+and other output files are stored as copies and restored with a copy.
+
+    cache = ResultCache(code=[__file__])
+    table = cache.memoize('max_table', [csv], {'statistic': 'max'}, lambda: compute(csv))
+    cache.output('overlay', [csv], {}, 'overlay.png', lambda path: render(csv, path))
+
+File hashes are remembered by (path, size, mtime), so unchanged inputs are
+not re-read to check them. Each file's hash is its own small entry under
+hashes/, so parallel workers never overwrite each other's.
+
+The cache is the .result_cache directory in the working directory at the
+time the ResultCache is created (usually the script's own folder). Set
+RESULT_CACHE_DIR to put it elsewhere, or RESULT_CACHE=0 to bypass it.
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+DEFAULT_DIR = '.result_cache'
+
+def file_digest(path, chunk_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=None, code=(), enabled=None):
+        """
+        directory: defaults to $RESULT_CACHE_DIR, else DEFAULT_DIR under the
+        current working directory. code: source files whose contents are
+        part of every key (usually the calling script), so editing the
+        analysis invalidates its results.
+        """
+        if directory is None:
+            directory = os.environ.get('RESULT_CACHE_DIR', DEFAULT_DIR)
+        self.directory = directory = os.path.abspath(directory)
+        self.code = [os.path.abspath(p) for p in code]
+        self.enabled = os.environ.get('RESULT_CACHE', '1') != '0' if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+        self._hashes = {}  # path -> [stamp, digest] read or written by this process
+
+    # ---------------------------
+    # Keys
+    # ---------------------------
+    def digest(self, path):
+        """Content hash of path, reused while its size and mtime are unchanged."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        entry = self._hashes.get(path) or self._load_hash(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        digest = file_digest(path)
+        self._hashes[path] = [stamp, digest]
+        self._atomic_write(self._hash_path(path), json.dumps([stamp, digest]).encode())
+        return digest
+
+    def key(self, name, inputs, params):
+        """Cache key for result 'name' of these input files and parameters."""
+        parts = {
+            'name': name,
+            'inputs': [self.digest(p) for p in inputs],
+            'code': [self.digest(p) for p in self.code],
+            'params': params,
+        }
+        blob = json.dumps(parts, sort_keys=True, default=str).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    # ---------------------------
+    # Results
+    # ---------------------------
+    def memoize(self, name, inputs, params, compute):
+        """compute() on a miss; its (picklable) result is stored under the key."""
+        if not self.enabled:
+            return compute()
+        path = self._entry(name, inputs, params) + '.pkl'
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+                self.hits += 1
+                return result
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass  # damaged entry, recompute
+        self.misses += 1
+        result = compute()
+        self._atomic_write(path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    def output(self, name, inputs, params, output_path, render):
+        """
+        Make sure output_path holds the file render(output_path) would write,
+        copying it from the cache on a hit. Returns True if it was a hit.
+        """
+        if not self.enabled:
+            render(output_path)
+            return False
+        stored = self._entry(name, inputs, params) + os.path.splitext(output_path)[1]
+        if os.path.exists(stored):
+            shutil.copyfile(stored, output_path)
+            self.hits += 1
+            return True
+        self.misses += 1
+        before = os.path.getmtime(output_path) if os.path.exists(output_path) else None
+        render(output_path)
+        if not os.path.exists(output_path) or os.path.getmtime(output_path) == before:
+            return False  # render failed or wrote nothing; nothing to store
+        with open(output_path, 'rb') as f:
+            self._atomic_write(stored, f.read())
+        return False
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _entry(self, name, inputs, params):
+        key = self.key(name, inputs, params)
+        return os.path.join(self.directory, key[:2], key)
+
+    def _hash_path(self, path):
+        name = hashlib.sha256(path.encode()).hexdigest()
+        return os.path.join(self.directory, 'hashes', name + '.json')
+
+    def _load_hash(self, path):
+        try:
+            with open(self._hash_path(path)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _atomic_write(self, path, data):
+        # write-then-rename, so concurrent workers never read half an entry
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
@@ -0,0 +1,243 @@
+"""
+Non-blocking serial command transport shared by the motor/vibration UIs.
+
+send() only queues the command and returns immediately; a writer thread
+drains the queue and writes everything that piled up in a single
+ser.write(), and a reader thread matches reply lines to the requests that
+asked for one: the oldest request whose 'reply' prefix the line starts with
+(any line, if it gave none). Lines no request accepts, such as a firmware
+warning printed ahead of its DONE, go to on_line instead. Replies come back as concurrent.futures.Future
+objects that time out after the device's timeout, so a Qt slot never waits
+on the port.
+
+The reader polls the port with a POLL_INTERVAL timeout, so the transport
+sets ser.timeout while it is open and restores the caller's value on
+close(). Partial reads are buffered until their newline arrives.
+
+Future callbacks run on the reader thread: hand results to widgets through
+a pyqtSignal, not by touching the widgets directly.
+
+Pass latency=LatencyRecorder() (latency.py) to time every command's
+queueing, wire and device time; timings are recorded before the reply's
+future resolves.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from .latency import CommandTiming, command_kind
+
+# Reader wake-up interval; bounds how late a timed-out request is failed.
+POLL_INTERVAL = 0.05
+
+
+class SerialTransport:
+    def __init__(self, ser, timeout=1.0, on_line=None, latency=None):
+        """
+        ser: an open serial.Serial. timeout: seconds to wait for a reply on
+        this device. on_line(text) receives lines no request is waiting for.
+        latency: optional LatencyRecorder.
+        """
+        self.ser = ser
+        self._port_timeout = ser.timeout
+        self.ser.timeout = POLL_INTERVAL
+        self.timeout = timeout
+        self.on_line = on_line
+        self.latency = latency
+        # UART time per byte (8N1); 0 for ports without a baud rate
+        baud = getattr(ser, 'baudrate', None)
+        self._byte_time = 10.0 / baud if baud else 0.0
+        self._outbox = queue.Queue()
+        self._pending = deque()  # (deadline, future, timing, reply prefix) awaiting a reply, oldest first
+        self._lock = threading.Lock()
+        self._rx = bytearray()  # bytes read since the last newline
+        self._running = True
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._writer.start()
+        self._reader.start()
+
+    def send(self, command, expect_response=False, timeout=None, kind=None, reply=None):
+        """
+        Queue a command (str or bytes) for writing. Returns a Future for the
+        reply line if expect_response, else None. Never blocks. reply: prefix
+        (or tuple of prefixes) the answer starts with, e.g. ('DONE', 'Error');
+        only commands the firmware actually answers should expect a response.
+        kind names the latency histogram to record into (default: the
+        command letter).
+        """
+        data = command.encode('utf-8') if isinstance(command, str) else bytes(command)
+        future = Future() if expect_response else None
+        timing = None
+        if self.latency is not None:
+            timing = CommandTiming(kind or command_kind(data), time.monotonic())
+        self._outbox.put((data, future, self.timeout if timeout is None else timeout, timing, reply))
+        return future
+
+    def close(self):
+        """Stop both threads and fail any request still waiting for a reply."""
+        self._running = False
+        self._outbox.put(None)
+        self._writer.join()
+        self._reader.join()
+        self.ser.timeout = self._port_timeout
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+        for _, future, _, _ in pending:
+            _resolve(future, exception=ConnectionError("transport closed"))
+
+    def _write_loop(self):
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            # Coalesce everything queued in the meantime into one write
+            batch = [item]
+            stop = False
+            while True:
+                try:
+                    item = self._outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            now = time.monotonic()
+            offset = 0
+            with self._lock:
+                for data, future, timeout, timing, reply in batch:
+                    if timing is not None:
+                        # a command is on the wire once everything ahead of it in the batch is
+                        offset += len(data)
+                        timing.written = now
+                        timing.wire = offset * self._byte_time
+                    if future is not None:
+                        self._pending.append((now + timeout, future, timing, reply))
+            try:
+                self.ser.write(b''.join(item[0] for item in batch))
+            except Exception as e:
+                print("Error writing serial:", e)
+                for _, future, _, _, _ in batch:
+                    if future is not None:
+                        _resolve(future, exception=e)
+            else:
+                if self.latency is not None:
+                    for _, future, _, timing, _ in batch:
+                        if future is None:
+                            self.latency.finish(timing)
+            if stop:
+                return
+
+    def _read_loop(self):
+        while self._running:
+            try:
+                # returns early on POLL_INTERVAL, possibly with half a line
+                self._rx += self.ser.read(self.ser.in_waiting or 1)
+            except Exception as e:
+                print("Error reading serial:", e)
+                return
+            now = time.monotonic()
+            end = self._rx.find(b'\n')
+            if end < 0:
+                self._dispatch(None, now)
+                continue
+            while end >= 0:
+                line = bytes(self._rx[:end + 1])
+                del self._rx[:end + 1]
+                self._dispatch(line, now)
+                end = self._rx.find(b'\n')
+
+    def _dispatch(self, line, now):
+        """Fail expired requests, then hand a complete line to its request or on_line."""
+        text = line.decode('utf-8', errors='ignore').strip() if line else None
+        future = timing = None
+        with self._lock:
+            expired = [entry for entry in self._pending if entry[0] < now]
+            if expired:
+                self._pending = deque(entry for entry in self._pending if entry[0] >= now)
+            if line:
+                for entry in self._pending:
+                    if entry[3] is None or text.startswith(entry[3]):
+                        self._pending.remove(entry)
+                        _, future, timing, _ = entry
+                        break
+        for _, f, t, _ in expired:
+            if t is not None:
+                self.latency.timeout(t)
+            _resolve(f, exception=TimeoutError("no response from device"))
+        if line:
+            if future is not None:
+                if timing is not None:
+                    timing.replied = now
+                    timing.wire += len(line) * self._byte_time
+                    self.latency.finish(timing, text)
+                _resolve(future, result=text)
+            elif self.on_line:
+                self.on_line(text)
+
+
+def _resolve(future, result=None, exception=None):
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+class LatestValueChannel:
+    """
+    Rate-limited, latest-value-wins command channel on top of a SerialTransport.
+
+    post(key, command) replaces any update for the same key (e.g. command type
+    plus address set) that has not gone out yet, and updates are sent at most
+    max_rate times per second. Dragging a slider therefore costs a bounded
+    number of commands, and the device always ends on the last value.
+    """
+    def __init__(self, transport, max_rate=30.0):
+        self.transport = transport
+        self.interval = 1.0 / max_rate
+        self._latest = {}  # key -> command, waiting to be sent
+        self._cond = threading.Condition()
+        self._last_send = 0.0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def post(self, key, command):
+        with self._cond:
+            self._latest.pop(key, None)
+            self._latest[key] = command
+            self._cond.notify()
+
+    def send_now(self, key, command, expect_response=False):
+        """Send immediately, dropping any update for key that is still pending."""
+        with self._cond:
+            self._latest.pop(key, None)
+            return self.transport.send(command, expect_response)
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                if not self._latest:
+                    self._cond.wait()
+                    continue
+                wait = self._last_send + self.interval - time.monotonic()
+                if wait > 0:
+                    # more posts may replace these values while we wait
+                    self._cond.wait(wait)
+                    continue
+                for command in self._latest.values():
+                    self.transport.send(command)
+                self._latest.clear()
+                self._last_send = time.monotonic()
@@ -0,0 +1,390 @@
+"""
+Virtual MCU: the serial protocols of the lab firmware, served over a Linux
+pseudo-terminal so the host UIs and benchmarks can run without boards.
+
+    python -m wrist.virtual_mcu showcase           Full/ STM32 board (UI_showcase.py)
+    python -m wrist.virtual_mcu addr               vib_individual.ino (vib_ind_addr/UI_addr.py)
+    python -m wrist.virtual_mcu motor              6612_testing.ino (Motor_Control/UI.py)
+    python -m wrist.virtual_mcu force --rate 100   forcesensor_read.ino (Force_Sensor_Reading/UI.py)
+
+It prints the pty path (e.g. /dev/pts/5); open that with serial.Serial like
+a COM port. --link also creates a fixed symlink to it.
+
+Timing model:
+- bytes take 10 bits each at --baud in both directions (8N1), so long
+  commands and replies cost what they would on a real UART;
+- the firmware loop is single-threaded: commands are handled one at a time,
+  each taking --delay-ms plus whatever the command itself blocks for (a W
+  waveform blocks for waveLen * stepMs, like the delay() loop it replaces);
+- the force device streams telemetry at --rate from a squeeze signal model.
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import select
+import threading
+import time
+import tty
+
+from .wave_protocol import SYNC, MAX_BIN_WAVE_SIZE, WaveFrameDecoder
+
+BITS_PER_BYTE = 10  # 8N1
+
+
+class LineDevice:
+    """
+    Base for the simulated firmwares. feed() takes received bytes and returns
+    [(seconds the command blocks the loop, reply bytes)], one per handled
+    command. Devices with telemetry set telemetry_interval and implement
+    telemetry(now).
+    """
+    telemetry_interval = None
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def feed(self, data, now):
+        self._buf += data
+        results = []
+        while True:
+            end = self._buf.find(b'\n')
+            if end < 0:
+                return results
+            line = self._buf[:end].decode(errors='ignore').strip()
+            del self._buf[:end + 1]
+            if line:
+                results.append(self.handle(line, now))
+
+    def handle(self, line, now):
+        raise NotImplementedError
+
+    def telemetry(self, now):
+        return None
+
+
+class ShowcaseDevice(LineDevice):
+    """Full/Core/Src/main.c: S/A/B/R/L/X/M/T/W/V/P, every line echoed back."""
+    NUM_HAPTIC_DEVICES = 5
+    ROTATE_SECONDS_PER_DEGREE = 0.0  # set > 0 to make A/B block like rotateAngle()
+
+    def __init__(self):
+        super().__init__()
+        self.amp = 250
+        self.angle = 0.0
+        self.pwm = (0, 0)
+        self.vibration = [0] * self.NUM_HAPTIC_DEVICES
+        self.state = 'idle'
+
+    def handle(self, line, now):
+        cmd, arg = line[0], line[2:].strip()
+        reply = b''
+        block = 0.0
+        try:
+            if cmd == 'S':
+                self.amp = int(arg)
+            elif cmd in 'AB':
+                angle = float(arg)
+                block = abs(angle) * self.ROTATE_SECONDS_PER_DEGREE
+                self.angle += angle if cmd == 'A' else -angle
+            elif cmd == 'R':
+                self.pwm = (self.amp, 0)
+            elif cmd == 'L':
+                self.pwm = (0, self.amp)
+            elif cmd == 'X':
+                self.pwm = (255, 255)
+            elif cmd == 'M':
+                self.state = 'modelling'
+            elif cmd == 'T':
+                self.state = 'takeoff'
+            elif cmd == 'W':
+                tokens = line.split()
+                if len(tokens) < 3:
+                    reply = b"Error: W command format incorrect\r\n"
+                else:
+                    device, amplitude = int(tokens[1]), int(tokens[2], 16) & 0xFF
+                    if 1 <= device <= self.NUM_HAPTIC_DEVICES:
+                        self.vibration[device - 1] = amplitude
+                        reply = f"Device {device} set to amplitude 0x{amplitude:02X}\r\n".encode()
+                    else:
+                        reply = b"Error: Invalid device indicator\r\n"
+            elif cmd == 'V':
+                self.vibration = [int(arg, 16) & 0xFF] * self.NUM_HAPTIC_DEVICES
+            elif cmd == 'P':
+                level = int(arg)
+                self.pwm = (60 + (self.amp - 60) * level // 10, 0)
+        except ValueError:
+            pass  # atoi/strtol on garbage just yields 0 on the board; nothing to model
+        return block, reply + f"{line}\n".encode()
+
+
+class AddrDevice(LineDevice):
+    """
+    vib_individual.ino: text "W <n> <addr..> <len> <step> <amp..>", binary W
+    frames (wave_protocol.py) and "C <n> <addr..> <amp>". W blocks for the
+    waveform's duration and replies "DONE <ms>"; C is silent, as in the sketch.
+    """
+    MAX_WAVE_SIZE = 256
+    ADDRESSES = (0x48, 0x49, 0x4A)
+
+    def __init__(self):
+        super().__init__()
+        self.levels = {a: 0 for a in self.ADDRESSES}
+        self._frames = WaveFrameDecoder()
+        self._bin_pending = False
+
+    def feed(self, data, now):
+        results = []
+        for b in data:
+            # a sync byte at a line start switches to binary until the frame completes
+            if not self._bin_pending and not self._buf and b == SYNC:
+                self._bin_pending = True
+            if self._bin_pending:
+                errors = self._frames.errors
+                frames = self._frames.feed(bytes([b]))
+                if frames or self._frames.errors != errors:
+                    self._bin_pending = False
+                for frame in frames:
+                    results.append(self._play(frame.addresses, frame.step_ms, frame.amplitudes,
+                                              MAX_BIN_WAVE_SIZE))
+                if self._frames.errors != errors:
+                    # like the firmware: report why, then read what follows as text
+                    self._frames.reset()
+                    results.append((0.0, f"Error: {self._frames.last_error}\r\n".encode()))
+            else:
+                results.extend(super().feed(bytes([b]), now))
+        return results
+
+    def handle(self, line, now):
+        tokens = line.split()
+        try:
+            if tokens[0] == 'W':
+                n = int(tokens[1])
+                addresses = [int(a, 16) for a in tokens[2:2 + n]]
+                wave_len, step_ms = int(tokens[2 + n]), int(tokens[3 + n])
+                amps = [int(a, 16) & 0xFF for a in tokens[4 + n:4 + n + wave_len]]
+                if len(amps) < min(wave_len, self.MAX_WAVE_SIZE):
+                    return 0.0, b"Error: Not enough amplitude data in command.\r\n"
+                return self._play(addresses, step_ms, amps, self.MAX_WAVE_SIZE)
+            if tokens[0] == 'C':
+                n = int(tokens[1])
+                amplitude = int(tokens[2 + n]) & 0xFF
+                for a in tokens[2:2 + n]:
+                    self.levels[int(a, 16)] = amplitude
+                return 0.0, b''
+        except (ValueError, IndexError):
+            return 0.0, f"Error: {tokens[0]} command format incorrect\r\n".encode()
+        return 0.0, b"Unknown command.\r\n"
+
+    def _play(self, addresses, step_ms, amplitudes, max_len):
+        amplitudes = list(amplitudes)[:max_len]
+        for a in addresses:
+            self.levels[a] = 0  # playback ends with the drivers off
+        ms = len(amplitudes) * step_ms
+        return ms / 1000.0, f"DONE {ms}\r\n".encode()
+
+
+class MotorDevice(LineDevice):
+    """6612_testing.ino: T (tighten), R (release), X (stop); no replies."""
+    def __init__(self):
+        super().__init__()
+        self.state = 'stopped'
+
+    def handle(self, line, now):
+        self.state = {'T': 'tightening', 'R': 'releasing', 'X': 'stopped'}.get(line, self.state)
+        return 0.0, b''
+
+
+class SqueezeModel:
+    """
+    SingleTact force signal: a resting level plus Gaussian noise, with a
+    raised-cosine squeeze of 'peak' N lasting 'duty' of every 'period' s.
+    """
+    def __init__(self, rest=0.2, noise=0.05, peak=8.0, period=4.0, duty=0.4, seed=0):
+        self.rest = rest
+        self.noise = noise
+        self.peak = peak
+        self.period = period
+        self.duty = duty
+        self._rng = random.Random(seed)
+
+    def __call__(self, t):
+        phase = (t % self.period) / self.period
+        squeeze = 0.0
+        if phase < self.duty:
+            squeeze = self.peak * 0.5 * (1 - math.cos(2 * math.pi * phase / self.duty))
+        return self.rest + squeeze + self._rng.gauss(0.0, self.noise)
+
+
+class ForceDevice(LineDevice):
+    """
+    forcesensor_read.ino: prints the banner, then "Raw reading: .. Force (N): .."
+    at 'rate' Hz. Forces are quantized like the sketch ((raw - 255) * 100 / 512).
+    The sketch ignores input; here TARE zeroes the current reading.
+    """
+    NB_TO_FORCE_FACTOR = 100.0
+
+    def __init__(self, rate=10.0, model=None):
+        super().__init__()
+        self.telemetry_interval = 1.0 / rate
+        self.model = model or SqueezeModel()
+        self.offset = 0.0
+        self._start = None
+        self._last_force = 0.0
+
+    def banner(self):
+        return (b"PPS UK: SingleTact sensor\r\n"
+                b"Raw value, Force (PSI), and Force (N)\r\n"
+                b"----------------------------------------\r\n")
+
+    def handle(self, line, now):
+        if line == 'TARE':
+            self.offset += self._last_force
+        return 0.0, b''
+
+    def telemetry(self, now):
+        if self._start is None:
+            self._start = now
+        force = self.model(now - self._start) - self.offset
+        raw = int(round(force * 512 / self.NB_TO_FORCE_FACTOR)) + 255
+        raw = min(max(raw, 0), 767)
+        adjusted = raw - 255
+        force_n = adjusted * self.NB_TO_FORCE_FACTOR / 512.0
+        self._last_force = force_n
+        return f"Raw reading: {raw}   Force (PSI - NB): {adjusted}   Force (N): {force_n:.2f}\r\n".encode()
+
+
+class VirtualMCU:
+    """
+    Runs a device behind a pty. port is the path to open from the host side.
+    Use as a context manager, or call start()/close().
+    """
+    def __init__(self, device, baud=115200, processing_delay=0.0005):
+        self.device = device
+        self.byte_time = BITS_PER_BYTE / baud
+        self.processing_delay = processing_delay
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.commands = 0
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._events = []  # heap of (time, seq, kind, payload)
+        self._seq = 0
+        self._rx_free = 0.0    # when the host->MCU line is next idle
+        self._tx_free = 0.0    # when the MCU->host line is next idle
+        self._busy_until = 0.0 # when the firmware loop finishes its current command
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        now = time.monotonic()
+        self._running = True
+        if isinstance(self.device, ForceDevice):
+            self._send(now, self.device.banner())
+        if self.device.telemetry_interval:
+            self._push(now, 'tick', None)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _push(self, when, kind, payload):
+        self._seq += 1
+        heapq.heappush(self._events, (when, self._seq, kind, payload))
+
+    def _send(self, ready, data):
+        """Queue reply bytes that are ready at 'ready'; they arrive once clocked out."""
+        if data:
+            self._tx_free = max(ready, self._tx_free) + len(data) * self.byte_time
+            self._push(self._tx_free, 'tx', data)
+
+    def _run(self):
+        while self._running:
+            timeout = 0.05
+            if self._events:
+                timeout = min(timeout, max(self._events[0][0] - time.monotonic(), 0.0))
+            readable, _, _ = select.select([self._master], [], [], timeout)
+            now = time.monotonic()
+            if readable:
+                data = os.read(self._master, 4096)
+                self.bytes_in += len(data)
+                # the last byte is in once the whole chunk has been clocked in
+                self._rx_free = max(now, self._rx_free) + len(data) * self.byte_time
+                self._push(self._rx_free, 'rx', data)
+            while self._events and self._events[0][0] <= time.monotonic():
+                when, _, kind, payload = heapq.heappop(self._events)
+                if kind == 'tx':
+                    os.write(self._master, payload)
+                    self.bytes_out += len(payload)
+                elif kind == 'rx':
+                    self._process(when, payload)
+                elif kind == 'tick':
+                    t = max(when, self._busy_until)
+                    self._send(t, self.device.telemetry(t))
+                    self._push(when + self.device.telemetry_interval, 'tick', None)
+
+    def _process(self, arrived, data):
+        t = max(arrived, self._busy_until)
+        for block, reply in self.device.feed(data, t):
+            self.commands += 1
+            t += self.processing_delay + block
+            self._send(t, reply)
+        self._busy_until = t
+
+
+DEVICES = {
+    'showcase': ShowcaseDevice,
+    'addr': AddrDevice,
+    'motor': MotorDevice,
+    'force': ForceDevice,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a simulated lab MCU on a pseudo-terminal")
+    parser.add_argument('device', choices=sorted(DEVICES))
+    parser.add_argument('--baud', type=int, default=115200, help="UART speed to pace bytes at")
+    parser.add_argument('--delay-ms', type=float, default=0.5, help="processing time per command (ms)")
+    parser.add_argument('--rate', type=float, default=10.0, help="force telemetry rate (Hz)")
+    parser.add_argument('--noise', type=float, default=0.05, help="force noise std (N)")
+    parser.add_argument('--peak', type=float, default=8.0, help="squeeze peak force (N)")
+    parser.add_argument('--period', type=float, default=4.0, help="seconds between squeezes")
+    parser.add_argument('--link', help="also create this symlink to the pty (e.g. /tmp/ttyMCU)")
+    args = parser.parse_args()
+
+    if args.device == 'force':
+        device = ForceDevice(args.rate, SqueezeModel(noise=args.noise, peak=args.peak, period=args.period))
+    else:
+        device = DEVICES[args.device]()
+    mcu = VirtualMCU(device, args.baud, args.delay_ms / 1000.0).start()
+    if args.link:
+        if os.path.islink(args.link):
+            os.remove(args.link)
+        os.symlink(mcu.port, args.link)
+    print(f"Virtual {args.device} MCU on {mcu.port}" + (f" ({args.link})" if args.link else ""))
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{mcu.commands} commands, {mcu.bytes_in} bytes in, {mcu.bytes_out} bytes out")
+        if args.link and os.path.islink(args.link):
+            os.remove(args.link)
+        mcu.close()
+
+if __name__ == '__main__':
+    main()
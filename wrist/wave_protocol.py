@@ -0,0 +1,143 @@
+"""
+Binary framing for the W (waveform) command.
+
+The text form, "W <num_addr> <addr...> <waveLen> <stepMs> <amp0> ...", costs
+three bytes per amplitude ("7F ") and is re-tokenized with String.substring
+on the MCU. The binary frame sends each amplitude as one raw byte:
+
+    0xA5 | len (u16 LE) | 'W' | num_addr | addr... | stepMs (u16 LE) | amp... | crc (u16 LE)
+
+len counts the body bytes between the length field and the CRC, and the CRC
+is CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) over the length field and
+the body. 0xA5 never starts a text command, so vib_individual.ino tells the
+two apart by peeking at the first byte. Replies are unchanged ("DONE <ms>").
+"""
+import binascii
+import struct
+
+SYNC = 0xA5
+WAVE = ord('W')
+# Must match MAX_BIN_WAVE_SIZE and NUM_DRIVERS in vib_individual.ino
+# (512 samples fit the frame buffer in an Arduino Uno's 2 KB of SRAM)
+MAX_BIN_WAVE_SIZE = 512
+MAX_ADDRESSES = 3
+MAX_STEP_MS = 0xFFFF  # u16 field
+
+# Reasons a frame is rejected, worded like the firmware's "Error: ..." replies
+LENGTH_INVALID = "Binary frame length invalid"
+CRC_MISMATCH = "Binary frame CRC mismatch"
+FORMAT_INCORRECT = "Binary W frame format incorrect"
+
+def crc16(data):
+    return binascii.crc_hqx(data, 0xFFFF)
+
+def encode_wave_frame(addresses, step_ms, amplitudes):
+    """
+    Build a binary W frame. addresses are ints or hex strings ("48");
+    amplitudes are 0-255 values (list, bytes or uint8 array). Raises
+    ValueError for input the firmware would reject.
+    """
+    addrs = bytes(int(a, 16) if isinstance(a, str) else a for a in addresses)
+    amps = bytes(amplitudes)
+    if not 1 <= len(addrs) <= MAX_ADDRESSES:
+        raise ValueError(f"a W frame takes 1 to {MAX_ADDRESSES} addresses, got {len(addrs)}")
+    if not 0 <= step_ms <= MAX_STEP_MS:
+        raise ValueError(f"step_ms must be 0-{MAX_STEP_MS}, got {step_ms}")
+    if len(amps) > MAX_BIN_WAVE_SIZE:
+        raise ValueError(f"waveform has {len(amps)} samples, the firmware buffer holds {MAX_BIN_WAVE_SIZE}")
+    body = struct.pack('<BB', WAVE, len(addrs)) + addrs + struct.pack('<H', step_ms) + amps
+    length = struct.pack('<H', len(body))
+    return bytes([SYNC]) + length + body + struct.pack('<H', crc16(length + body))
+
+def encode_wave_text(addresses, step_ms, amplitudes):
+    """The original text W command, for comparison and older firmware."""
+    sample_str = " ".join(f"{amp:02X}" for amp in amplitudes)
+    return (f"W {len(addresses)} {' '.join(addresses)} {len(amplitudes)} {step_ms} "
+            f"{sample_str}\n").encode()
+
+
+class WaveFrame:
+    def __init__(self, addresses, step_ms, amplitudes):
+        self.addresses = addresses    # list of int
+        self.step_ms = step_ms
+        self.amplitudes = amplitudes  # bytes
+
+    def __repr__(self):
+        return (f"WaveFrame(addresses={[hex(a) for a in self.addresses]}, "
+                f"step_ms={self.step_ms}, len={len(self.amplitudes)})")
+
+
+# Largest valid body: 'W', num_addr, three addresses, stepMs, amplitudes
+MAX_BODY = 2 + 3 + 2 + MAX_BIN_WAVE_SIZE
+
+def decode_wave_frame(buf):
+    """
+    Decode the frame at the start of buf, whose first byte must be SYNC.
+    Returns (WaveFrame, bytes consumed), (None, 0) if more bytes are needed,
+    or (None, 1) if this is not a valid frame (drop the sync byte and resync).
+    """
+    frame, consumed, _ = _decode(buf)
+    return frame, consumed
+
+def _decode(buf):
+    """decode_wave_frame() plus the reason a frame was rejected (or None)."""
+    if len(buf) < 3:
+        return None, 0, None
+    (length,) = struct.unpack_from('<H', buf, 1)
+    if length > MAX_BODY or length < 4:
+        return None, 1, LENGTH_INVALID
+    end = 3 + length + 2
+    if len(buf) < end:
+        return None, 0, None
+    (crc,) = struct.unpack_from('<H', buf, end - 2)
+    if crc != crc16(bytes(buf[1:end - 2])):
+        return None, 1, CRC_MISMATCH
+    frame = _decode_body(bytes(buf[3:end - 2]))
+    if frame is None:
+        return None, 1, FORMAT_INCORRECT
+    return frame, end, None
+
+def _decode_body(body):
+    if len(body) < 4 or body[0] != WAVE:
+        return None
+    num_addr = body[1]
+    if not 1 <= num_addr <= MAX_ADDRESSES or len(body) < 4 + num_addr:
+        return None
+    addresses = list(body[2:2 + num_addr])
+    (step_ms,) = struct.unpack_from('<H', body, 2 + num_addr)
+    return WaveFrame(addresses, step_ms, body[4 + num_addr:])
+
+
+class WaveFrameDecoder:
+    """
+    Incremental decoder for a byte stream that may split frames anywhere.
+    feed() returns the frames completed so far; invalid frames are counted
+    in self.errors, their reason kept in self.last_error, and skipped.
+    """
+    def __init__(self):
+        self._buf = bytearray()
+        self.errors = 0
+        self.last_error = None
+
+    def reset(self):
+        """Drop any partial frame (e.g. after the stream switched back to text)."""
+        self._buf.clear()
+
+    def feed(self, data):
+        self._buf += data
+        frames = []
+        while True:
+            start = self._buf.find(SYNC)
+            if start < 0:
+                self._buf.clear()
+                return frames
+            del self._buf[:start]
+            frame, consumed, error = _decode(self._buf)
+            if consumed == 0:
+                return frames
+            del self._buf[:consumed]
+            if frame is None:
+                self.errors += 1
+                self.last_error = error
+            else:
+                frames.append(frame)
@@ -0,0 +1,110 @@
+"""
+Amplitude waveforms for the vibration drivers, shared by the DA7281 UI
+(vib_ind_addr, W command) and the Syntacts scripts.
+
+Every generator returns 'length' uint8 levels (0-255), one per step of the
+W command. The arrays are built with NumPy, memoized by their parameters and
+read-only, so the same waveform can be handed out again without copying
+and a parameter sweep over thousands of candidates only builds each once.
+to_syntacts() turns the same levels into a Syntacts signal.
+"""
+from functools import lru_cache
+import numpy as np
+
+CACHE_SIZE = 4096
+
+def quantize(levels):
+    """Float levels in [0, 1] (any shape) -> uint8 0-255, truncating like int()."""
+    out = (np.clip(levels, 0.0, 1.0) * 255 + 1e-9).astype(np.uint8)
+    out.flags.writeable = False
+    return out
+
+def _memoize(func):
+    return lru_cache(maxsize=CACHE_SIZE)(func)
+
+# ---------------------------
+# Generators
+# ---------------------------
+@_memoize
+def exp_decay(length, tau=None):
+    """255 * exp(-i / tau); tau defaults to length / 3."""
+    tau = length / 3.0 if tau is None else tau
+    return quantize(np.exp(-np.arange(length) / tau))
+
+@_memoize
+def square(length, cycles=1, duty=0.5):
+    """'cycles' periods, each low then high for the last 'duty' of the period."""
+    phase = (np.arange(length) * cycles) % length
+    return quantize(phase >= length - int(duty * length + 0.5))
+
+@_memoize
+def saw(length, cycles=1):
+    """
+    Rising ramp from 0 to 255, repeated 'cycles' times. Steps are assigned to
+    cycles from their index (cycle k covers steps k*length/cycles up to the
+    next cycle's first step), and every cycle ramps the full 0 -> 255 even
+    when the period is not a whole number of steps.
+    """
+    i = np.arange(length)
+    cycle = i * cycles // length
+    start = -(-cycle * length // cycles)          # first step of each step's cycle
+    end = -(-(cycle + 1) * length // cycles) - 1  # last step of that cycle
+    return quantize((i - start) / np.maximum(end - start, 1))
+
+@_memoize
+def sine_burst(length, cycles=1):
+    """'cycles' smooth bursts (raised cosine, 0 -> 255 -> 0)."""
+    phase = 2 * np.pi * cycles * np.arange(length) / length
+    return quantize(0.5 - 0.5 * np.cos(phase))
+
+@_memoize
+def chirp(length, step_ms, f0, f1):
+    """Raised-cosine bursts whose rate sweeps linearly from f0 to f1 Hz."""
+    t = np.arange(length) * (step_ms / 1000.0)
+    duration = max(length * step_ms / 1000.0, 1e-9)
+    phase = 2 * np.pi * (f0 * t + 0.5 * (f1 - f0) * t * t / duration)
+    return quantize(0.5 - 0.5 * np.cos(phase))
+
+@_memoize
+def adsr(length, attack, decay, release, sustain=0.5):
+    """
+    Attack/decay/release given in steps; the sustain level (0-1) is held
+    for whatever remains of 'length', and the release ends at 0 on the last
+    step.
+    """
+    hold = max(length - 1 - attack - decay - release, 0)
+    return piecewise(((0, 0.0), (attack, 1.0), (attack + decay, sustain),
+                      (attack + decay + hold, sustain),
+                      (attack + decay + hold + release, 0.0)), length)
+
+def piecewise(points, length):
+    """
+    Linear interpolation between (step, level 0-1) points; steps outside
+    the points hold the first/last level.
+    """
+    return _piecewise(tuple((float(i), float(level)) for i, level in points), length)
+
+@_memoize
+def _piecewise(points, length):
+    steps, levels = zip(*points)
+    return quantize(np.interp(np.arange(length), steps, levels))
+
+def cache_clear():
+    for func in (exp_decay, square, saw, sine_burst, chirp, adsr, _piecewise):
+        func.cache_clear()
+
+# ---------------------------
+# Syntacts
+# ---------------------------
+def to_syntacts(levels, step_ms, carrier=None):
+    """
+    A Syntacts signal that holds each level for step_ms like the DA7281 does,
+    optionally multiplied onto a carrier signal (e.g. Sine(170)). Needs the
+    syntacts module on the path (Syntacts_Vibration).
+    """
+    from syntacts import Samples
+    hold = max(int(round(step_ms)), 1)  # upsample to 1 kHz so levels are held, not ramped
+    envelope = Samples(np.repeat(np.asarray(levels, dtype=np.float32) / 255, hold),
+                       1000.0 * hold / step_ms)
+    # the product holds a reference to envelope, whose buffer the native signal reads
+    return envelope if carrier is None else carrier * envelope